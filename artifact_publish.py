@@ -0,0 +1,325 @@
+"""
+아티팩트 증분 배포 (내용 주소 청크).
+
+전처리 결과(artifacts/)를 데이터셋별 청크로 나누고(분기 컬럼 또는 날짜 컬럼이 있는 DataFrame은 분기별로 한 번 더 나눔),
+각 청크를 내용 sha256 을 이름으로 객체 저장소에 저장합니다. 내용이 같은 청크는 이름도 같으므로
+매일 배포할 때 실제로 바뀐 청크만 올라가고, 받는 쪽도 바뀐 청크만 내려받습니다.
+
+객체 저장소 구조 (로컬/공유 폴더):
+  <저장소>/manifest.json                      최신 배포 매니페스트 (데이터셋별 청크 해시 목록)
+  <저장소>/objects/<해시 앞 2자리>/<해시>      청크 (Parquet 또는 JSON 바이트)
+
+배포: python artifact_publish.py publish <저장소 폴더> [아티팩트 폴더]
+수신: python artifact_publish.py fetch <저장소 폴더 또는 http(s) URL> [아티팩트 폴더]
+수신한 청크는 해시를 검증한 뒤 기존과 같은 artifacts/ 형식으로 다시 조립하므로 뷰어 코드는 그대로 사용합니다.
+조립한 파일은 내용 해시를 붙인 이름(df_1.<해시>.parquet)으로 쓰고 매니페스트를 마지막에 교체한 뒤 이전 파일을 지웁니다.
+전처리.py 는 환경변수 GREET_OBJECT_STORE 가 지정되어 있으면 이 방식으로 배포합니다
+(클라우드 앱용 preprocessed_cloud.pkl 은 그와 별도로 항상 Git 으로 푸시).
+"""
+import hashlib
+import io
+import json
+import os
+import sys
+import urllib.request
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from artifact_store import ARTIFACT_DIR, MANIFEST_FILE
+
+PUBLISH_MANIFEST = "manifest.json"
+OBJECTS_DIR = "objects"
+PUBLISH_FORMAT_VERSION = 2
+PARTITION_COLUMN = "분기"  # 이 컬럼이 있는 DataFrame은 분기별 청크로 나눕니다.
+DATE_PARTITION_COLUMNS = ("신청일자", "날짜")  # 분기 컬럼이 없으면 이 날짜 컬럼의 연도-분기로 나눕니다.
+MAX_ROW_RUNS = 1000  # 분기가 번갈아 나오는 구간(run)이 이보다 많으면 행 순서를 분기별로 묶어 복원합니다.
+MISSING_PARTITION = "__없음__"
+CHUNK_CACHE_DIR = ".chunk_cache"  # 받은 청크 보관 (바뀐 데이터셋 안에서도 바뀌지 않은 분기는 다시 받지 않음)
+FETCHED_MANIFEST = "published_manifest.json"  # 마지막으로 받은 배포 매니페스트 (아티팩트 폴더 안)
+
+
+def _sha256(payload):
+    return hashlib.sha256(payload).hexdigest()
+
+
+def _object_path(root, digest):
+    return os.path.join(root, OBJECTS_DIR, digest[:2], digest)
+
+
+def _write_atomic(path, payload):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(payload)
+    os.replace(tmp_path, path)
+
+
+def _parquet_bytes(df):
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=True)
+    return buffer.getvalue()
+
+
+def _partition_column(schema):
+    """분기 청크로 나눌 때 기준 컬럼 (없으면 None)"""
+    if PARTITION_COLUMN in schema:
+        return PARTITION_COLUMN
+    for name in DATE_PARTITION_COLUMNS:
+        if schema.get(name, "").startswith("datetime64"):
+            return name
+    return None
+
+
+def _partition_keys(df, column):
+    """행별 분기 청크 키 ('1분기' 또는 날짜 컬럼이면 '2025-3Q')"""
+    values = df[column]
+    if column == PARTITION_COLUMN:
+        keys = values.astype(str)
+    else:
+        keys = values.dt.year.astype("Int64").astype(str) + "-" + values.dt.quarter.astype("Int64").astype(str) + "Q"
+    return keys.where(values.notna(), MISSING_PARTITION)
+
+
+def _row_index_kind(index):
+    """'range' / 'positional' (0..n-1 값의 정수 인덱스) 이면 청크에 인덱스를 넣지 않고 조립할 때 다시 만듭니다."""
+    if isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1:
+        return "range"
+    if index.dtype == "int64" and np.array_equal(index.to_numpy(), np.arange(len(index))):
+        return "positional"
+    return None
+
+
+def _row_runs(keys):
+    """분기 키가 연속으로 나오는 구간 [[키, 행 수], ...] (조립할 때 원래 행 순서를 복원하는 데 씁니다)"""
+    values = keys.to_numpy()
+    starts = np.flatnonzero(np.r_[True, values[1:] != values[:-1]])
+    counts = np.diff(np.r_[starts, len(values)])
+    return [[values[start], int(count)] for start, count in zip(starts, counts)]
+
+
+def _split_chunks(artifact_dir, entry):
+    """
+    아티팩트 하나를 청크로 나눕니다. 반환: ([(분기 키 또는 None, 바이트, 행 수)], 조립 정보 dict 또는 None)
+    청크에는 그 분기의 행만 원래 순서대로 들어가고, 행 위치 같은 데이터셋 전체 기준 값은 넣지 않습니다
+    (다른 분기의 행이 늘거나 줄어도 바뀌지 않은 분기의 청크 바이트가 그대로이도록).
+    """
+    path = os.path.join(artifact_dir, entry["file"])
+    column = _partition_column(entry.get("schema", {})) if entry["format"] == "parquet" else None
+    df = pd.read_parquet(path) if column else None
+    if df is None or df.empty:
+        # 나누지 않는 데이터셋은 아티팩트 파일 바이트를 그대로 청크로 씁니다.
+        with open(path, "rb") as f:
+            return [(None, f.read(), None)], None
+
+    keys = _partition_keys(df, column)
+    index_kind = _row_index_kind(df.index)
+    runs = _row_runs(keys)
+    chunks = []
+    for key in sorted(keys.unique()):
+        part = df[(keys == key).to_numpy()]
+        if index_kind:
+            part = part.reset_index(drop=True)
+        chunks.append((key, _parquet_bytes(part), len(part)))
+    layout = {"row_index": index_kind, "row_runs": runs if len(runs) <= MAX_ROW_RUNS else None}
+    return chunks, layout
+
+
+def publish(store, artifact_dir=ARTIFACT_DIR):
+    """
+    artifact_dir 의 아티팩트를 청크로 나눠 store 에 없는 청크만 저장하고, 마지막에 배포 매니페스트를 교체합니다.
+    반환: 배포 매니페스트(dict)
+    """
+    with open(os.path.join(artifact_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        artifact_manifest = json.load(f)
+
+    datasets = {}
+    uploaded, uploaded_bytes, total = 0, 0, 0
+    for name, entry in artifact_manifest["datasets"].items():
+        chunks = []
+        parts, layout = _split_chunks(artifact_dir, entry)
+        for key, payload, rows in parts:
+            digest = _sha256(payload)
+            path = _object_path(store, digest)
+            if not os.path.exists(path):
+                _write_atomic(path, payload)
+                uploaded += 1
+                uploaded_bytes += len(payload)
+            chunks.append({"partition": key, "sha256": digest, "bytes": len(payload), "rows": rows})
+            total += 1
+        datasets[name] = {"artifact": entry, "partitioned": layout is not None, "chunks": chunks, "layout": layout}
+
+    manifest = {
+        "version": PUBLISH_FORMAT_VERSION,
+        "build_time": artifact_manifest.get("build_time"),
+        "db_snapshot": artifact_manifest.get("db_snapshot"),
+        "published_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "datasets": datasets,
+    }
+    # 매니페스트는 모든 청크를 올린 뒤 마지막에 교체합니다 (받는 쪽이 없는 청크를 보지 않도록).
+    _write_atomic(os.path.join(store, PUBLISH_MANIFEST), json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    print(f"청크 {total}개 중 {uploaded}개 업로드 ({uploaded_bytes / 1024:.1f}KB) → {store}")
+    return manifest
+
+
+def _read_store(store, relative_path):
+    """저장소(로컬 폴더 또는 http(s) URL)에서 파일 바이트를 읽습니다."""
+    if store.startswith(("http://", "https://")):
+        with urllib.request.urlopen(f"{store.rstrip('/')}/{relative_path}", timeout=60) as response:
+            return response.read()
+    with open(os.path.join(store, *relative_path.split("/")), "rb") as f:
+        return f.read()
+
+
+def _get_chunk(store, digest, cache_dir):
+    """청크 바이트를 캐시 또는 저장소에서 가져오고 해시를 검증합니다."""
+    cached = os.path.join(cache_dir, digest)
+    if os.path.exists(cached):
+        with open(cached, "rb") as f:
+            payload = f.read()
+        if _sha256(payload) == digest:
+            return payload, False
+
+    payload = _read_store(store, f"{OBJECTS_DIR}/{digest[:2]}/{digest}")
+    if _sha256(payload) != digest:
+        raise ValueError(f"청크 해시가 일치하지 않습니다: {digest}")
+    _write_atomic(cached, payload)
+    return payload, True
+
+
+def _row_order(chunks, runs):
+    """청크를 순서대로 이어 붙인 행에서 원래 행 순서로 가져올 위치 배열"""
+    offsets, start = {}, 0
+    for chunk in chunks:
+        offsets[chunk["partition"]] = start
+        start += chunk["rows"]
+    order = []
+    for key, count in runs:
+        order.append(np.arange(offsets[key], offsets[key] + count))
+        offsets[key] += count
+    return np.concatenate(order)
+
+
+def _versioned_file_name(file_name, digest):
+    """내용 해시를 붙인 아티팩트 파일 이름 (df_1.parquet -> df_1.<해시 앞 16자리>.parquet)"""
+    stem, ext = os.path.splitext(file_name)
+    return f"{stem}.{digest[:16]}{ext}"
+
+
+def _assemble(name, dataset, payloads, artifact_dir):
+    """
+    받은 청크로 아티팩트 파일을 다시 만들고 아티팩트 매니페스트 항목을 반환합니다.
+    파일은 내용 해시를 붙인 새 이름으로 쓰므로, 매니페스트를 교체하기 전까지 뷰어가 보는 기존 파일은 바뀌지 않습니다.
+    """
+    entry = dict(dataset["artifact"])
+    if dataset["partitioned"]:
+        layout = dataset["layout"]
+        df = pd.concat([pd.read_parquet(io.BytesIO(payload)) for payload in payloads])
+        if layout["row_runs"] is not None:
+            df = df.iloc[_row_order(dataset["chunks"], layout["row_runs"])]
+        # row_runs 가 없으면 (구간이 너무 많은 경우) 행은 분기별로 묶인 순서가 됩니다.
+        if layout["row_index"] == "range":
+            df = df.reset_index(drop=True)
+        elif layout["row_index"] == "positional":
+            df.index = pd.Index(np.arange(len(df), dtype="int64"))
+        payload = _parquet_bytes(df)
+    else:
+        payload = payloads[0]
+    entry["sha256"] = _sha256(payload)
+    entry["bytes"] = len(payload)
+    entry["file"] = _versioned_file_name(entry["file"], entry["sha256"])
+    _write_atomic(os.path.join(artifact_dir, entry["file"]), payload)
+    return entry
+
+
+def _remove_superseded(artifact_dir, old_datasets, new_datasets):
+    """새 매니페스트가 가리키지 않는 이전 아티팩트 파일을 지웁니다 (매니페스트 교체 후 호출)."""
+    in_use = {entry["file"] for entry in new_datasets.values()}
+    for entry in old_datasets.values():
+        if entry["file"] in in_use:
+            continue
+        try:
+            os.remove(os.path.join(artifact_dir, entry["file"]))
+        except OSError:
+            pass  # 이미 없거나, 윈도우에서 다른 프로세스가 열고 있는 파일
+
+
+def fetch(store, artifact_dir=ARTIFACT_DIR, cache_dir=CHUNK_CACHE_DIR):
+    """
+    store 의 최신 배포를 artifact_dir 로 받습니다.
+    지난번에 받은 배포와 청크 목록이 같은 데이터셋은 건드리지 않고, 바뀐 데이터셋만 바뀐 청크를 내려받아 다시 조립합니다.
+    청크 해시가 맞지 않으면 ValueError 를 발생시키며 기존 아티팩트는 그대로 둡니다.
+    """
+    remote = json.loads(_read_store(store, PUBLISH_MANIFEST))
+    if remote.get("version") != PUBLISH_FORMAT_VERSION:
+        raise ValueError(f"지원하지 않는 배포 형식입니다: {remote.get('version')}")
+
+    fetched_path = os.path.join(artifact_dir, FETCHED_MANIFEST)
+    previous = {}
+    if os.path.exists(fetched_path):
+        with open(fetched_path, "r", encoding="utf-8") as f:
+            previous = json.load(f).get("datasets", {})
+    local_datasets = {}
+    local_manifest_path = os.path.join(artifact_dir, MANIFEST_FILE)
+    if os.path.exists(local_manifest_path):
+        with open(local_manifest_path, "r", encoding="utf-8") as f:
+            local_datasets = json.load(f).get("datasets", {})
+
+    os.makedirs(artifact_dir, exist_ok=True)
+    datasets = {}
+    downloaded, downloaded_bytes, changed = 0, 0, []
+    for name, dataset in remote["datasets"].items():
+        unchanged = (
+            name in local_datasets
+            and previous.get(name, {}).get("chunks") == dataset["chunks"]
+            and previous.get(name, {}).get("layout") == dataset["layout"]
+            and os.path.exists(os.path.join(artifact_dir, local_datasets[name]["file"]))
+        )
+        if unchanged:
+            datasets[name] = local_datasets[name]
+            continue
+
+        payloads = []
+        for chunk in dataset["chunks"]:
+            payload, was_downloaded = _get_chunk(store, chunk["sha256"], cache_dir)
+            payloads.append(payload)
+            if was_downloaded:
+                downloaded += 1
+                downloaded_bytes += len(payload)
+        datasets[name] = _assemble(name, dataset, payloads, artifact_dir)
+        changed.append(name)
+
+    # 조립한 파일은 모두 새 이름이므로, 매니페스트를 마지막에 교체하면 뷰어는 이전 빌드 또는 새 빌드 한쪽만 봅니다.
+    manifest = {"build_time": remote.get("build_time"), "db_snapshot": remote.get("db_snapshot"), "datasets": datasets}
+    _write_atomic(local_manifest_path, json.dumps(manifest, ensure_ascii=False, indent=2).encode("utf-8"))
+    _write_atomic(fetched_path, json.dumps(remote, ensure_ascii=False).encode("utf-8"))
+    _remove_superseded(artifact_dir, local_datasets, datasets)
+    _prune_cache(cache_dir, remote)
+
+    print(f"변경된 데이터셋 {len(changed)}개, 청크 {downloaded}개 다운로드 ({downloaded_bytes / 1024:.1f}KB)")
+    return changed
+
+
+def _prune_cache(cache_dir, remote):
+    """현재 배포에서 쓰지 않는 청크를 캐시에서 지웁니다."""
+    if not os.path.isdir(cache_dir):
+        return
+    referenced = {chunk["sha256"] for dataset in remote["datasets"].values() for chunk in dataset["chunks"]}
+    for file_name in os.listdir(cache_dir):
+        if file_name not in referenced:
+            try:
+                os.remove(os.path.join(cache_dir, file_name))
+            except OSError:
+                pass
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("publish", "fetch"):
+        print("사용법: python artifact_publish.py publish|fetch <저장소> [아티팩트 폴더]")
+        sys.exit(1)
+    target_dir = sys.argv[3] if len(sys.argv) > 3 else ARTIFACT_DIR
+    if sys.argv[1] == "publish":
+        publish(sys.argv[2], target_dir)
+    else:
+        fetch(sys.argv[2], target_dir)
@@ -0,0 +1,271 @@
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import threading
+from collections.abc import Mapping
+from datetime import datetime
+
+import pandas as pd
+
+ARTIFACT_DIR = "artifacts"
+MANIFEST_FILE = "manifest.json"
+LEGACY_PICKLE = "preprocessed_data.pkl"
+
+# 메모리 맵으로 공유할 Arrow IPC 파일 위치 (리눅스는 RAM 기반 /dev/shm, 그 외는 임시 폴더)
+SHARED_DIR = os.environ.get("GREET_SHARED_DIR") or (
+    "/dev/shm/greet_artifacts" if os.path.isdir("/dev/shm") else os.path.join(tempfile.gettempdir(), "greet_artifacts")
+)
+
+_shared_artifacts = {}  # 프로세스 안에서 공유하는 매핑: 아티팩트 폴더(또는 pickle 경로) -> (mtime, 매핑)
+
+
+def _arrow_safe(df):
+    """
+    Parquet로 저장할 수 있도록 프레임을 정리합니다.
+    - 컬럼명은 문자열로 변환
+    - 문자열/숫자가 섞인 object 컬럼은 문자열로 통일 (결측치는 유지)
+    """
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    for col in df.columns:
+        if df[col].dtype == object:
+            inferred = pd.api.types.infer_dtype(df[col], skipna=True)
+            if inferred == "mixed-integer-float":
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+            elif inferred not in ("string", "empty", "boolean", "datetime", "date", "integer", "floating", "decimal"):
+                df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+def _json_default(value):
+    """numpy/pandas 스칼라를 JSON으로 직렬화합니다."""
+    if hasattr(value, "item"):
+        return value.item()
+    if isinstance(value, (pd.Timestamp, datetime)):
+        return value.isoformat()
+    raise TypeError(f"JSON으로 변환할 수 없는 값: {type(value)}")
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _snapshot_entry(db_snapshot, built_at):
+    """매니페스트의 db_snapshot 항목 (사본 없이 원본을 읽었으면 None)"""
+    if not db_snapshot:
+        return None
+    taken_at = datetime.fromisoformat(db_snapshot["taken_at"])
+    return {
+        "taken_at": db_snapshot["taken_at"],
+        "age_seconds": round((built_at - taken_at).total_seconds(), 1),
+        "pages": db_snapshot.get("pages"),
+        "restarts": db_snapshot.get("restarts"),
+    }
+
+
+def write_artifacts(data, artifact_dir=ARTIFACT_DIR, db_snapshot=None):
+    """
+    전처리 결과(dict)를 데이터셋별 파일로 저장합니다.
+    DataFrame은 <이름>.parquet, 그 외 값(문자열, dict, GeoJSON)은 <이름>.json 으로 저장하고,
+    스키마/행 수/내용 해시(sha256)/빌드 시간을 manifest.json 에 기록합니다.
+    db_snapshot(db_manager.create_snapshot 결과)을 주면 읽은 data.db 사본의 시각과
+    빌드 시점까지의 경과 초(age_seconds)를 db_snapshot 항목으로 함께 기록합니다.
+    내용 해시는 데이터셋별 캐시 무효화 토큰으로 사용됩니다 (data_access.dataset_version).
+    """
+    os.makedirs(artifact_dir, exist_ok=True)
+    built_at = datetime.now()
+    build_time = built_at.strftime("%Y-%m-%d %H:%M:%S")
+    datasets = {}
+
+    for name, value in data.items():
+        if isinstance(value, pd.DataFrame):
+            file_name = f"{name}.parquet"
+            df = _arrow_safe(value)
+            tmp_path = os.path.join(artifact_dir, file_name + ".tmp")
+            df.to_parquet(tmp_path, index=True)
+            entry = {
+                "file": file_name,
+                "format": "parquet",
+                "rows": int(len(df)),
+                "schema": {col: str(dtype) for col, dtype in df.dtypes.items()},
+            }
+        else:
+            file_name = f"{name}.json"
+            tmp_path = os.path.join(artifact_dir, file_name + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False, default=_json_default)
+            entry = {"file": file_name, "format": "json", "type": type(value).__name__}
+
+        final_path = os.path.join(artifact_dir, file_name)
+        os.replace(tmp_path, final_path)
+        entry["bytes"] = os.path.getsize(final_path)
+        entry["sha256"] = _file_sha256(final_path)
+        datasets[name] = entry
+
+    # 매니페스트는 모든 데이터셋 파일을 쓴 뒤 마지막에 교체합니다.
+    manifest = {"build_time": build_time, "db_snapshot": _snapshot_entry(db_snapshot, built_at), "datasets": datasets}
+    tmp_manifest = os.path.join(artifact_dir, MANIFEST_FILE + ".tmp")
+    with open(tmp_manifest, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_manifest, os.path.join(artifact_dir, MANIFEST_FILE))
+    return manifest
+
+
+class LazyArtifacts(Mapping):
+    """
+    artifacts/manifest.json 을 읽고, 각 데이터셋은 처음 접근할 때만 디스크에서 로드합니다.
+    기존 dict 와 같이 data["df_1"], data.get("df_6", pd.DataFrame()) 형태로 사용할 수 있습니다.
+    """
+
+    def __init__(self, artifact_dir=ARTIFACT_DIR):
+        self.artifact_dir = artifact_dir
+        with open(os.path.join(artifact_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self._loaded = {}
+
+    def _load(self, name):
+        entry = self.manifest["datasets"][name]
+        path = os.path.join(self.artifact_dir, entry["file"])
+        if entry["format"] == "parquet":
+            return pd.read_parquet(path)
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def __getitem__(self, name):
+        if name not in self._loaded:
+            self._loaded[name] = self._load(name)
+        return self._loaded[name]
+
+    def __iter__(self):
+        return iter(self.manifest["datasets"])
+
+    def __len__(self):
+        return len(self.manifest["datasets"])
+
+    @property
+    def build_time(self):
+        return self.manifest.get("build_time")
+
+
+def _ipc_file_name(artifact_dir, name, entry, build_time):
+    """
+    데이터셋 IPC 파일 이름: <폴더 태그>-<데이터셋>-<빌드 태그>.arrow
+    폴더 태그로 여러 아티팩트 폴더(벤치마크 등)를 구분하고, 빌드 태그가 바뀌면 새 파일을 만듭니다.
+    """
+    folder_tag = hashlib.sha1(os.path.abspath(artifact_dir).encode("utf-8")).hexdigest()[:8]
+    # 내용 해시가 있으면 빌드가 바뀌어도 내용이 같은 데이터셋은 기존 IPC 파일을 그대로 씁니다.
+    build_tag = hashlib.sha1(f"{entry.get('sha256') or build_time}|{entry['file']}|{entry.get('bytes')}".encode("utf-8")).hexdigest()[:12]
+    return f"{folder_tag}-{name}-{build_tag}.arrow"
+
+
+def _prune_shared(shared_dir, keep):
+    """같은 폴더/데이터셋의 이전 빌드 IPC 파일을 지웁니다 (이미 매핑한 프로세스는 계속 사용할 수 있음)."""
+    prefix = keep.rsplit("-", 1)[0] + "-"
+    for file_name in os.listdir(shared_dir):
+        if file_name.startswith(prefix) and file_name.endswith(".arrow") and file_name != keep:
+            try:
+                os.remove(os.path.join(shared_dir, file_name))
+            except OSError:
+                pass  # 윈도우에서 다른 프로세스가 매핑 중인 파일은 지울 수 없습니다.
+
+
+def _materialize_ipc(parquet_path, ipc_path, sha256=None):
+    """
+    Parquet 아티팩트를 압축 없는 Arrow IPC 파일로 변환합니다. (메모리 맵은 압축되지 않은 버퍼만 그대로 쓸 수 있음)
+    sha256 이 주어지면 읽은 Parquet 내용이 그 해시와 같을 때만 IPC 파일을 만들고, 다르면 ValueError 를 발생시킵니다.
+    (IPC 파일 이름이 매니페스트 해시로 정해지므로 다른 빌드가 쓰는 중인 Parquet 를 그 이름으로 공유하지 않기 위함)
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+    import pyarrow.parquet as pq
+
+    with open(parquet_path, "rb") as f:
+        payload = f.read()
+    if sha256 is not None and hashlib.sha256(payload).hexdigest() != sha256:
+        raise ValueError("Parquet 파일이 매니페스트의 해시와 다릅니다 (빌드 중이거나 교체된 파일)")
+    table = pq.read_table(pa.BufferReader(payload))
+    tmp_path = f"{ipc_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with ipc.new_file(tmp_path, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(tmp_path, ipc_path)
+
+
+def _map_ipc_frame(ipc_path):
+    """
+    IPC 파일을 메모리 맵으로 열어 DataFrame으로 만듭니다.
+    숫자/불리언/날짜 컬럼은 버퍼가 매핑된 파일을 그대로 가리키므로(읽기 전용) 여러 세션/프로세스가 같은 물리 메모리를 공유합니다.
+    문자열(object) 컬럼과 결측치가 있는 정수 컬럼처럼 pandas 형식으로 바꿀 때 변환이 필요한 컬럼은 프로세스마다 복사됩니다.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    table = ipc.open_file(pa.memory_map(ipc_path, "r")).read_all()
+    return table.to_pandas(split_blocks=True)
+
+
+class SharedArtifacts(LazyArtifacts):
+    """
+    LazyArtifacts 와 같은 매핑이지만 DataFrame 데이터셋을 메모리 맵한 Arrow IPC 파일에서 로드합니다.
+    - IPC 파일은 SHARED_DIR 에 빌드당 한 번만 만들어지고 모든 프로세스가 같은 파일을 매핑합니다.
+      Parquet 내용이 매니페스트 해시와 다르면 공유 파일을 만들지 않고 Parquet 에서 직접 로드합니다.
+    - 공유되는 것은 숫자/날짜 컬럼 버퍼이고, 문자열 컬럼은 프로세스마다 pandas 객체로 복사됩니다.
+    - 반환하는 프레임은 얕은 복사본이라 컬럼 추가/삭제는 호출한 쪽에만 적용되고,
+      매핑된 버퍼에 직접 값을 쓰는 작업(df.loc[...] = 값)은 읽기 전용 오류가 납니다. 수정하려면 .copy() 후 사용하세요.
+    """
+
+    def __init__(self, artifact_dir=ARTIFACT_DIR, shared_dir=SHARED_DIR):
+        super().__init__(artifact_dir)
+        self.shared_dir = shared_dir
+
+    def _load(self, name):
+        entry = self.manifest["datasets"][name]
+        if entry["format"] != "parquet":
+            return super()._load(name)
+
+        file_name = _ipc_file_name(self.artifact_dir, name, entry, self.build_time)
+        ipc_path = os.path.join(self.shared_dir, file_name)
+        try:
+            if not os.path.exists(ipc_path):
+                os.makedirs(self.shared_dir, exist_ok=True)
+                _materialize_ipc(os.path.join(self.artifact_dir, entry["file"]), ipc_path, entry.get("sha256"))
+                _prune_shared(self.shared_dir, file_name)
+            return _map_ipc_frame(ipc_path)
+        except Exception as e:
+            print(f"공유 메모리 맵 로드 실패, Parquet 에서 직접 로드합니다 ({name}): {e}")
+            return super()._load(name)
+
+    def __getitem__(self, name):
+        value = super().__getitem__(name)
+        if isinstance(value, pd.DataFrame):
+            return value.copy(deep=False)
+        return value
+
+
+def load_artifacts(artifact_dir=ARTIFACT_DIR):
+    """
+    데이터셋별 아티팩트를 지연 로딩 매핑(SharedArtifacts)으로 반환합니다.
+    같은 프로세스에서는 매니페스트가 바뀌기 전까지 같은 매핑을 돌려주므로 여러 번 호출해도 다시 읽지 않습니다.
+    아티팩트가 아직 없으면 기존 preprocessed_data.pkl 을 로드합니다 (파일이 바뀌기 전까지 한 번만).
+    둘 다 없으면 FileNotFoundError 를 발생시킵니다.
+    """
+    manifest_path = os.path.join(artifact_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        folder, mtime = os.path.abspath(artifact_dir), os.stat(manifest_path).st_mtime_ns
+        cached = _shared_artifacts.get(folder)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, SharedArtifacts(artifact_dir))
+            _shared_artifacts[folder] = cached  # 이전 빌드 매핑은 교체됩니다.
+        return cached[1]
+    folder, mtime = os.path.abspath(LEGACY_PICKLE), os.stat(LEGACY_PICKLE).st_mtime_ns
+    cached = _shared_artifacts.get(folder)
+    if cached is None or cached[0] != mtime:
+        with open(LEGACY_PICKLE, "rb") as f:
+            cached = (mtime, pickle.load(f))
+        _shared_artifacts[folder] = cached
+    return cached[1]
@@ -0,0 +1,115 @@
+"""
+ev_features 벡터화 파생 컬럼과 기존 행 단위 .apply 구현의 결과 일치 여부 및 속도를 비교합니다.
+
+실행: python benchmarks/bench_ev_features.py [행 수, 기본 1000000]
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from ev_features import ages_at, classify_age_group, classify_applicant_type, classify_tesla_model, parse_birth_dates
+
+
+# --- 기존 전처리.py 의 행 단위 구현 (비교 기준) ---
+def legacy_classify_tesla_model(car_type):
+    if pd.isna(car_type): return "기타"
+    car_type_str = str(car_type).strip()
+    if 'Model Y' in car_type_str: return 'Model Y'
+    if 'Model 3' in car_type_str: return 'Model 3'
+    return "기타"
+
+
+def legacy_classify_applicant_type(applicant_type):
+    if pd.isna(applicant_type): return "기타"
+    applicant_str = str(applicant_type).strip()
+    if '개인사업자' in applicant_str: return '개인사업자'
+    if '단체' in applicant_str or '법인' in applicant_str: return '법인'
+    if '개인' in applicant_str: return '개인'
+    return "기타"
+
+
+def legacy_calculate_age(birth_date_str, today):
+    if pd.isna(birth_date_str): return None
+    try:
+        birth_date_str = str(birth_date_str).strip()
+        if len(birth_date_str) == 10 and birth_date_str.isdigit(): return None
+        if len(birth_date_str) == 8 and birth_date_str.isdigit():
+            birth_date = datetime.strptime(birth_date_str, '%Y%m%d').date()
+        elif '-' in birth_date_str:
+            birth_date = datetime.strptime(birth_date_str.split(' ')[0], '%Y-%m-%d').date()
+        else:
+            return None
+        age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+        return age if 0 <= age <= 120 else None
+    except:
+        return None
+
+
+def legacy_classify_age_group(age):
+    # 기존 코드는 'age is None'만 검사해 .apply 후 NaN 이 된 나이를 '70대 이상'으로 분류했습니다.
+    # 비교 기준에는 의도대로 NaN 도 '미상'으로 처리합니다.
+    if age is None or pd.isna(age): return "미상"
+    if age < 20: return "10대"
+    if age < 30: return "20대"
+    if age < 40: return "30대"
+    if age < 50: return "40대"
+    if age < 60: return "50대"
+    if age < 70: return "60대"
+    return "70대 이상"
+
+
+def make_synthetic(n, seed=0):
+    """EV추출파일과 같은 형태의 합성 컬럼(차종, 신청유형, 생년월일)을 만듭니다."""
+    rng = np.random.default_rng(seed)
+    years = rng.integers(1930, 2010, n)
+    months = rng.integers(1, 13, n)
+    days = rng.integers(1, 29, n)
+    compact = np.char.add(np.char.add(years.astype(str), np.char.zfill(months.astype(str), 2)), np.char.zfill(days.astype(str), 2))
+    dashed = np.char.add(np.char.add(np.char.add(years.astype(str), "-"), np.char.add(np.char.zfill(months.astype(str), 2), "-")), np.char.zfill(days.astype(str), 2))
+    kind = rng.integers(0, 5, n)
+    birth = np.where(kind == 0, compact, np.where(kind == 1, dashed, np.where(kind == 2, "1101110012345"[:10], np.where(kind == 3, "19901340", ""))))
+    birth = pd.Series(birth, dtype=object).replace("", None)
+    return pd.DataFrame({
+        "차종": rng.choice(["Model Y RWD", " Model 3 Long Range", "Model S", None], n),
+        "신청유형": rng.choice(["개인", "개인사업자", "법인", "단체", "기타", None], n),
+        "생년월일": birth,
+    })
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    today = datetime.now().date()
+    df = make_synthetic(n)
+    print(f"합성 데이터 {n:,}행")
+
+    started = time.perf_counter()
+    legacy_model = df["차종"].apply(legacy_classify_tesla_model)
+    legacy_type = df["신청유형"].apply(legacy_classify_applicant_type)
+    legacy_age = df["생년월일"].apply(lambda v: legacy_calculate_age(v, today))
+    legacy_group = legacy_age.apply(legacy_classify_age_group)
+    legacy_elapsed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    model = classify_tesla_model(df["차종"])
+    applicant = classify_applicant_type(df["신청유형"])
+    age = ages_at(parse_birth_dates(df["생년월일"]), today)
+    group = classify_age_group(age)
+    vector_elapsed = time.perf_counter() - started
+
+    assert (model == legacy_model).all(), "차종 분류 불일치"
+    assert (applicant == legacy_type).all(), "신청유형 분류 불일치"
+    assert age.equals(pd.to_numeric(legacy_age, errors="coerce").astype(float)), "나이 불일치"
+    assert (group == legacy_group).all(), "연령대 불일치"
+
+    print(f"기존 .apply: {legacy_elapsed:.2f}초")
+    print(f"벡터화     : {vector_elapsed:.2f}초 ({legacy_elapsed / vector_elapsed:.1f}배)")
+    print("결과 일치 확인 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+보고서.py 뷰어별 임포트 시간 보고.
+
+보고서.py 는 '내부' 리포트에 필요한 모듈만 시작 시 임포트하고, 폴스타/지도/분석 뷰어 모듈은
+해당 뷰어를 선택했을 때 임포트합니다. 이 스크립트는 새 파이썬 프로세스에서
+  1) '내부' 첫 화면에 필요한 모듈 (BASE_MODULES)
+  2) 그 위에 각 뷰어 모듈을 추가로 임포트하는 시간
+을 측정하고, python -X importtime 결과에서 가장 오래 걸린 패키지를 함께 출력합니다.
+
+실행:
+  python benchmarks/import_report.py              # 3회 측정 중 최솟값
+  python benchmarks/import_report.py --repeat 5
+"""
+import json
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+
+# 보고서.py 가 시작 시 임포트하는 모듈 ('내부' 리포트 첫 화면, 캘린더 포함)
+BASE_MODULES = ["streamlit", "pandas", "altair", "pytz", "data_access", "daily_rollup", "retail_summary", "ev_캘린더"]
+# 뷰어 선택 시 임포트하는 모듈
+VIEWER_MODULES = {
+    "폴스타": "polestar_viewer",
+    "지도": "map_viewer",
+    "분석": "car_region_dashboard",
+}
+TOP_PACKAGES = 3
+PHASE_MARKER = "--viewer--"
+
+_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+for name in {base!r}:
+    __import__(name)
+base = time.perf_counter() - started
+sys.stderr.write({marker!r} + "\\n")
+started = time.perf_counter()
+if {viewer!r}:
+    __import__({viewer!r})
+print(json.dumps({{"base": base, "viewer": time.perf_counter() - started}}))
+"""
+
+
+def _top_packages(importtime_lines, level=0):
+    """
+    -X importtime 출력에서 해당 깊이(level, 0 = 최상위)의 패키지별 누적 시간(초)을 큰 순서로 반환합니다.
+    뷰어는 뷰어 모듈 자체가 최상위이므로 level=1 로 뷰어가 새로 끌어온 패키지를 봅니다.
+    """
+    totals = {}
+    for line in importtime_lines:
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth != level or not cumulative.strip().isdigit():
+            continue  # 다른 깊이의 모듈 또는 헤더
+        package = name.strip().split(".")[0]
+        totals[package] = totals.get(package, 0) + int(cumulative) / 1_000_000
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]
+
+
+def probe(viewer_module=None):
+    """새 프로세스에서 임포트 시간을 측정합니다. 반환: (기본 초, 뷰어 초, 기본 주요 패키지, 뷰어 주요 패키지)"""
+    code = _PROBE.format(base=BASE_MODULES, viewer=viewer_module or "", marker=PHASE_MARKER)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=REPO_ROOT, capture_output=True, text=True, encoding="utf-8",
+    )
+    if result.returncode != 0:
+        error_line = result.stderr.strip().splitlines()[-1] if result.stderr.strip() else f"종료 코드 {result.returncode}"
+        raise RuntimeError(error_line)
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    lines = result.stderr.splitlines()
+    split = lines.index(PHASE_MARKER) if PHASE_MARKER in lines else len(lines)
+    return timings["base"], timings["viewer"], _top_packages(lines[:split]), _top_packages(lines[split + 1:], level=1)
+
+
+def _format_packages(packages):
+    return ", ".join(f"{name} {seconds:.2f}" for name, seconds in packages) or "-"
+
+
+def main():
+    repeat = int(sys.argv[sys.argv.index("--repeat") + 1]) if "--repeat" in sys.argv else 3
+
+    print(f"{'페이지':<8}{'모듈':<24}{'임포트(초)':>12}  주요 패키지(초)")
+    print("-" * 80)
+    pages = [("내부", None)] + list(VIEWER_MODULES.items())
+    for page, module in pages:
+        label = "(시작 시 임포트)" if module is None else module
+        try:
+            runs = [probe(module) for _ in range(repeat)]
+        except RuntimeError as e:
+            print(f"{page:<8}{label:<24}{'건너뜀':>12}  {e}")
+            continue
+        best = min(runs, key=lambda run: run[0] if module is None else run[1])
+        seconds, packages = (best[0], best[2]) if module is None else (best[1], best[3])
+        print(f"{page:<8}{label:<24}{seconds:>12.3f}  {_format_packages(packages)}")
+    print("-" * 80)
+    print("뷰어 행은 '내부' 모듈을 임포트한 뒤 해당 뷰어를 처음 선택할 때 추가로 걸리는 시간입니다.")
+
+
+if __name__ == "__main__":
+    main()
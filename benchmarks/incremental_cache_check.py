@@ -0,0 +1,98 @@
+"""
+증분 전처리 캐시 확인 (변경 로그 정리 후).
+
+임시 작업 폴더에 1배 합성 데이터를 만들고 DatabaseManager 로 변경 로그 트리거를 설치한 뒤
+전처리를 증분 모드로 여러 번 실행합니다. 전처리는 실행마다 테이블 사본이 받은 변경 로그를 정리하므로
+  - data.db 가 바뀌지 않은 실행은 저장 단계까지 모든 단계가 캐시를 사용하는지 (정리 때문에 테이블 지문이 바뀌지 않는지)
+  - data.db 를 고친 직후 실행은 그 테이블을 읽는 단계와 저장 단계를 다시 실행하는지
+  - 아티팩트 매니페스트가 지워지면 저장 단계만 다시 실행하는지
+를 확인하고, 하나라도 어긋나면 종료 코드 1로 끝납니다.
+(입력 파일이 없어 빈 데이터로 대체한 단계는 제외, 배포 단계는 실행하지 않음)
+
+실행:
+  python benchmarks/incremental_cache_check.py
+"""
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCH_DIR)
+
+from synthetic_data import generate_workspace
+
+CACHE_STATUSES = ("캐시", "대체값")
+
+
+def _run_incremental():
+    """전처리.preprocess_and_save_data(incremental=True) 와 같은 순서로 실행하고 단계별 기록을 반환합니다."""
+    import 전처리
+    from build_cache import BuildCache
+    from pipeline_runner import PipelineRunner
+    from table_mirror import TableMirror
+
+    cache = BuildCache(incremental=True)
+    db_snapshot = 전처리.take_db_snapshot()
+    mirror = TableMirror(cache.cache_dir, reuse=True)
+    runner = PipelineRunner(전처리.build_stages(cache, False, db_snapshot, mirror), cache, max_workers=1)
+    runner.run()
+    전처리.prune_db_change_log(mirror)
+    return runner.records
+
+
+def main():
+    from artifact_store import ARTIFACT_DIR, MANIFEST_FILE
+    from db_manager import DatabaseManager, open_connection
+
+    failures = 0
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workspace:
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            generate_workspace(workspace, scale=1)
+            os.chdir(workspace)
+            DatabaseManager("data.db").close()  # 변경 로그/요약 트리거 설치
+        try:
+            def edit():
+                conn = open_connection("data.db")
+                with conn:
+                    conn.execute("UPDATE 파이프라인 SET 파이프라인 = 파이프라인 + 1 WHERE rowid = 1")
+                conn.close()
+
+            def remove_manifest():
+                os.remove(os.path.join(ARTIFACT_DIR, MANIFEST_FILE))
+
+            # (설명, 실행 전 작업, 다시 실행되어야 하는 단계)
+            steps = [
+                ("첫 실행", None, None),
+                ("정리 직후 (변경 없음)", None, set()),
+                ("변경 없음", None, set()),
+                ("파이프라인 수정 후", edit, {"polestar", "write_outputs"}),
+                ("정리 직후 (변경 없음)", None, set()),
+                ("변경 없음", None, set()),
+                ("아티팩트 매니페스트 삭제 후", remove_manifest, {"write_outputs"}),
+                ("변경 없음", None, set()),
+            ]
+            for label, before, expected in steps:
+                if before:
+                    before()
+                with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                    records = _run_incremental()
+                if expected is None:
+                    continue
+                reran = {name for name, r in records.items() if r["status"] not in CACHE_STATUSES}
+                ok = reran == expected
+                failures += not ok
+                print(f"[{'통과' if ok else '실패'}] {label}: 다시 실행한 단계 {', '.join(sorted(reran)) or '없음'}")
+        finally:
+            os.chdir(cwd)
+
+    print("-" * 60)
+    print("증분 실행 캐시 정상" if not failures else f"확인 실패 {failures}건")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
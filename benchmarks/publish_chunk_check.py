@@ -0,0 +1,81 @@
+"""
+아티팩트 증분 배포 청크 재사용 확인.
+
+3분기 먼저 쌓인 분기 데이터셋(df_1/df_2/df_5 와 같은 순서)과 신청일자로 나뉘는 데이터셋을 임시 아티팩트 폴더에 쓰고
+artifact_publish.publish 로 배포한 뒤, 3분기 행만 하나 추가하고 다시 배포합니다.
+  - 3분기가 아닌 분기 청크의 해시가 그대로인지 (다시 올리지 않는지)
+  - fetch 로 조립한 아티팩트가 원래 아티팩트와 같은 내용/행 순서인지
+를 확인하고, 하나라도 어긋나면 종료 코드 1로 끝납니다.
+
+실행:
+  python benchmarks/publish_chunk_check.py
+"""
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+import pandas as pd
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from artifact_publish import fetch, publish
+from artifact_store import LazyArtifacts, write_artifacts
+
+CHANGED_PARTITIONS = {"3분기", "2025-3Q"}
+
+
+def _datasets(extra_q3_rows):
+    """분기 컬럼 데이터셋(3분기 → 2분기 → 1분기 순서)과 신청일자 데이터셋 (3분기에 extra_q3_rows 행 추가)"""
+    quarters = []
+    for quarter, months in (("3분기", (7, 9)), ("2분기", (4, 6)), ("1분기", (1, 3))):
+        days = pd.date_range(f"2025-{months[0]:02d}-01", f"2025-{months[1]:02d}-28", freq="D")
+        if quarter == "3분기":
+            days = days.append(pd.date_range("2025-09-29", periods=extra_q3_rows, freq="D"))
+        values = (days.dayofyear.to_numpy() * 37) % 100  # 행 수가 바뀌어도 같은 날짜는 같은 값
+        quarters.append(pd.DataFrame({"날짜": days, "분기": quarter, "값": values}))
+    df_quarter = pd.concat(quarters, ignore_index=True)
+    df_apply = df_quarter.rename(columns={"날짜": "신청일자"}).drop(columns="분기")
+    return {"df_quarter": df_quarter, "df_apply": df_apply}
+
+
+def _publish(workspace, store, extra_q3_rows):
+    artifact_dir = os.path.join(workspace, f"artifacts_{extra_q3_rows}")
+    write_artifacts(_datasets(extra_q3_rows), artifact_dir)
+    return artifact_dir, publish(store, artifact_dir)
+
+
+def main():
+    failures = 0
+    with tempfile.TemporaryDirectory() as workspace:
+        store = os.path.join(workspace, "store")
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            _, before = _publish(workspace, store, 0)
+            artifact_dir, after = _publish(workspace, store, 1)
+            received = os.path.join(workspace, "received")
+            fetch(store, received, os.path.join(workspace, "chunk_cache"))
+
+        for name, dataset in after["datasets"].items():
+            previous = {chunk["partition"]: chunk["sha256"] for chunk in before["datasets"][name]["chunks"]}
+            for chunk in dataset["chunks"]:
+                reused = previous.get(chunk["partition"]) == chunk["sha256"]
+                expected = chunk["partition"] not in CHANGED_PARTITIONS
+                status = "통과" if reused == expected else "실패"
+                failures += reused != expected
+                print(f"[{status}] {name} {chunk['partition']}: {'재사용' if reused else '새 청크'}")
+
+            original = LazyArtifacts(artifact_dir)[name]
+            assembled = LazyArtifacts(received)[name]
+            same = original.equals(assembled) and original.index.equals(assembled.index)
+            failures += not same
+            print(f"[{'통과' if same else '실패'}] {name} 조립 결과가 원래 아티팩트와 같음")
+
+    print("-" * 60)
+    print("3분기 밖 청크 모두 재사용" if not failures else f"확인 실패 {failures}건")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
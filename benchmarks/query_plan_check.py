@@ -0,0 +1,96 @@
+"""
+data.db 날짜 조회 실행 계획 확인.
+
+임시 data.db 를 DatabaseManager 스키마(날짜 인덱스 마이그레이션 포함)로 만든 뒤
+DatabaseManager.get_*_data 의 기간 조회, 폴스타 연도 조회, 기간 집계 조회와
+pull_changes 의 변경분 조회(전처리 테이블 사본 갱신)를 EXPLAIN QUERY PLAN 으로 확인합니다.
+테이블 전체 스캔(SCAN <테이블>) 또는 ORDER BY 용 임시 B-트리가 나오면 실패로 표시하고 종료 코드 1로 끝납니다.
+(집계 조회의 GROUP BY 임시 B-트리는 결과 행 수만큼이라 허용합니다.)
+
+실행:
+  python benchmarks/query_plan_check.py
+"""
+import os
+import sys
+import tempfile
+from contextlib import redirect_stdout
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+
+from db_manager import CHANGE_LOG_TABLE, DatabaseManager, build_aggregate_query, build_select_query, change_log_version
+
+START, END = "2025-08-01", "2025-08-31"
+
+
+def _captured_queries(db, getter, *args, keep=lambda query: True):
+    """getter(*args) 가 실행한 SQL (파라미터가 채워진 문장) 중 keep 을 만족하는 SELECT"""
+    queries = []
+    conn = db.reader()  # get_*_data / pull_changes 는 읽기 전용 연결로 조회합니다.
+    conn.set_trace_callback(queries.append)
+    try:
+        getter(*args)
+    finally:
+        conn.set_trace_callback(None)
+    selects = [q for q in queries if q.lstrip().upper().startswith("SELECT") and keep(q)]
+    if not selects:
+        raise RuntimeError(f"{getter.__name__} 의 조회 SQL 을 확인하지 못했습니다.")
+    return selects
+
+
+def _plan_problems(conn, query, params=()):
+    """실행 계획 상세 목록과 문제 항목 (전체 스캔, 정렬용 임시 B-트리)"""
+    details = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + query, params)]
+    problems = [d for d in details if (d.startswith("SCAN") and "USING" not in d) or "TEMP B-TREE FOR ORDER BY" in d]
+    return details, problems
+
+
+def main():
+    import 전처리
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as workspace:
+        db_path = os.path.join(workspace, "data.db")
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            db = DatabaseManager(db_path)  # 스키마/인덱스 생성 메시지는 출력하지 않습니다.
+        try:
+            checks = [(name, query, ()) for name, getter in (
+                ("get_pipeline_data", db.get_pipeline_data),
+                ("get_support_data", db.get_support_data),
+                ("get_special_data", db.get_special_data),
+                ("get_tesla_data", db.get_tesla_data),
+            ) for query in _captured_queries(db, getter, START, END)]
+            # 변경분 조회 (버전 확인, 트리거 확인처럼 sqlite_master/sqlite_sequence 를 보는 문장은 제외)
+            checks += [("pull_changes", query, ()) for query in _captured_queries(
+                db, db.pull_changes, change_log_version(db.reader()), ["파이프라인"],
+                keep=lambda q: f"FROM {CHANGE_LOG_TABLE} WHERE 테이블" in q or "WHERE rowid IN" in q,
+            )]
+            year = 전처리.POLESTAR_YEAR
+            year_range = (f"{year}-01-01", f"{year}-12-31")
+            checks += [
+                ("폴스타 연도 조회 파이프라인", *build_select_query("파이프라인", 전처리.POLESTAR_PIPELINE_COLUMNS, *year_range)),
+                ("폴스타 연도 조회 지원신청", *build_select_query("지원신청", 전처리.POLESTAR_SUPPORT_COLUMNS, *year_range)),
+                ("지원신청 월별 합계", *build_aggregate_query("지원신청", ["지원신청", "PAK_내부지원"], "month", None, *year_range)),
+                ("테슬라_지급 분기별 합계", *build_aggregate_query("테슬라_지급", ["배분", "신청"], "quarter", None, *year_range)),
+            ]
+
+            for name, query, params in checks:
+                details, problems = _plan_problems(db.connection, query, params)
+                status = "실패" if problems else "통과"
+                failures += bool(problems)
+                print(f"[{status}] {name}: {' / '.join(details)}")
+
+            unique = [table for table in ("파이프라인", "지원신청", "테슬라_지급") if db._has_unique_date(table)]
+            print(f"날짜 UNIQUE (일괄 저장 ON CONFLICT 사용): {', '.join(unique) or '없음'}")
+        finally:
+            with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+                db.close()
+
+    print("-" * 60)
+    print("전체 스캔 없음" if not failures else f"전체 스캔/임시 정렬 {failures}건")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
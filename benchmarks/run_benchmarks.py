@@ -0,0 +1,332 @@
+"""
+전처리/보고서 주요 함수 벤치마크.
+
+synthetic_data.py 로 규모별(1배/10배/100배) 합성 입력을 만든 뒤 아래 함수의
+실행 시간(여러 번 실행한 최솟값)과 최대 메모리(tracemalloc, 별도 1회 실행)를 측정합니다.
+  - 전처리: 전처리.preprocess_and_save_data (캐시 없이 전체 실행 / 증분 재실행)
+  - 일별집계: daily_rollup.build_daily_rollup
+  - 리테일요약: retail_summary.calculate_retail_summary (금일/기간별)
+  - 리테일월별요약: retail_summary.calculate_retail_monthly_summary (전체/분기/월)
+  - 지도카운트: map_layers.build_map_layers (전처리에서 분기별 값 테이블 계산)
+  - 지도레이어조인: map_layers.join_map_layer (뷰어 실행 시 지오메트리에 분기 값 붙이기)
+  - 지도인구통계: map_viewer._build_demographics_map
+
+실행:
+  python benchmarks/run_benchmarks.py                    # 1배, 10배 측정 후 결과 출력
+  python benchmarks/run_benchmarks.py --scales 1,10,100  # 100배 포함 (합성 데이터 생성/전처리에 오래 걸림)
+  python benchmarks/run_benchmarks.py --save-baseline    # 결과를 benchmarks/baseline.json 에 저장
+  python benchmarks/run_benchmarks.py --compare          # baseline.json 과 비교해 느려지거나 메모리가 늘어난 항목 표시
+옵션:
+  --baseline <경로>    기준 파일 (기본 benchmarks/baseline.json)
+  --tolerance <비율>   회귀로 판단할 증가율 (기본 0.25 = 25%)
+  --only <이름,...>    일부 벤치마크만 실행
+  --repeat <횟수>      시간 측정 반복 횟수 (기본 3, 전처리는 1회)
+  --skip-memory        메모리 측정 생략 (tracemalloc 측정은 전처리를 몇 배 느리게 함)
+--compare 에서 회귀가 있으면 종료 코드 1로 끝납니다.
+"""
+import json
+import os
+import platform
+import shutil
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, BENCH_DIR)
+# 그리트_공유 폴더는 합성 데이터에 없으므로 실제 공유 폴더를 읽지 않도록 빈 경로로 지정합니다 (전처리 임포트 전).
+os.environ["GRIT_SHARED_FOLDER"] = os.path.join(BENCH_DIR, ".data", "그리트_공유")
+
+import pandas as pd
+
+from synthetic_data import generate_workspace
+
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_SCALES = "1,10"
+DEFAULT_TOLERANCE = 0.25
+# 측정 오차 수준의 차이는 회귀로 보지 않습니다.
+MIN_SECONDS_DELTA = 0.005
+MIN_MB_DELTA = 1.0
+
+# 전처리 실행 시 작업 폴더에 생기는 캐시/출력 (캐시 없는 실행 전에 지웁니다)
+PREPROCESS_OUTPUTS = (".workbook_cache", ".preprocess_cache", "preprocess_manifest.json", "artifacts",
+                      "preprocessed_data.pkl", "preprocessed_cloud.pkl", "df_6.pkl.gz", "df_tesla_ev.pkl.gz")
+
+DAY0 = date(2025, 9, 30)  # 합성 데이터 3분기 마지막 날
+DAY1 = date(2025, 9, 29)
+Q3_START = date(2025, 6, 24)
+MONTHLY_PERIODS = ("전체", "3Q", "2Q", "1Q", "8월")
+
+
+class Skipped(Exception):
+    """실행 환경에 필요한 패키지가 없어 측정하지 못한 벤치마크"""
+
+
+def _clear_outputs(workspace):
+    for name in PREPROCESS_OUTPUTS:
+        path = os.path.join(workspace, name)
+        if os.path.isdir(path):
+            shutil.rmtree(path)
+        elif os.path.exists(path):
+            os.remove(path)
+
+
+class Context:
+    """규모별 작업 폴더와 전처리 결과 (보고서 함수 벤치마크의 입력)"""
+
+    def __init__(self, scale):
+        self.scale = scale
+        self.workspace = os.path.join(DATA_DIR, f"scale_{scale}")
+        self._outputs = None
+
+    def preprocess(self, incremental=False):
+        import 전처리
+        cwd = os.getcwd()
+        os.chdir(self.workspace)
+        try:
+            return 전처리.preprocess_and_save_data(incremental=incremental, max_workers=1, publish=False)
+        finally:
+            os.chdir(cwd)
+
+    @property
+    def outputs(self):
+        if self._outputs is None:
+            self._outputs = self.preprocess(incremental=True)
+        return self._outputs
+
+    def rollup(self):
+        from daily_rollup import DailyRollup
+        return DailyRollup(self.outputs["daily_rollup"])
+
+
+def _map_viewer():
+    try:
+        import map_viewer
+    except ImportError as e:
+        raise Skipped(f"map_viewer 를 불러올 수 없습니다 ({e})")
+    return map_viewer
+
+
+def _uncached(func):
+    """st.cache_data 로 감싼 함수는 원본 함수를 측정합니다 (캐시 적중 시간이 아니라 계산 시간)."""
+    return getattr(func, "__wrapped__", func)
+
+
+# --- 벤치마크 정의: 이름 -> (준비 함수(ctx) -> 측정할 인자 없는 함수, 반복 횟수 / None 이면 --repeat) ---
+def prepare_preprocess_full(ctx):
+    def run():
+        _clear_outputs(ctx.workspace)
+        ctx.preprocess()
+    return run
+
+
+def prepare_preprocess_incremental(ctx):
+    ctx.outputs  # 캐시 채우기
+    return lambda: ctx.preprocess(incremental=True)
+
+
+def prepare_daily_rollup(ctx):
+    from daily_rollup import build_daily_rollup
+    df_1, df_2, df_5, df_2_fail_q3 = ctx.outputs["retail_frames"]
+    frames = {"df_1": df_1, "df_2": df_2, "df_5": df_5, "df_fail_q3": ctx.outputs["q3_미신청건"], "df_2_fail_q3": df_2_fail_q3}
+    return lambda: build_daily_rollup(frames)
+
+
+def prepare_retail_summary(ctx):
+    from retail_summary import calculate_retail_summary
+    rollup = ctx.rollup()
+
+    def run():
+        calculate_retail_summary('금일 조회', None, None, DAY0, DAY1, Q3_START, Q3_START, rollup)
+        calculate_retail_summary('기간별 조회', date(2025, 7, 1), DAY0, DAY0, DAY1, Q3_START, Q3_START, rollup)
+    return run
+
+
+def prepare_retail_monthly_summary(ctx):
+    from retail_summary import calculate_retail_monthly_summary
+    rollup = ctx.rollup()
+    sales_data = {month: 1000 for month in range(1, 13)}
+
+    def run():
+        for period in MONTHLY_PERIODS:
+            calculate_retail_monthly_summary(period, '내부', DAY0, rollup, sales_data)
+    return run
+
+
+def prepare_map_counts(ctx):
+    from map_layers import build_map_layers
+    return lambda: build_map_layers(ctx.outputs["map"], ctx.outputs["quarterly_region_counts"])
+
+
+def prepare_map_join(ctx):
+    from map_layers import join_map_layer
+    values, unmatched = ctx.outputs["map_layers"]
+
+    def run():
+        for quarter in ("전체", "1Q", "2Q", "3Q"):
+            join_map_layer(ctx.outputs["map"], values, unmatched, quarter)
+    return run
+
+
+def prepare_map_demographics(ctx):
+    from ev_features import add_age_columns
+    from map_layers import join_map_layer
+    map_viewer = _map_viewer()
+    df_6 = add_age_columns(ctx.outputs["df_6"])
+    values, unmatched = ctx.outputs["map_layers"]
+    geojson, _ = join_map_layer(ctx.outputs["map"], values, unmatched, "전체")
+    return lambda: map_viewer._build_demographics_map(df_6, geojson, "전체")
+
+
+BENCHMARKS = {
+    "전처리": (prepare_preprocess_full, 1),
+    "전처리_증분": (prepare_preprocess_incremental, 1),
+    "일별집계": (prepare_daily_rollup, None),
+    "리테일요약": (prepare_retail_summary, None),
+    "리테일월별요약": (prepare_retail_monthly_summary, None),
+    "지도카운트": (prepare_map_counts, None),
+    "지도레이어조인": (prepare_map_join, None),
+    "지도인구통계": (prepare_map_demographics, 1),
+}
+
+
+def measure(run, repeat, trace_memory=True):
+    """(최소 실행 시간(초), 최대 메모리 증가량(MB) 또는 None)"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+
+    peak_mb = None
+    if trace_memory:
+        tracemalloc.start()
+        try:
+            run()
+            peak_mb = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        finally:
+            tracemalloc.stop()
+    return min(timings), peak_mb
+
+
+def run_suite(scales, names, repeat, trace_memory):
+    """{규모: {벤치마크: {"seconds", "peak_mb"} 또는 {"skipped"}}}"""
+    results = {}
+    for scale in scales:
+        ctx = Context(scale)
+        print(f"\n=== {scale}배 합성 데이터 준비: {ctx.workspace}")
+        started = time.perf_counter()
+        generate_workspace(ctx.workspace, scale)
+        print(f"    준비 {time.perf_counter() - started:.1f}초")
+
+        results[str(scale)] = {}
+        for name in names:
+            prepare, fixed_repeat = BENCHMARKS[name]
+            try:
+                run = prepare(ctx)
+                seconds, peak_mb = measure(run, fixed_repeat or repeat, trace_memory)
+                entry = {"seconds": round(seconds, 4), "peak_mb": None if peak_mb is None else round(peak_mb, 2)}
+            except Skipped as e:
+                entry = {"skipped": str(e)}
+            results[str(scale)][name] = entry
+            print(f"    {name}: {_format_entry(entry)}")
+    return results
+
+
+def _format_entry(entry):
+    if "skipped" in entry:
+        return f"건너뜀 - {entry['skipped']}"
+    memory = "-" if entry["peak_mb"] is None else f"{entry['peak_mb']:.1f}MB"
+    return f"{entry['seconds']:.4f}초, 최대 메모리 {memory}"
+
+
+def print_results(results):
+    print()
+    print(f"{'규모':<6}{'벤치마크':<16}{'시간(초)':>12}{'최대 메모리(MB)':>18}")
+    print("-" * 56)
+    for scale, entries in results.items():
+        for name, entry in entries.items():
+            if "skipped" in entry:
+                print(f"{scale + '배':<6}{name:<16}{'건너뜀':>12}{'-':>18}")
+                continue
+            memory = "-" if entry["peak_mb"] is None else f"{entry['peak_mb']:.1f}"
+            print(f"{scale + '배':<6}{name:<16}{entry['seconds']:>12.4f}{memory:>18}")
+
+
+def compare(results, baseline, tolerance):
+    """기준 대비 시간/메모리 증가율이 tolerance 를 넘는 항목 목록을 출력하고 반환합니다."""
+    regressions = []
+    print()
+    print(f"{'규모':<6}{'벤치마크':<16}{'시간 기준→현재':>24}{'메모리 기준→현재(MB)':>26}")
+    print("-" * 72)
+    for scale, entries in results.items():
+        for name, entry in entries.items():
+            base = baseline.get("results", {}).get(scale, {}).get(name)
+            if base is None or "skipped" in base or "skipped" in entry:
+                continue
+            flags = []
+            if entry["seconds"] - base["seconds"] > max(MIN_SECONDS_DELTA, base["seconds"] * tolerance):
+                flags.append("시간")
+            if (entry["peak_mb"] is not None and base.get("peak_mb") is not None
+                    and entry["peak_mb"] - base["peak_mb"] > max(MIN_MB_DELTA, base["peak_mb"] * tolerance)):
+                flags.append("메모리")
+            time_text = f"{base['seconds']:.4f}→{entry['seconds']:.4f}"
+            memory_text = "-" if entry["peak_mb"] is None or base.get("peak_mb") is None else f"{base['peak_mb']:.1f}→{entry['peak_mb']:.1f}"
+            mark = f"  ⚠️ 회귀({', '.join(flags)})" if flags else ""
+            print(f"{scale + '배':<6}{name:<16}{time_text:>24}{memory_text:>26}{mark}")
+            if flags:
+                regressions.append((scale, name, flags))
+    print("-" * 72)
+    if regressions:
+        print(f"회귀 {len(regressions)}건 (허용 증가율 {tolerance:.0%})")
+    else:
+        print(f"회귀 없음 (허용 증가율 {tolerance:.0%})")
+    return regressions
+
+
+def _option(name, default=None):
+    if name in sys.argv:
+        return sys.argv[sys.argv.index(name) + 1]
+    return default
+
+
+def main():
+    scales = [int(s) if float(s).is_integer() else float(s) for s in _option("--scales", DEFAULT_SCALES).split(",")]
+    names = _option("--only", ",".join(BENCHMARKS)).split(",")
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        print(f"알 수 없는 벤치마크: {', '.join(unknown)} (사용 가능: {', '.join(BENCHMARKS)})")
+        sys.exit(2)
+    baseline_path = _option("--baseline", DEFAULT_BASELINE)
+    tolerance = float(_option("--tolerance", DEFAULT_TOLERANCE))
+    repeat = int(_option("--repeat", 3))
+
+    results = run_suite(scales, names, repeat, trace_memory="--skip-memory" not in sys.argv)
+    print_results(results)
+
+    if "--save-baseline" in sys.argv:
+        payload = {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "environment": {"python": platform.python_version(), "pandas": pd.__version__, "platform": platform.platform(), "cpus": os.cpu_count()},
+            "results": results,
+        }
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"\n기준 결과를 저장했습니다: {baseline_path}")
+
+    if "--compare" in sys.argv:
+        if not os.path.exists(baseline_path):
+            print(f"기준 파일이 없습니다: {baseline_path} (먼저 --save-baseline 으로 만드세요)")
+            sys.exit(2)
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
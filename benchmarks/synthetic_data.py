@@ -0,0 +1,275 @@
+"""
+벤치마크용 합성 입력 데이터 생성기.
+
+전처리.py 가 읽는 입력과 같은 구조(시트 이름, 컬럼 이름, 값 형식)의 파일을 만듭니다.
+  - Q1.xlsx / Q2.xlsx: 지원_EV, 지급, PipeLine 시트
+  - Q3.xlsx: 미신청건 시트
+  - data.db: 테슬라_지원신청, 테슬라_지급, pipeline, 파이프라인, 지원신청 테이블
+  - 2025년 테슬라 EV추출파일.xlsx: 지역구분/신청일자/성별/생년월일/차종/신청유형 등
+  - preprocessed_map.geojson: 지도 지역(sggnm)
+
+지역명은 저장소의 preprocessed_map.geojson 이 있으면 그 sggnm 에서 가져오고,
+없으면 FALLBACK_SGGNM 목록으로 사각형 폴리곤 GeoJSON 을 만듭니다.
+
+규모(scale)는 현재 운영 데이터량 추정치(SCALE_1X)에 곱하는 배수입니다 (1 / 10 / 100).
+날짜 범위(분기)는 고정이고 하루당 건수와 행 수가 배수만큼 늘어납니다.
+
+실행: python benchmarks/synthetic_data.py <출력 폴더> [배수, 기본 1]
+"""
+import json
+import os
+import sqlite3
+import sys
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+from db_manager import DatabaseManager
+
+GENERATOR_VERSION = 1  # 생성 규칙이 바뀌면 올려서 캐시된 작업 폴더를 다시 만듭니다.
+YEAR = 2025
+
+# 현재(1배) 운영 데이터량 추정치
+SCALE_1X = {
+    "daily_apply": 40,        # 하루 지원 신청 건수 (지원_EV / 테슬라_지원신청 개수)
+    "daily_distribute": 30,   # 하루 지급 배분/신청 건수
+    "q1_pipeline_daily": 35,  # 1분기 PipeLine 시트(집계형) 하루 메일 건수
+    "q2_pipeline_rows": 3000,   # 2분기 PipeLine 시트 행 수 (메일 1건 = 1행)
+    "q3_pipeline_rows": 3000,   # pipeline 테이블 행 수
+    "q3_fail_rows": 300,        # 미신청건 시트 행 수
+    "ev_extract_rows": 20000,   # EV추출파일 행 수
+}
+
+QUARTER_RANGES = {
+    "Q1": ("2025-01-02", "2025-03-31"),
+    "Q2": ("2025-04-01", "2025-06-23"),
+    "Q3": ("2025-06-24", "2025-09-30"),
+}
+
+# EV추출파일 헤더 (전처리에서 읽는 컬럼 외에 실제 파일처럼 다른 컬럼도 포함)
+EV_EXTRACT_COLUMNS = [
+    "순번", "지역구분", "신청번호", "신청일자", "지급신청일자", "신청유형", "성명",
+    "생년월일\n(법인등록번호)", "성별", "주소\n(등록주소지)", "차종", "제조사", "작성자", "진행상태",
+]
+
+FALLBACK_SGGNM = [
+    "서울특별시 강남구", "서울특별시 송파구", "서울특별시 마포구", "부산광역시 해운대구", "부산광역시 부산진구",
+    "대구광역시 수성구", "인천광역시 연수구", "광주광역시 북구", "대전광역시 유성구", "울산광역시 남구",
+    "세종특별자치시 세종시", "경기도 수원시영통구", "경기도 수원시장안구", "경기도 성남시분당구", "경기도 고양시일산동구",
+    "경기도 부천시소사구", "경기도 부천시오정구", "경기도 용인시수지구", "경기도 화성시", "경기도 평택시",
+    "경기도 가평군", "강원특별자치도 춘천시", "강원특별자치도 원주시", "충청북도 청주시흥덕구", "충청남도 천안시서북구",
+    "충청남도 아산시", "전북특별자치도 전주시완산구", "전라남도 순천시", "경상북도 포항시남구", "경상북도 구미시",
+    "경상남도 창원시성산구", "경상남도 김해시", "제주특별자치도 제주시", "제주특별자치도 서귀포시",
+]
+
+
+def _region_key(sggnm):
+    """지도 지역명(sggnm)을 EV추출파일 '지역구분' 값으로 바꿉니다. (광역시/특별시는 시도명, 그 외는 '…시'/'…군')"""
+    parts = sggnm.split(" ", 1)
+    if len(parts) < 2:
+        return sggnm
+    sido, body = parts
+    if sido.endswith(("특별시", "광역시")):
+        return sido
+    if sido.startswith("제주") or sido.startswith("세종"):
+        return sido
+    idx = body.find("시")
+    return body[:idx + 1] if idx >= 0 else body
+
+
+def load_region_names(geojson_path=os.path.join(REPO_ROOT, "preprocessed_map.geojson")):
+    """(sggnm 목록, 원본 GeoJSON 또는 None)"""
+    if os.path.exists(geojson_path):
+        with open(geojson_path, "r", encoding="utf-8") as f:
+            geojson = json.load(f)
+        names = [feat["properties"]["sggnm"] for feat in geojson.get("features", []) if feat.get("properties", {}).get("sggnm")]
+        if names:
+            return names, geojson
+    return list(FALLBACK_SGGNM), None
+
+
+def synthetic_geojson(names):
+    """지역마다 작은 사각형 폴리곤 하나를 가진 GeoJSON"""
+    features = []
+    for i, name in enumerate(names):
+        x, y = 126.0 + (i % 20) * 0.1, 34.0 + (i // 20) * 0.1
+        ring = [[x, y], [x + 0.09, y], [x + 0.09, y + 0.09], [x, y + 0.09], [x, y]]
+        features.append({"type": "Feature", "geometry": {"type": "Polygon", "coordinates": [ring]}, "properties": {"sggnm": name}})
+    return {"type": "FeatureCollection", "features": features}
+
+
+def volumes(scale):
+    """배수를 적용한 행 수/하루 건수"""
+    return {key: int(value * scale) for key, value in SCALE_1X.items()}
+
+
+def _days(quarter):
+    return pd.date_range(*QUARTER_RANGES[quarter])
+
+
+def _random_dates(rng, quarter, n):
+    days = _days(quarter)
+    return pd.Series(np.sort(rng.choice(days.values, n)))
+
+
+def _daily_counts(rng, mean, n):
+    return rng.poisson(mean, n)
+
+
+def write_quarter_workbooks(out_dir, rng, vol):
+    """Q1.xlsx, Q2.xlsx, Q3.xlsx"""
+    for quarter in ("Q1", "Q2"):
+        days = _days(quarter)
+        if quarter == "Q1":
+            pipeline = pd.DataFrame({"날짜": days, "개수": _daily_counts(rng, vol["q1_pipeline_daily"], len(days))})
+        else:
+            n = vol["q2_pipeline_rows"]
+            pipeline = pd.DataFrame({"날짜": _random_dates(rng, quarter, n), "RN": [f"RN{i:08d}" for i in range(n)]})
+        with pd.ExcelWriter(os.path.join(out_dir, f"{quarter}.xlsx")) as writer:
+            pd.DataFrame({"날짜": days, "개수": _daily_counts(rng, vol["daily_apply"], len(days))}).to_excel(writer, sheet_name="지원_EV", index=False)
+            pd.DataFrame({
+                "날짜": days,
+                "배분": _daily_counts(rng, vol["daily_distribute"], len(days)),
+                "신청": _daily_counts(rng, vol["daily_distribute"], len(days)),
+            }).to_excel(writer, sheet_name="지급", index=False)
+            pipeline.to_excel(writer, sheet_name="PipeLine", index=False)
+
+    n = vol["q3_fail_rows"]
+    dates = _random_dates(rng, "Q3", n)
+    notes = [f"{d.month}/{d.day} {reason}" for d, reason in zip(dates, rng.choice(["서류 미비", "고객 연락 두절", "보완 요청"], n))]
+    with pd.ExcelWriter(os.path.join(out_dir, "Q3.xlsx")) as writer:
+        pd.DataFrame({"날짜": dates, "Greet Note": notes}).to_excel(writer, sheet_name="미신청건", index=False)
+
+
+def write_database(out_dir, rng, vol):
+    """data.db (DatabaseManager 스키마 + 3분기 테이블)"""
+    db_path = os.path.join(out_dir, "data.db")
+    if os.path.exists(db_path):
+        os.remove(db_path)
+    DatabaseManager(db_path).close()
+
+    days = _days("Q3").strftime("%Y-%m-%d")
+    year_days = pd.date_range(f"{YEAR}-01-02", QUARTER_RANGES["Q3"][1]).strftime("%Y-%m-%d")
+    with closing(sqlite3.connect(db_path)) as conn:
+        pd.DataFrame({"날짜": days, "개수": _daily_counts(rng, vol["daily_apply"], len(days))}).to_sql("테슬라_지원신청", conn, index=False)
+        n = vol["q3_pipeline_rows"]
+        pd.DataFrame({
+            "날짜": _random_dates(rng, "Q3", n).dt.strftime("%Y-%m-%d"),
+            "RN": [f"Q3RN{i:08d}" for i in range(n)],
+        }).to_sql("pipeline", conn, index=False)
+        conn.executemany(
+            "INSERT INTO 테슬라_지급 (날짜, 배분, 신청, 지급_잔여) VALUES (?, ?, ?, ?)",
+            [(d, int(a), int(b), int(c)) for d, a, b, c in zip(
+                days,
+                _daily_counts(rng, vol["daily_distribute"], len(days)),
+                _daily_counts(rng, vol["daily_distribute"], len(days)),
+                _daily_counts(rng, max(1, vol["daily_distribute"] // 10), len(days)),
+            )],
+        )
+        conn.executemany(
+            "INSERT INTO 파이프라인 (날짜, 파이프라인) VALUES (?, ?)",
+            [(d, int(v)) for d, v in zip(year_days, _daily_counts(rng, vol["daily_apply"] // 4, len(year_days)))],
+        )
+        conn.executemany(
+            "INSERT INTO 지원신청 (날짜, 지원신청, PAK_내부지원, 접수후취소, 미신청건, 보완) VALUES (?, ?, ?, ?, ?, ?)",
+            [(d, *map(int, rng.poisson(vol["daily_apply"] // 8, 5))) for d in year_days],
+        )
+        conn.commit()
+
+
+def _birth_values(rng, n):
+    """'19850312' / '1985-03-12' / 법인등록번호(10자리) 가 섞인 생년월일 컬럼"""
+    years = rng.integers(1945, 2005, n)
+    months = rng.integers(1, 13, n)
+    days = rng.integers(1, 29, n)
+    kind = rng.random(n)
+    values = []
+    for y, m, d, k in zip(years, months, days, kind):
+        if k < 0.6:
+            values.append(f"{y}{m:02d}{d:02d}")
+        elif k < 0.9:
+            values.append(f"{y}-{m:02d}-{d:02d}")
+        else:
+            values.append(f"{rng.integers(1_000_000_000, 9_999_999_999)}")
+    return values
+
+
+def write_ev_extract(out_dir, rng, vol, region_keys):
+    """EV추출파일 (행이 많아지므로 openpyxl write-only 모드로 한 행씩 씁니다)"""
+    from openpyxl import Workbook
+
+    n = vol["ev_extract_rows"]
+    year_days = pd.date_range(f"{YEAR}-01-02", QUARTER_RANGES["Q3"][1])
+    apply_dates = pd.to_datetime(np.sort(rng.choice(year_days.values, n)))
+    columns = {
+        "지역구분": rng.choice(region_keys, n),
+        "신청유형": rng.choice(["개인", "개인사업자", "법인", "단체", "공공기관"], n, p=[0.7, 0.15, 0.1, 0.03, 0.02]),
+        "성별": rng.choice(["남", "여", "남자", "여성", None], n, p=[0.5, 0.3, 0.05, 0.05, 0.1]),
+        "차종": rng.choice(["Model Y RWD", "Model Y Long Range", "Model 3 RWD", "Model 3 Long Range"], n),
+        "작성자": rng.choice(["WU CHANGSHI", "김그리트", "이그리트", "박그리트"], n),
+        "진행상태": rng.choice(["신청", "지급신청", "지급완료", "취소"], n),
+        "생년월일\n(법인등록번호)": _birth_values(rng, n),
+    }
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(EV_EXTRACT_COLUMNS)
+    for i in range(n):
+        applied = apply_dates[i].to_pydatetime()
+        sheet.append([
+            i + 1,
+            columns["지역구분"][i],
+            f"2025-{i:08d}",
+            applied,
+            None if columns["진행상태"][i] == "신청" else applied + pd.Timedelta(days=30),
+            columns["신청유형"][i],
+            f"고객{i}",
+            columns["생년월일\n(법인등록번호)"][i],
+            columns["성별"][i],
+            f"{columns['지역구분'][i]} 중앙로 {i % 500}",
+            columns["차종"][i],
+            "Tesla",
+            columns["작성자"][i],
+            columns["진행상태"][i],
+        ])
+    workbook.save(os.path.join(out_dir, "2025년 테슬라 EV추출파일.xlsx"))
+
+
+def generate_workspace(out_dir, scale=1, seed=0):
+    """
+    out_dir 에 배수 scale 의 합성 입력 전체를 만듭니다.
+    같은 (scale, seed, GENERATOR_VERSION) 으로 이미 만든 폴더면 다시 만들지 않습니다.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    stamp_path = os.path.join(out_dir, ".synthetic.json")
+    stamp = {"scale": scale, "seed": seed, "version": GENERATOR_VERSION}
+    if os.path.exists(stamp_path):
+        with open(stamp_path, "r", encoding="utf-8") as f:
+            if json.load(f) == stamp:
+                return out_dir
+
+    rng = np.random.default_rng(seed)
+    vol = volumes(scale)
+    names, geojson = load_region_names()
+    region_keys = sorted({_region_key(name) for name in names})
+
+    write_quarter_workbooks(out_dir, rng, vol)
+    write_database(out_dir, rng, vol)
+    write_ev_extract(out_dir, rng, vol, region_keys)
+    with open(os.path.join(out_dir, "preprocessed_map.geojson"), "w", encoding="utf-8") as f:
+        json.dump(geojson or synthetic_geojson(names), f, ensure_ascii=False)
+
+    with open(stamp_path, "w", encoding="utf-8") as f:
+        json.dump(stamp, f)
+    return out_dir
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("사용법: python benchmarks/synthetic_data.py <출력 폴더> [배수]")
+        sys.exit(1)
+    target = generate_workspace(sys.argv[1], float(sys.argv[2]) if len(sys.argv) > 2 else 1)
+    print(f"합성 데이터 생성 완료: {target}")
@@ -0,0 +1,148 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+from datetime import datetime
+
+from db_manager import change_log_version
+
+MANIFEST_PATH = "preprocess_manifest.json"
+CACHE_DIR = ".preprocess_cache"
+MANIFEST_VERSION = 2  # 캐시 항목 형식이 바뀌면 올립니다 (이전 캐시는 무시)
+
+
+def _hash_file(path, block_size=1 << 20):
+    """파일 내용의 sha256 해시를 계산합니다."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class BuildCache:
+    """
+    전처리 입력(엑셀 파일, SQLite 테이블)의 지문을 매니페스트에 기록하고,
+    입력이 바뀌지 않은 프레임은 캐시에서 재사용합니다.
+    """
+
+    def __init__(self, manifest_path=MANIFEST_PATH, cache_dir=CACHE_DIR, incremental=True):
+        self.manifest_path = manifest_path
+        self.cache_dir = cache_dir
+        self.incremental = incremental
+        self.manifest = self._load_manifest()
+        self.stats = {"hit": [], "rebuilt": []}
+
+    def _load_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if isinstance(manifest, dict) and manifest.get("version") == MANIFEST_VERSION:
+                return manifest
+        except (FileNotFoundError, json.JSONDecodeError):
+            pass
+        return {"version": MANIFEST_VERSION, "entries": {}, "files": {}}
+
+    def fingerprint_file(self, path):
+        """
+        파일 지문(size/mtime/sha256)을 계산합니다.
+        size/mtime이 이전과 같으면 해시를 다시 계산하지 않습니다.
+        """
+        if not os.path.exists(path):
+            return {"path": path, "exists": False}
+
+        stat = os.stat(path)
+        fingerprint = {"path": path, "exists": True, "size": stat.st_size, "mtime": stat.st_mtime}
+        previous = self.manifest["files"].get(path)
+        if previous and previous.get("size") == stat.st_size and previous.get("mtime") == stat.st_mtime:
+            fingerprint["sha256"] = previous["sha256"]
+        else:
+            fingerprint["sha256"] = _hash_file(path)
+        self.manifest["files"][path] = fingerprint
+        return fingerprint
+
+    def fingerprint_table(self, conn, table):
+        """
+        SQLite 테이블 지문을 계산합니다.
+        변경 로그 트리거가 있는 테이블은 마지막 변경 버전만 확인하고 (db_manager.change_log_version),
+        없으면 max rowid, 행 수, 내용 해시를 계산합니다.
+        """
+        try:
+            version = change_log_version(conn, table)
+            if version is not None:
+                return {"table": table, "change_version": version}
+            cursor = conn.execute(f'SELECT MAX(rowid), COUNT(*) FROM "{table}"')
+            max_rowid, count = cursor.fetchone()
+            # rowid를 유지하는 UPDATE도 감지하도록 행 내용까지 해시합니다 (일별 테이블이라 작음).
+            digest = hashlib.sha256()
+            for row in conn.execute(f'SELECT * FROM "{table}" ORDER BY rowid'):
+                digest.update(repr(row).encode("utf-8"))
+            return {"table": table, "max_rowid": max_rowid, "count": count, "sha256": digest.hexdigest()}
+        except sqlite3.Error as e:
+            return {"table": table, "error": str(e)}
+
+    @staticmethod
+    def _comparable(fingerprints):
+        """mtime처럼 내용과 무관한 값을 제외하고 비교용 지문을 만듭니다."""
+        comparable = []
+        for fp in fingerprints:
+            comparable.append({k: v for k, v in fp.items() if k not in ("mtime", "size")})
+        return comparable
+
+    def _cache_file(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def lookup(self, key, inputs):
+        """
+        입력 지문이 매니페스트와 같고 캐시 파일이 있으면 (True, 결과)를,
+        아니면 (False, None)을 반환합니다.
+        """
+        entry = self.manifest["entries"].get(key)
+        cache_file = self._cache_file(key)
+
+        if self.incremental and entry and entry.get("inputs") == self._comparable(inputs) and os.path.exists(cache_file):
+            try:
+                with open(cache_file, "rb") as f:
+                    result = pickle.load(f)
+                self.stats["hit"].append(key)
+                return True, result
+            except Exception as e:
+                print(f"캐시 '{key}' 로드 실패, 다시 생성합니다: {e}")
+        return False, None
+
+    def store(self, key, inputs, result):
+        """새로 만든 결과를 캐시에 저장하고 매니페스트에 입력 지문을 기록합니다."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self._cache_file(key), "wb") as f:
+                pickle.dump(result, f)
+            self.manifest["entries"][key] = {
+                "inputs": self._comparable(inputs),
+                "built_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+        except Exception as e:
+            print(f"캐시 '{key}' 저장 중 오류: {e}")
+        self.stats["rebuilt"].append(key)
+
+    def get_or_build(self, key, inputs, builder):
+        """
+        입력 지문이 매니페스트와 같으면 캐시된 결과를 반환하고,
+        다르면 builder()를 실행해 결과를 캐시에 저장합니다.
+        """
+        hit, result = self.lookup(key, inputs)
+        if hit:
+            return result
+        result = builder()
+        self.store(key, inputs, result)
+        return result
+
+    def save(self):
+        """매니페스트를 저장합니다."""
+        with open(self.manifest_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, ensure_ascii=False, indent=2)
+
+    def summary(self):
+        hit = ", ".join(self.stats["hit"]) or "-"
+        rebuilt = ", ".join(self.stats["rebuilt"]) or "-"
+        return f"캐시 재사용: {hit}\n다시 생성: {rebuilt}"
@@ -3,18 +3,14 @@ import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-import pickle
+from data_access import dataset_version, get_frame
 from datetime import datetime
 
-# --- 페이지 설정 ---
-st.set_page_config(
-    page_title="테슬라 EV 데이터 대시보드", 
-    page_icon="🚗", 
-    layout="wide"
-)
+from ev_features import add_age_columns
 
 # --- 스타일링 ---
-st.markdown("""
+# 임포트 시점이 아니라 대시보드를 그릴 때 적용합니다 (보고서.py 에서 '분석' 뷰어를 열 때만 임포트/적용).
+DASHBOARD_STYLE = """
 <style>
     .filter-container {
         background-color: #f8f9fa;
@@ -30,20 +26,18 @@ st.markdown("""
         text-align: center;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
 
 # --- 데이터 로딩 함수 ---
-@st.cache_data(ttl=3600)
-def load_tesla_data():
+@st.cache_resource(max_entries=1)  # 세션마다 복사하지 않고 공유 (반환 프레임은 수정하지 않습니다)
+def load_tesla_data(version):
     """
-    preprocessed_data.pkl에서 테슬라 EV 데이터를 로드합니다.
+    전처리 아티팩트에서 테슬라 EV 데이터를 로드합니다.
+    version(df_tesla_ev/df_master 데이터셋 버전)이 바뀐 빌드가 들어오면 다시 로드합니다.
     """
     try:
-        with open("preprocessed_data.pkl", "rb") as f:
-            data = pickle.load(f)
-        
-        df = data.get("df_tesla_ev", pd.DataFrame())
-        df_master = data.get("df_master", pd.DataFrame())
+        df = get_frame("df_tesla_ev")
+        df_master = get_frame("df_master")
         
         if df.empty:
             st.error("❌ preprocessed_data.pkl에서 테슬라 EV 데이터를 찾을 수 없습니다.")
@@ -71,13 +65,10 @@ def render_comprehensive_analysis(df_filtered):
     
     # 전처리된 데이터에서 그리트_공유 데이터 로드
     try:
-        with open("preprocessed_data.pkl", "rb") as f:
-            data = pickle.load(f)
-        
-        df_grit_overview = data.get("df_grit_overview", pd.DataFrame())
-        df_grit_amount = data.get("df_grit_amount", pd.DataFrame()) 
-        df_grit_step = data.get("df_grit_step", pd.DataFrame())
-        df_tesla = data.get("df_tesla_ev", pd.DataFrame())
+        df_grit_overview = get_frame("df_grit_overview")
+        df_grit_amount = get_frame("df_grit_amount")
+        df_grit_step = get_frame("df_grit_step")
+        df_tesla = get_frame("df_tesla_ev")
         
         if df_grit_overview.empty and df_grit_amount.empty and df_grit_step.empty:
             st.error("그리트_공유 데이터를 로드할 수 없습니다.")
@@ -350,9 +341,10 @@ def show_car_region_dashboard(data=None, today_kst=None):
     차량 지역 대시보드를 표시하는 메인 함수
     외부에서 호출할 때 사용
     """
+    st.markdown(DASHBOARD_STYLE, unsafe_allow_html=True)
     # 데이터가 외부에서 제공되지 않으면 직접 로드
     if data is None:
-        df_original, df_master = load_tesla_data()
+        df_original, df_master = load_tesla_data(dataset_version("df_tesla_ev", "df_master"))
     else:
         df_original = data.get("df_tesla_ev", pd.DataFrame())
         df_master = data.get("df_master", pd.DataFrame())
@@ -361,6 +353,9 @@ def show_car_region_dashboard(data=None, today_kst=None):
         st.warning("데이터를 불러올 수 없습니다. 파일을 확인해주세요.")
         return
 
+    # 나이/연령대는 저장된 생년월일로 조회일 기준 다시 계산
+    df_original = add_age_columns(df_original, today_kst)
+
     # --- 탭 구성 먼저 만들기 ---
     st.title("🚗 테슬라 EV 데이터 대시보드")
     tab1, tab2, tab3, tab4 = st.tabs(["📊 종합 현황", "👥 신청자 분석", "👨‍💼 작업자 분석", "🏛️ 지자체별 세부사항"])
@@ -576,4 +571,10 @@ def show_car_region_dashboard(data=None, today_kst=None):
 
 # --- 메인 실행 부분 (독립 실행용) ---
 if __name__ == "__main__":
+    # 페이지 설정은 단독 실행할 때만 (보고서.py 에서 임포트할 때는 보고서가 설정합니다)
+    st.set_page_config(
+        page_title="테슬라 EV 데이터 대시보드", 
+        page_icon="🚗", 
+        layout="wide"
+    )
     show_car_region_dashboard()
@@ -0,0 +1,80 @@
+"""
+클라우드 배포 프로필 (보고서_cloud.py 용).
+
+보고서_cloud.py 는 일별 합계와 데이터 유무, 지역/차종별 건수만 보여주므로
+전체 preprocessed_data.pkl(df_6 의 생년월일/주소, df_tesla_ev 원본 행, 지도 GeoJSON 등)을 받을 필요가 없습니다.
+전처리.write_outputs 가 같은 결과에서 집계와 작은 프레임만 골라 CLOUD_DATA_FILE 로 따로 저장합니다.
+  - df_1, df_2, df_5, df_3, df_4, df_pole_pipeline : 날짜별 합계 (날짜 + 합계 컬럼)
+  - region_counts     : 지역구분별 신청 건수 (df_6 대신)
+  - tesla_ev_summary  : 분류된 차종/신청유형별 건수 (df_tesla_ev 대신)
+  - update_time_str
+개인정보 컬럼(생년월일, 주소, 성별, 작성자, 관리번호, 노트 등)은 어떤 항목에도 들어가지 않습니다.
+Streamlit Cloud requirements 에는 pyarrow 가 없으므로 pickle 로 저장합니다.
+"""
+import os
+import pickle
+
+import pandas as pd
+
+CLOUD_DATA_FILE = "preprocessed_cloud.pkl"
+
+# 일별 합계 항목: 데이터셋 -> (날짜 컬럼, 합산할 컬럼 / None 이면 행 수, 결과 합계 컬럼명)
+# 결과 컬럼명은 보고서_cloud.get_safe_metrics 가 합산하는 컬럼과 같게 둡니다 (행 수는 '개수').
+CLOUD_DAILY_TOTALS = {
+    "df_1": ("날짜", "개수", "개수"),
+    "df_2": ("날짜", "배분", "배분"),
+    "df_5": ("날짜", None, "개수"),
+    "df_3": ("신청 요청일", "신청대수", "신청대수"),
+    "df_4": ("요청일자", "접수대수", "접수대수"),
+    "df_pole_pipeline": ("날짜", None, "개수"),
+}
+TESLA_SUMMARY_COLUMNS = ["분류된_차종", "분류된_신청유형"]
+
+
+def _daily_totals(df, date_col, value_col, total_col):
+    """날짜별 합계 프레임 (날짜 + 합계 컬럼). 날짜 컬럼이 없거나 비어 있으면 빈 프레임."""
+    if not isinstance(df, pd.DataFrame) or df.empty or date_col not in df.columns:
+        return pd.DataFrame(columns=[date_col, total_col])
+    if value_col is not None and value_col not in df.columns:
+        return pd.DataFrame(columns=[date_col, total_col])
+    frame = pd.DataFrame({
+        date_col: pd.to_datetime(df[date_col], errors="coerce").dt.normalize(),
+        total_col: 1 if value_col is None else pd.to_numeric(df[value_col], errors="coerce"),
+    }).dropna(subset=[date_col])
+    return frame.groupby(date_col, as_index=False)[total_col].sum()
+
+
+def _region_counts(df_6):
+    if not isinstance(df_6, pd.DataFrame) or df_6.empty or "지역구분" not in df_6.columns:
+        return pd.DataFrame(columns=["지역구분", "카운트"])
+    counts = df_6["지역구분"].dropna().astype(str).value_counts()
+    return counts.rename_axis("지역구분").reset_index(name="카운트")
+
+
+def _tesla_ev_summary(df_tesla_ev):
+    columns = [c for c in TESLA_SUMMARY_COLUMNS if isinstance(df_tesla_ev, pd.DataFrame) and c in df_tesla_ev.columns]
+    if not columns or df_tesla_ev.empty:
+        return pd.DataFrame(columns=TESLA_SUMMARY_COLUMNS + ["건수"])
+    return df_tesla_ev.groupby(columns, dropna=False).size().reset_index(name="건수")
+
+
+def build_cloud_data(data):
+    """전처리 결과(dict 또는 아티팩트 매핑)에서 클라우드 보고서에 필요한 항목만 만듭니다."""
+    cloud_data = {
+        name: _daily_totals(data.get(name), *spec)
+        for name, spec in CLOUD_DAILY_TOTALS.items()
+    }
+    cloud_data["region_counts"] = _region_counts(data.get("df_6"))
+    cloud_data["tesla_ev_summary"] = _tesla_ev_summary(data.get("df_tesla_ev"))
+    cloud_data["update_time_str"] = data.get("update_time_str")
+    return cloud_data
+
+
+def write_cloud_data(data, path=CLOUD_DATA_FILE):
+    """클라우드 프로필을 만들어 저장합니다 (임시 파일에 쓴 뒤 교체). 반환: 저장한 파일 크기(바이트)"""
+    cloud_data = build_cloud_data(data)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        pickle.dump(cloud_data, f)
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
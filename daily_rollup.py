@@ -0,0 +1,103 @@
+import calendar
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+# 일별 집계 항목: 항목명 -> (원본 프레임 키, 합산할 컬럼 / None 이면 행 수)
+ROLLUP_MEASURES = {
+    "메일": ("df_5", None),            # 파이프라인 메일 건수
+    "개수": ("df_1", "개수"),          # 지원 신청 건수
+    "배분": ("df_2", "배분"),          # 지급 배분건
+    "신청": ("df_2", "신청"),          # 지급신청 건수
+    "미신청건": ("df_fail_q3", None),  # 지원 미신청건 (3분기)
+    "지급_미신청건": ("df_2_fail_q3", "미신청건"),  # 지급 미신청건 (3분기)
+}
+CUMULATIVE_PREFIX = "누적_"
+DEFAULT_QUARTER = "3분기"  # 분기 컬럼이 없는 미신청건 시트는 3분기 데이터입니다.
+
+
+def _daily_counts(df, value_col, measure):
+    """원본 프레임을 (날짜, 분기)별 합계로 줄입니다. 날짜가 없는 행은 집계하지 않습니다."""
+    if df is None or df.empty or "날짜" not in df.columns:
+        return pd.DataFrame(columns=["날짜", "분기", measure])
+    frame = pd.DataFrame({
+        "날짜": pd.to_datetime(df["날짜"], errors="coerce").dt.normalize(),
+        "분기": df["분기"] if "분기" in df.columns else DEFAULT_QUARTER,
+        measure: 1 if value_col is None else pd.to_numeric(df[value_col], errors="coerce"),
+    })
+    frame = frame.dropna(subset=["날짜"])
+    return frame.groupby(["날짜", "분기"], as_index=False, dropna=False)[measure].sum()
+
+
+def build_daily_rollup(frames):
+    """
+    df_1, df_2, df_5, df_fail_q3, df_2_fail_q3 를 하루 단위 집계표로 만듭니다.
+    frames: {"df_1": ..., "df_2": ..., ...}
+    반환: 날짜/분기/각 항목 합계와 날짜순 누적합(누적_<항목>) 컬럼을 가진 DataFrame
+    """
+    rollup = pd.DataFrame(columns=["날짜", "분기"])
+    for measure, (frame_key, value_col) in ROLLUP_MEASURES.items():
+        daily = _daily_counts(frames.get(frame_key), value_col, measure)
+        rollup = rollup.merge(daily, on=["날짜", "분기"], how="outer")
+
+    rollup["날짜"] = pd.to_datetime(rollup["날짜"])
+    rollup = rollup.sort_values(["날짜", "분기"], kind="stable").reset_index(drop=True)
+    for measure in ROLLUP_MEASURES:
+        rollup[measure] = rollup[measure].astype(float).fillna(0)
+        rollup[CUMULATIVE_PREFIX + measure] = rollup[measure].cumsum()
+    return rollup
+
+
+class DailyRollup:
+    """
+    일별 집계표 조회 도우미.
+    누적합 배열과 날짜 배열의 이분 탐색(searchsorted)으로 특정일/기간/월 합계를
+    원본 행 수와 관계없이 O(log 일수)로 계산하고, 분기 합계는 만들 때 계산해 둔 값을 돌려줍니다.
+    """
+
+    def __init__(self, rollup):
+        self.rollup = rollup
+        self.dates = rollup["날짜"].to_numpy(dtype="datetime64[D]")
+        self._cumulative = {
+            measure: np.concatenate([[0.0], rollup[CUMULATIVE_PREFIX + measure].to_numpy(dtype=float)])
+            for measure in ROLLUP_MEASURES
+        }
+        # 분기 태그는 날짜 구간과 꼭 일치하지 않으므로(미신청건 시트는 항상 3분기) 태그별 합계를 한 번만 계산해 둡니다.
+        self._quarter_totals = rollup.groupby("분기")[list(ROLLUP_MEASURES)].sum().to_dict("index")
+
+    def total(self, measure, start=None, end=None):
+        """start~end(양 끝 포함) 기간의 합계. start/end 가 None 이면 처음/끝까지입니다."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, "D"), side="left"))
+        hi = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, "D"), side="right"))
+        if hi <= lo:
+            return 0
+        cumulative = self._cumulative[measure]
+        return int(cumulative[hi] - cumulative[lo])
+
+    def on(self, measure, day):
+        """특정일 합계"""
+        return self.total(measure, day, day)
+
+    def month_total(self, measure, year, month, until=None):
+        """해당 연/월 합계. until 이 주어지면 그 날짜까지만 합산합니다."""
+        start = date(year, month, 1)
+        end = date(year, month, calendar.monthrange(year, month)[1])
+        if until is not None:
+            end = min(end, until)
+        return self.total(measure, start, end)
+
+    def quarter_total(self, measure, quarter):
+        """분기 태그('1분기' 등) 기준 합계"""
+        return int(self._quarter_totals.get(quarter, {}).get(measure, 0))
+
+
+def rollup_from_data(data):
+    """
+    전처리 결과에서 DailyRollup 을 만듭니다.
+    daily_rollup 데이터셋이 없는 이전 아티팩트라면 원본 프레임으로 즉석에서 집계합니다.
+    """
+    rollup = data.get("daily_rollup")
+    if rollup is None:
+        rollup = build_daily_rollup({key: data.get(key) for key, _ in ROLLUP_MEASURES.values()})
+    return DailyRollup(rollup)
@@ -0,0 +1,67 @@
+"""
+전처리 결과 데이터 접근 계층.
+
+뷰어와 보조 스크립트는 아티팩트(artifacts/, preprocessed_data.pkl)를 직접 열지 않고 이 모듈의 함수로 데이터를 읽습니다.
+각 데이터셋은 프로세스당 한 번만 디스크에서 로드되고(artifact_store.load_artifacts 가 매니페스트가 바뀔 때까지
+같은 매핑을 재사용), 뷰어를 바꾸거나 화면을 다시 그려도 다시 읽지 않습니다.
+아티팩트가 없으면 get_artifacts()/get_frame() 등은 FileNotFoundError 를 발생시킵니다.
+"""
+import os
+
+import pandas as pd
+
+from artifact_store import LEGACY_PICKLE, load_artifacts
+
+
+def get_artifacts():
+    """전처리 결과 전체 매핑 (data["df_1"] 처럼 사용, 데이터셋은 처음 접근할 때 로드)"""
+    return load_artifacts()
+
+
+def get_frame(name):
+    """DataFrame 데이터셋. 없으면 빈 DataFrame을 반환합니다."""
+    value = get_artifacts().get(name)
+    if value is None:
+        return pd.DataFrame()
+    if not isinstance(value, pd.DataFrame):
+        raise TypeError(f"'{name}' 데이터셋은 DataFrame이 아닙니다: {type(value).__name__}")
+    return value
+
+
+def get_value(name, default=None):
+    """DataFrame 이 아닌 데이터셋(문자열, dict, GeoJSON 등)"""
+    return get_artifacts().get(name, default)
+
+
+def get_quarterly_counts():
+    """분기별 지역 카운트 {'전체': {...}, '1Q': {...}, ...}"""
+    return get_value("quarterly_region_counts", {}) or {}
+
+
+def get_update_time():
+    """전처리 시각 문자열 (update_time_str)"""
+    return get_value("update_time_str")
+
+
+def get_preprocessed_map():
+    """전처리된 지도 GeoJSON (없으면 None)"""
+    return get_value("preprocessed_map_geojson")
+
+
+def dataset_version(*names):
+    """
+    데이터셋 버전 토큰. st.cache_data/st.cache_resource 함수의 인자로 넘기면
+    해당 데이터셋 내용이 바뀐 빌드가 들어온 순간에만 캐시가 무효화됩니다 (ttl 불필요).
+    매니페스트 mtime 이 그대로면 load_artifacts 가 stat 한 번으로 기존 매핑을 돌려주므로 파일을 읽지 않습니다.
+    """
+    try:
+        data = get_artifacts()
+    except FileNotFoundError:
+        return None  # 아직 빌드된 데이터가 없음
+    manifest = getattr(data, "manifest", None)
+    if manifest is None:
+        # 아티팩트 없이 preprocessed_data.pkl 을 쓰는 경우: 파일 단위 토큰
+        return ("pickle", os.stat(LEGACY_PICKLE).st_mtime_ns)
+    datasets = manifest["datasets"]
+    # 해시가 없는 이전 매니페스트나 없는 데이터셋은 빌드 시각으로 대신합니다.
+    return tuple(datasets.get(name, {}).get("sha256") or manifest.get("build_time") for name in names)
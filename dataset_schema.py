@@ -0,0 +1,162 @@
+"""
+배포 데이터셋 스키마 선언.
+
+엑셀 시트를 그대로 읽은 프레임은 보고서가 쓰지 않는 컬럼까지 모두 object 로 들고 있습니다.
+DATASET_SCHEMAS 에 데이터셋별로 실제 사용하는 컬럼과 저장 형식을 선언해 두면,
+전처리.write_outputs 가 저장 직전에 나머지 컬럼을 버리고 dtype 을 줄입니다.
+선언하지 않은 데이터셋은 그대로 저장합니다.
+
+컬럼 형식:
+  "date"     : datetime64 (변환할 수 없는 값은 NaT)
+  "count"    : 건수/대수. 결측이 없으면 int32, 있으면 float32
+               (nullable Int 는 결측이 섞인 비교 결과로 행을 거를 때 오류가 나므로 쓰지 않습니다)
+  "number"   : float32
+  "category" : 반복되는 문자열 (비교/isin/map 에만 쓰는 컬럼. 필터 후 value_counts 하는 컬럼은
+               없는 값도 0건으로 나오므로 "text" 로 둡니다)
+  "text"     : 변환 없이 유지
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+from artifact_store import _arrow_safe
+
+DATASET_SCHEMAS = {
+    # 지원 시트 (보고서는 daily_rollup 으로 집계, 중복_신청건_확인/테스트_RN_추출 은 관리번호/신청일자 사용)
+    "df_1": {
+        "columns": {"날짜": "date", "개수": "count", "분기": "category",
+                    "제조수입사\n관리번호": "text", "신청일자": "date"},
+    },
+    # 지급 시트
+    "df_2": {
+        "columns": {"날짜": "date", "배분": "count", "신청": "count", "분기": "category"},
+    },
+    # 파이프라인 시트 (메일 건수, 분기별 RN)
+    "df_5": {
+        "columns": {"날짜": "date", "RN": "text", "분기": "category"},
+    },
+    # 지원 미신청건 (Greet Note 컬럼명은 보고서/캘린더가 '노트' 포함 여부로 찾습니다)
+    "df_fail_q3": {
+        "columns": {"날짜": "date"},
+        "note_columns": "text",
+    },
+    "df_2_fail_q3": {
+        "columns": {"날짜": "date", "미신청건": "count"},
+    },
+    # 법인팀 지원 (보고서가 두 번째 컬럼(B열)을 위치로 참조하므로 앞의 두 컬럼은 그대로 둡니다)
+    "df_3": {
+        "columns": {"신청 요청일": "date", "접수 완료": "category", "신청대수": "count"},
+        "note_columns": "text",
+        "keep_positions": (0, 1),
+    },
+    # 법인팀 지급
+    "df_4": {
+        "columns": {"요청일자": "date", "지급신청 완료 여부": "category", "신청번호": "text", "접수대수": "count"},
+    },
+    "df_sales": {
+        "columns": {"월": "count", "대수": "count"},
+    },
+    # 지도 인구통계 (나이/연령대는 뷰어가 생년월일_날짜로 다시 계산)
+    "df_6": {
+        "columns": {"지역구분": "category", "신청일자": "date", "주소\n(등록주소지)": "category", "성별": "category",
+                    "생년월일_날짜": "date", "나이": "number", "연령대": "category"},
+    },
+    # 테슬라 EV 대시보드 (필터 후 value_counts 하는 컬럼은 text)
+    "df_tesla_ev": {
+        "columns": {"신청일자": "date", "작성자": "text", "분류된_차종": "text", "분류된_신청유형": "text",
+                    "생년월일_날짜": "date", "나이": "number", "연령대": "text"},
+    },
+}
+
+
+def _is_note_column(name):
+    key = str(name).lower().replace(" ", "")
+    return "greetnote" in key or "노트" in key
+
+
+def _convert(series, kind):
+    if kind == "date":
+        return pd.to_datetime(series, errors="coerce")
+    if kind == "count":
+        values = pd.to_numeric(series, errors="coerce")
+        if values.notna().all() and (values % 1 == 0).all() and (values.abs() < np.iinfo(np.int32).max).all():
+            return values.astype(np.int32)
+        return values.astype(np.float32)
+    if kind == "number":
+        return pd.to_numeric(series, errors="coerce").astype(np.float32)
+    if kind == "category":
+        # 숫자/문자열이 섞인 값은 문자열로 맞춘 뒤 범주형으로 (결측치는 유지)
+        return series.where(series.isna(), series.astype(str)).astype("category")
+    if kind == "text":
+        return series
+    raise ValueError(f"알 수 없는 컬럼 형식: {kind}")
+
+
+def apply_schema(name, df):
+    """선언된 스키마로 컬럼을 고르고 dtype 을 줄인 새 프레임을 반환합니다. 선언이 없으면 그대로 반환합니다."""
+    schema = DATASET_SCHEMAS.get(name)
+    if schema is None or df is None or df.empty:
+        return df
+
+    kinds = {}
+    for position, column in enumerate(df.columns):
+        if column in schema["columns"]:
+            kinds[column] = schema["columns"][column]
+        elif "note_columns" in schema and _is_note_column(column):
+            kinds[column] = schema["note_columns"]
+        elif position in schema.get("keep_positions", ()):
+            kinds[column] = "text"
+
+    # 원래 컬럼 순서를 유지합니다.
+    return pd.DataFrame({column: _convert(df[column], kind) for column, kind in kinds.items()}, index=df.index)
+
+
+def _parquet_size(df):
+    buffer = io.BytesIO()
+    _arrow_safe(df).to_parquet(buffer, index=True)
+    return buffer.tell()
+
+
+def apply_dataset_schemas(data):
+    """
+    전처리 결과(dict)의 선언된 DataFrame 에 스키마를 적용합니다.
+    반환: (적용된 dict, 데이터셋별 전/후 컬럼 수·메모리·Parquet 크기 보고 행 목록)
+    """
+    optimized = dict(data)
+    report = []
+    for name in DATASET_SCHEMAS:
+        before = data.get(name)
+        if not isinstance(before, pd.DataFrame) or before.empty:
+            continue
+        after = apply_schema(name, before)
+        optimized[name] = after
+        report.append({
+            "name": name,
+            "rows": len(after),
+            "columns": (before.shape[1], after.shape[1]),
+            "memory": (int(before.memory_usage(deep=True).sum()), int(after.memory_usage(deep=True).sum())),
+            "file": (_parquet_size(before), _parquet_size(after)),
+        })
+    return optimized, report
+
+
+def print_schema_report(report):
+    """스키마 적용 전/후 메모리와 아티팩트 크기 표를 출력합니다."""
+    if not report:
+        return
+    print()
+    print(f"{'데이터셋':<16}{'행 수':>8}{'컬럼(전→후)':>14}{'메모리 KB(전→후)':>22}{'파일 KB(전→후)':>20}")
+    print("-" * 80)
+    totals = [0, 0, 0, 0]
+    for r in report:
+        (mem_before, mem_after), (file_before, file_after) = r["memory"], r["file"]
+        totals = [totals[0] + mem_before, totals[1] + mem_after, totals[2] + file_before, totals[3] + file_after]
+        columns = f"{r['columns'][0]}→{r['columns'][1]}"
+        memory = f"{mem_before / 1024:,.0f}→{mem_after / 1024:,.0f}"
+        size = f"{file_before / 1024:,.0f}→{file_after / 1024:,.0f}"
+        print(f"{r['name']:<16}{r['rows']:>8,}{columns:>14}{memory:>22}{size:>20}")
+    print("-" * 80)
+    memory = f"{totals[0] / 1024:,.0f}→{totals[1] / 1024:,.0f}"
+    size = f"{totals[2] / 1024:,.0f}→{totals[3] / 1024:,.0f}"
+    print(f"{'합계':<16}{'':>8}{'':>14}{memory:>22}{size:>20}")
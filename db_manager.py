@@ -1,6 +1,449 @@
 import sqlite3
 import os
-from datetime import datetime
+import pathlib
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+
+from query_log import QUERY_LOG, InstrumentedConnection
+
+# 날짜 인덱스: 테이블 -> 날짜 UNIQUE 여부
+# 파이프라인/지원신청은 날짜별 한 행(편집기가 날짜 단위로 덮어씀), 특이사항은 날짜별 여러 건입니다.
+# 테슬라_지원신청/pipeline 은 다른 도구가 만든 테이블이라 존재할 때만 일반 인덱스를 만듭니다.
+DATE_INDEXES = {
+    "파이프라인": True,
+    "지원신청": True,
+    "특이사항": False,
+    "테슬라_지원신청": False,
+    "pipeline": False,
+}
+
+
+def date_range_params(start_date, end_date):
+    """
+    날짜 범위를 인덱스를 타는 반열린 구간 (날짜 >= 시작 AND 날짜 < 종료 다음날) 파라미터로 바꿉니다.
+    '2025-08-01' 과 '2025-08-01 00:00:00' 형식이 섞여 있어도 종료일 당일 행을 모두 포함합니다.
+    """
+    return _to_date(start_date).isoformat(), (_to_date(end_date) + timedelta(days=1)).isoformat()
+
+
+def _to_date(value):
+    """date/datetime(Timestamp 포함)/'YYYY-MM-DD...' 문자열을 date 로 변환"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+# 연결 설정. WAL 모드에서는 쓰기(편집기)와 읽기(전처리, 대시보드)가 서로 막지 않고,
+# 쓰기끼리 겹치면 "database is locked" 대신 BUSY_TIMEOUT_MS 동안 기다립니다 (SQLite busy_timeout).
+# 문장별 잠금 대기 시간은 query_log 의 커서가 잽니다.
+BUSY_TIMEOUT_MS = 5000
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",   # WAL 에서는 커밋마다 fsync 하지 않아도 손상되지 않습니다 (체크포인트 때 동기화).
+    "PRAGMA cache_size = -16000",    # 페이지 캐시 약 16MB
+    "PRAGMA mmap_size = 268435456",  # 256MB 까지 메모리 매핑으로 읽기
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def open_connection(db_path='data.db', readonly=False):
+    """
+    설정을 적용한 sqlite3 연결을 엽니다. 문장별 소요시간/행 수/잠금 대기는 query_log.QUERY_LOG 에 기록됩니다.
+    쓰기 연결은 데이터베이스를 WAL 모드로 바꿉니다 (파일에 저장되는 설정이라 한 번 바꾸면 유지).
+    readonly=True 이면 읽기 전용(mode=ro) 연결을 열며, 파일이 없으면 만들지 않고 sqlite3.OperationalError 를 발생시킵니다.
+    """
+    options = {"timeout": BUSY_TIMEOUT_MS / 1000, "check_same_thread": False, "factory": InstrumentedConnection}
+    if readonly:
+        uri = pathlib.Path(os.path.abspath(db_path)).as_uri() + "?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, **options)
+    else:
+        conn = sqlite3.connect(db_path, **options)
+    conn.label = f"{os.path.basename(db_path)}{' (읽기)' if readonly else ''}"
+    conn.busy_timeout_ms = BUSY_TIMEOUT_MS
+    journal_mode = conn.execute("PRAGMA journal_mode" if readonly else "PRAGMA journal_mode = WAL").fetchone()[0]
+    conn.wal = journal_mode.lower() == "wal"
+    for pragma in CONNECTION_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+# --- 시점 사본 (전처리용) ---
+SNAPSHOT_PAGES_PER_STEP = 256  # 백업 한 단계에 복사할 페이지 수 (단계 사이에는 원본 잠금을 놓습니다)
+
+
+def create_snapshot(db_path='data.db', snapshot_path='data_snapshot.db', pages=SNAPSHOT_PAGES_PER_STEP):
+    """
+    data.db 의 한 시점 사본을 만듭니다 (sqlite3 백업 API 로 pages 씩 나눠 복사).
+    원본은 읽기 전용 연결로 읽고 WAL 에서는 읽기가 쓰기를 막지 않으므로 편집기 저장을 기다리게 하지 않습니다.
+    복사 중 다른 연결이 원본을 바꾸면 SQLite 가 처음부터 다시 복사하므로, 사본은 여러 테이블이 같은 시점인 상태입니다.
+    사본은 임시 파일에 만든 뒤 교체하며, 읽기 전용으로 열 수 있도록 롤백 저널(DELETE) 모드로 바꿉니다.
+    반환: {"source", "path", "taken_at" (복사를 마친 시각), "pages", "restarts"}
+    """
+    progress = {"remaining": None, "pages": 0, "restarts": 0}
+
+    def on_progress(status, remaining, total):
+        if progress["remaining"] is not None and remaining > progress["remaining"]:
+            progress["restarts"] += 1  # 원본이 바뀌어 처음부터 다시 복사
+        progress["remaining"], progress["pages"] = remaining, total
+
+    tmp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    source = open_connection(db_path, readonly=True)
+    try:
+        target = sqlite3.connect(tmp_path)
+        try:
+            source.backup(target, pages=pages, progress=on_progress)
+            target.execute("PRAGMA journal_mode = DELETE")
+        finally:
+            target.close()
+        taken_at = datetime.now()
+        os.replace(tmp_path, snapshot_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    finally:
+        source.close()
+    return {
+        "source": os.path.abspath(db_path),
+        "path": snapshot_path,
+        "taken_at": taken_at.isoformat(timespec="seconds"),
+        "pages": progress["pages"],
+        "restarts": progress["restarts"],
+    }
+
+
+class ConnectionPool:
+    """
+    스레드별 연결 풀. 스레드마다 쓰기 연결과 읽기 전용 연결을 하나씩 열어 재사용합니다
+    (sqlite3 연결을 스레드 간에 공유하지 않으므로 작업 스레드끼리 트랜잭션이 섞이지 않습니다).
+    """
+
+    def __init__(self, db_path='data.db'):
+        self.db_path = db_path
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def get(self, readonly=False):
+        """현재 스레드의 연결 (없으면 엽니다)"""
+        key = "reader" if readonly else "writer"
+        conn = getattr(self._local, key, None)
+        if conn is None:
+            conn = open_connection(self.db_path, readonly=readonly)
+            setattr(self._local, key, conn)
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def close_all(self):
+        """모든 스레드의 연결을 닫습니다."""
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+            self._local = threading.local()
+
+
+# --- DataFrame 조회 (컬럼 선택, 날짜 범위, 서버 측 집계) ---
+# 집계 단위: 이름 -> (그룹 키 SQL 식, 결과 컬럼명)
+AGGREGATE_KEYS = {
+    "day": ("substr(날짜, 1, 10)", "날짜"),                                   # 'YYYY-MM-DD' → datetime
+    "month": ("substr(날짜, 1, 7)", "월"),                                    # 'YYYY-MM'
+    "quarter": ("((CAST(substr(날짜, 6, 2) AS INTEGER) + 2) / 3) || '분기'", "분기"),  # '3분기'
+}
+
+
+def _quote(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _date_filter(start_date, end_date):
+    """(WHERE 절, 파라미터) - 날짜 인덱스를 타는 범위 조건"""
+    if start_date is None and end_date is None:
+        return "", ()
+    if start_date is None or end_date is None:
+        raise ValueError("start_date 와 end_date 는 함께 지정해야 합니다.")
+    return " WHERE 날짜 >= ? AND 날짜 < ?", date_range_params(start_date, end_date)
+
+
+def build_select_query(table, columns=None, start_date=None, end_date=None):
+    """컬럼 선택/날짜 범위 조회 SQL 과 파라미터 (날짜순 정렬)"""
+    column_sql = ", ".join(_quote(c) for c in columns) if columns else "*"
+    where, params = _date_filter(start_date, end_date)
+    return f"SELECT {column_sql} FROM {_quote(table)}{where} ORDER BY 날짜", params
+
+
+def build_aggregate_query(table, measures=(), by="day", count_as=None, start_date=None, end_date=None):
+    """
+    집계 조회 SQL 과 파라미터. measures 컬럼은 SUM, count_as 를 주면 행 수(COUNT(*))를 그 이름으로 함께 구합니다.
+    by: "day" | "month" | "quarter" (AGGREGATE_KEYS)
+    """
+    if by not in AGGREGATE_KEYS:
+        raise ValueError(f"알 수 없는 집계 단위: {by} (사용 가능: {', '.join(AGGREGATE_KEYS)})")
+    key_sql, key_name = AGGREGATE_KEYS[by]
+    selects = [f"{key_sql} AS {_quote(key_name)}"]
+    selects += [f"SUM({_quote(m)}) AS {_quote(m)}" for m in measures]
+    if count_as:
+        selects.append(f"COUNT(*) AS {_quote(count_as)}")
+    where, params = _date_filter(start_date, end_date)
+    sql = f"SELECT {', '.join(selects)} FROM {_quote(table)}{where} GROUP BY 1 ORDER BY 1"
+    return sql, params
+
+
+def parse_dates(df):
+    """날짜 컬럼을 datetime 으로 변환합니다 (변환할 수 없는 값은 NaT)."""
+    if "날짜" in df.columns:
+        import pandas as pd
+        df["날짜"] = pd.to_datetime(df["날짜"], errors="coerce")
+    return df
+
+
+def read_frame(conn, table, columns=None, start_date=None, end_date=None, chunksize=None):
+    """
+    테이블을 DataFrame 으로 읽습니다. 날짜 컬럼은 datetime 으로 변환합니다.
+    columns: 읽을 컬럼 목록 (None 이면 전체), start_date/end_date: 날짜 범위 (양 끝 포함)
+    chunksize 를 주면 DataFrame 을 chunksize 행씩 돌려주는 반복자를 반환합니다.
+    """
+    import pandas as pd  # 편집기(main.py)는 DataFrame 조회를 쓰지 않으므로 필요할 때 임포트합니다.
+    sql, params = build_select_query(table, columns, start_date, end_date)
+    if chunksize:
+        return (parse_dates(chunk) for chunk in pd.read_sql_query(sql, conn, params=params, chunksize=chunksize))
+    return parse_dates(pd.read_sql_query(sql, conn, params=params))
+
+
+def read_aggregate(conn, table, measures=(), by="day", count_as=None, start_date=None, end_date=None):
+    """
+    SQLite 에서 집계한 결과를 DataFrame 으로 읽습니다 (테이블 전체를 가져오지 않음).
+    by="day" 이면 날짜(datetime), "month" 이면 월('YYYY-MM'), "quarter" 이면 분기('3분기') 컬럼과 합계 컬럼.
+    """
+    import pandas as pd
+    sql, params = build_aggregate_query(table, measures, by, count_as, start_date, end_date)
+    return parse_dates(pd.read_sql_query(sql, conn, params=params))
+
+
+# --- 요약 테이블 (트리거로 유지) ---
+# 기본 테이블 -> 합계 컬럼. 각 테이블마다
+#   <테이블>_월별 (월 'YYYY-MM', 컬럼별 합계, 일수)
+#   <테이블>_누적 (날짜 'YYYY-MM-DD', 누적_<컬럼>: 그날까지의 누적 합계)
+# 를 만들고, 기본 테이블 INSERT/UPDATE/DELETE 트리거가 바뀐 날짜의 월 합계와 그 날짜 이후 누적 행만 다시 계산합니다.
+SUMMARY_MEASURES = {
+    "파이프라인": ["파이프라인"],
+    "지원신청": ["지원신청", "PAK_내부지원", "접수후취소", "미신청건", "보완"],
+    "테슬라_지급": ["배분", "신청", "지급_잔여"],
+}
+CUMULATIVE_PREFIX = "누적_"
+
+
+def monthly_table(table):
+    return f"{table}_월별"
+
+
+def cumulative_table(table):
+    return f"{table}_누적"
+
+
+def table_exists(conn, name):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone() is not None
+
+
+def _summary_refresh_sql(table, date_expr):
+    """
+    date_expr(NEW.날짜/OLD.날짜) 가 속한 월 합계와 그 날짜 이후 누적 행을 다시 계산하는 SQL.
+    누적 행은 그 날짜 이후 기본 테이블 행의 일별 합계에 전날까지의 누적 값(누적 테이블의 직전 행)을 더해 만듭니다.
+    값이 모두 NULL 인 월/일의 합계는 0 입니다.
+    """
+    measures = SUMMARY_MEASURES[table]
+    month = f"substr({date_expr}, 1, 7)"
+    day = f"substr({date_expr}, 1, 10)"
+    sums = ", ".join(f"COALESCE(SUM({m}), 0)" for m in measures)
+    daily = ", ".join(f"COALESCE(SUM({m}), 0) AS {m}" for m in measures)
+    running = ", ".join(
+        f"COALESCE((SELECT {CUMULATIVE_PREFIX}{m} FROM {cumulative_table(table)} WHERE 날짜 < {day} "
+        f"ORDER BY 날짜 DESC LIMIT 1), 0) + SUM({m}) OVER (ORDER BY 일자)"
+        for m in measures
+    )
+    cumulative_columns = ", ".join(CUMULATIVE_PREFIX + m for m in measures)
+    return f"""
+        DELETE FROM {monthly_table(table)} WHERE 월 = {month};
+        INSERT INTO {monthly_table(table)} (월, {", ".join(measures)}, 일수)
+            SELECT {month}, {sums}, COUNT(*) FROM {table}
+            WHERE 날짜 >= {month} || '-01' AND 날짜 < date({month} || '-01', '+1 month')
+            GROUP BY 1;
+        DELETE FROM {cumulative_table(table)} WHERE 날짜 >= {day};
+        INSERT INTO {cumulative_table(table)} (날짜, {cumulative_columns})
+            SELECT 일자, {running} FROM (
+                SELECT substr(날짜, 1, 10) AS 일자, {daily} FROM {table} WHERE 날짜 >= {day} GROUP BY 1
+            );"""
+
+
+def _summary_ddl(table):
+    """요약 테이블 생성 SQL 목록"""
+    measures = SUMMARY_MEASURES[table]
+    return [
+        f"""CREATE TABLE IF NOT EXISTS {monthly_table(table)} (
+            월 TEXT PRIMARY KEY, {", ".join(f"{m} INTEGER NOT NULL DEFAULT 0" for m in measures)}, 일수 INTEGER NOT NULL DEFAULT 0
+        )""",
+        f"""CREATE TABLE IF NOT EXISTS {cumulative_table(table)} (
+            날짜 TEXT PRIMARY KEY, {", ".join(f"{CUMULATIVE_PREFIX}{m} INTEGER NOT NULL DEFAULT 0" for m in measures)}
+        )""",
+    ]
+
+
+def _summary_triggers(table):
+    """요약 트리거 [(이름, 생성 SQL)]. SQL 은 sqlite_master 에 저장되는 형태와 같아 설치된 정의와 비교할 수 있습니다."""
+    refresh = {"insert": _summary_refresh_sql(table, "NEW.날짜"), "delete": _summary_refresh_sql(table, "OLD.날짜")}
+    refresh["update"] = refresh["delete"] + refresh["insert"]
+    return [
+        (f"trg_{table}_요약_{kind}",
+         f"CREATE TRIGGER trg_{table}_요약_{kind} AFTER {kind.upper()} ON {table} BEGIN{refresh[kind]}\n        END")
+        for kind in ("insert", "delete", "update")
+    ]
+
+
+# --- 변경 로그 (트리거로 기록, 하위 소비자의 증분 조회용) ---
+# 추적 테이블의 INSERT/UPDATE/DELETE 마다 변경_로그 에 (버전, 테이블, 행_id=rowid, 작업) 한 행을 남깁니다.
+# 버전은 단조 증가하므로 소비자는 마지막으로 받은 버전 이후의 변경만 pull_changes 로 받습니다.
+# 작업: 'I' 추가, 'U' 수정, 'D' 삭제, 'R' 다시 읽기 필요 (트리거를 새로 설치함 - 그 전 변경은 기록되지 않음)
+# 로그는 테이블별로 정리(prune_change_log)하며, 변경_로그_정리 에 테이블별로 지운 마지막 버전을 남깁니다.
+CHANGE_LOG_TABLE = "변경_로그"
+CHANGE_LOG_PRUNED_TABLE = "변경_로그_정리"
+CHANGE_LOG_TABLES = ("파이프라인", "지원신청", "특이사항", "테슬라_지급", "테슬라_지원신청", "pipeline")
+ROWID_COLUMN = "_rowid"
+
+
+def _change_log_ddl(table):
+    """변경 로그 트리거 생성 SQL 목록 (rowid 를 바꾸는 UPDATE 는 이전 rowid 를 삭제로 기록)"""
+    log = f"INSERT INTO {CHANGE_LOG_TABLE} (테이블, 행_id, 작업)"
+    name = table.replace("'", "''")
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_변경_insert AFTER INSERT ON {_quote(table)} BEGIN "
+        f"{log} VALUES ('{name}', NEW.rowid, 'I'); END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_변경_delete AFTER DELETE ON {_quote(table)} BEGIN "
+        f"{log} VALUES ('{name}', OLD.rowid, 'D'); END",
+        f"CREATE TRIGGER IF NOT EXISTS trg_{table}_변경_update AFTER UPDATE ON {_quote(table)} BEGIN "
+        f"{log} VALUES ('{name}', NEW.rowid, 'U'); "
+        f"{log} SELECT '{name}', OLD.rowid, 'D' WHERE OLD.rowid <> NEW.rowid; END",
+    ]
+
+
+def _is_tracked(conn, table):
+    """테이블에 변경 로그 트리거가 설치되어 있는지 (다른 도구가 테이블을 다시 만들면 트리거도 사라집니다)"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = ?", (f"trg_{table}_변경_insert",)
+    ).fetchone() is not None
+
+
+@contextmanager
+def read_snapshot(conn):
+    """
+    블록 안의 조회를 한 읽기 트랜잭션(같은 시점의 스냅샷)으로 묶습니다.
+    WAL 에서는 그 사이 커밋된 쓰기가 보이지 않으므로 버전과 행을 함께 읽을 때 사용합니다.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.execute("COMMIT")
+
+
+def change_log_version(conn, table=None):
+    """
+    현재 변경 로그 버전 (table 을 주면 그 테이블의 마지막 변경 버전).
+    테이블 버전은 로그를 정리해도 줄지 않습니다 (남은 로그와 정리한 마지막 버전 중 큰 값).
+    변경 로그가 없거나 table 이 추적되지 않으면 None
+    """
+    if not table_exists(conn, CHANGE_LOG_TABLE) or (table is not None and not _is_tracked(conn, table)):
+        return None
+    if table is not None:
+        logged = conn.execute(f"SELECT MAX(버전) FROM {CHANGE_LOG_TABLE} WHERE 테이블 = ?", (table,)).fetchone()[0]
+        pruned = conn.execute(
+            f"SELECT 버전 FROM {CHANGE_LOG_PRUNED_TABLE} WHERE 테이블 = ?", (table,)
+        ).fetchone() if table_exists(conn, CHANGE_LOG_PRUNED_TABLE) else None
+        return max(logged or 0, pruned[0] if pruned else 0)
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (CHANGE_LOG_TABLE,)).fetchone()
+    return (row[0] if row else None) or 0
+
+
+def pull_changes(conn, since_version, tables=None):
+    """
+    since_version 이후에 추가/수정/삭제된 행을 반환합니다. 반환 dict:
+      version : 현재 버전 (다음 호출의 since_version)
+      reload  : 변경분으로 따라갈 수 없어 전체를 다시 읽어야 하는 테이블
+                (트리거 없음, 트리거 재설치 'R', since_version 이후까지 그 테이블 로그가 정리됨)
+      changes : {테이블: {"upserted": 현재 행 DataFrame (인덱스 _rowid), "deleted": [rowid, ...]}}
+    한 테이블의 행이 여러 번 바뀌어도 현재 값 한 번만 돌려줍니다.
+    """
+    import pandas as pd
+    tables = list(tables or CHANGE_LOG_TABLES)
+    result = {"version": None, "reload": [], "changes": {}}
+    with read_snapshot(conn):
+        version = change_log_version(conn)
+        if version is None:
+            result["reload"] = tables
+            return result
+        result["version"] = version
+        pruned = dict(conn.execute(f"SELECT 테이블, 버전 FROM {CHANGE_LOG_PRUNED_TABLE}").fetchall()) \
+            if table_exists(conn, CHANGE_LOG_PRUNED_TABLE) else {}
+        for table in tables:
+            # 테이블 로그가 since_version 이후까지 정리되었으면 변경분을 알 수 없습니다.
+            if since_version is None or since_version < pruned.get(table, 0) or not _is_tracked(conn, table):
+                result["reload"].append(table)
+                continue
+            since = (table, since_version)
+            if conn.execute(f"SELECT 1 FROM {CHANGE_LOG_TABLE} WHERE 테이블 = ? AND 버전 > ? AND 작업 = 'R'", since).fetchone():
+                result["reload"].append(table)
+                continue
+            changed = f"SELECT 행_id FROM {CHANGE_LOG_TABLE} WHERE 테이블 = ? AND 버전 > ?"
+            upserted = pd.read_sql_query(
+                f"SELECT rowid AS {ROWID_COLUMN}, * FROM {_quote(table)} WHERE rowid IN ({changed}) ORDER BY rowid",
+                conn, params=since, index_col=ROWID_COLUMN,
+            )
+            deleted = [row[0] for row in conn.execute(
+                f"SELECT DISTINCT 행_id FROM {CHANGE_LOG_TABLE} WHERE 테이블 = ? AND 버전 > ? AND 작업 = 'D' "
+                f"AND NOT EXISTS (SELECT 1 FROM {_quote(table)} WHERE rowid = 행_id)", since,
+            )]
+            result["changes"][table] = {"upserted": upserted, "deleted": deleted}
+    return result
+
+
+def prune_change_log(conn, up_to_version, tables=None):
+    """
+    tables(기본: CHANGE_LOG_TABLES) 의 변경 로그에서 up_to_version 이하 행을 지우고 지운 행 수를 반환합니다.
+    up_to_version 은 테이블 이름 -> 버전 dict 로 테이블마다 줄 수도 있습니다. 변경 로그가 없으면 0
+    변경_로그_정리 에는 지운 행 중 가장 큰 버전(그 테이블의 실제 변경 버전)을 남기므로 change_log_version 은 그대로이고,
+    그 버전보다 오래된 사본으로 조회하는 소비자는 pull_changes 에서 그 테이블을 전체 다시 읽습니다.
+    """
+    if not table_exists(conn, CHANGE_LOG_TABLE):
+        return 0
+    if isinstance(up_to_version, dict):
+        versions = up_to_version
+    else:
+        versions = {table: up_to_version for table in tables or CHANGE_LOG_TABLES}
+    removed = 0
+    with conn:
+        conn.execute("BEGIN")
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {CHANGE_LOG_PRUNED_TABLE} (테이블 TEXT PRIMARY KEY, 버전 INTEGER NOT NULL)")
+        for table, version in versions.items():
+            version = conn.execute(
+                f"SELECT MAX(버전) FROM {CHANGE_LOG_TABLE} WHERE 테이블 = ? AND 버전 <= ?", (table, version)
+            ).fetchone()[0]
+            if version is None:
+                continue
+            removed += conn.execute(
+                f"DELETE FROM {CHANGE_LOG_TABLE} WHERE 테이블 = ? AND 버전 <= ?", (table, version)
+            ).rowcount
+            conn.execute(
+                f"INSERT INTO {CHANGE_LOG_PRUNED_TABLE} (테이블, 버전) VALUES (?, ?) "
+                f"ON CONFLICT(테이블) DO UPDATE SET 버전 = MAX(버전, excluded.버전)",
+                (table, version),
+            )
+    return removed
 
 
 class DatabaseManager:
@@ -9,14 +452,26 @@ class DatabaseManager:
     def __init__(self, db_path='data.db'):
         """데이터베이스 연결 초기화"""
         self.db_path = db_path
-        self.connection = None
+        self.pool = ConnectionPool(db_path)
         self.connect()
         self.update_schema()
     
+    @property
+    def connection(self):
+        """현재 스레드의 쓰기 연결 (WAL, 스레드마다 따로 엽니다). 열 수 없으면 None"""
+        try:
+            return self.pool.get()
+        except sqlite3.Error:
+            return None
+
+    def reader(self):
+        """현재 스레드의 읽기 전용 연결 (조회용, 쓰기 트랜잭션 중에도 막히지 않음)"""
+        return self.pool.get(readonly=True)
+
     def connect(self):
         """데이터베이스에 연결"""
         try:
-            self.connection = sqlite3.connect(self.db_path)
+            self.pool.get()
             print(f"데이터베이스 '{self.db_path}'에 연결되었습니다.")
         except sqlite3.Error as e:
             print(f"데이터베이스 연결 오류: {e}")
@@ -70,6 +525,196 @@ class DatabaseManager:
         except sqlite3.Error as e:
             print(f"스키마 업데이트/마이그레이션 오류: {e}")
             self.connection.rollback()
+
+        self.create_date_indexes()
+        self.create_summary_tables()
+        self.create_change_log()
+
+    def _summary_needs_rebuild(self, table):
+        """요약 테이블이 없거나, 기본 테이블에 행이 있는데 월 합계가 비어 있으면 (채우기 실패) True"""
+        conn = self.connection
+        if not (table_exists(conn, monthly_table(table)) and table_exists(conn, cumulative_table(table))):
+            return True
+        has_rows = conn.execute(f"SELECT EXISTS (SELECT 1 FROM {table})").fetchone()[0]
+        has_summary = conn.execute(f"SELECT EXISTS (SELECT 1 FROM {monthly_table(table)})").fetchone()[0]
+        return bool(has_rows and not has_summary)
+
+    def _install_summary_triggers(self, table):
+        """요약 트리거를 설치합니다. 설치된 정의가 현재 정의와 다르면 바꿉니다 (호출하는 쪽 트랜잭션 안에서)."""
+        for name, sql in _summary_triggers(table):
+            row = self.connection.execute(
+                "SELECT sql FROM sqlite_master WHERE type = 'trigger' AND name = ?", (name,)
+            ).fetchone()
+            if row and row[0] == sql:
+                continue
+            self.connection.execute(f"DROP TRIGGER IF EXISTS {name}")
+            self.connection.execute(sql)
+
+    def create_summary_tables(self):
+        """
+        요약 테이블/트리거를 만듭니다. 요약 테이블이 없거나 비어 있으면 기본 테이블로 다시 채우고,
+        채우지 못한 테이블에는 트리거를 설치하지 않습니다 (빈 요약 위에 변경분만 쌓이지 않도록).
+        """
+        ready, needs_rebuild = [], []
+        for table in SUMMARY_MEASURES:
+            try:
+                (needs_rebuild if self._summary_needs_rebuild(table) else ready).append(table)
+            except sqlite3.Error as e:
+                print(f"'{table}' 요약 테이블 확인 오류: {e}")
+        if needs_rebuild:
+            ready += self.rebuild_summaries(needs_rebuild)
+        for table in ready:
+            try:
+                with self.connection:
+                    self.connection.execute("BEGIN")
+                    for ddl in _summary_ddl(table):
+                        self.connection.execute(ddl)
+                    self._install_summary_triggers(table)
+            except sqlite3.Error as e:
+                print(f"'{table}' 요약 테이블 생성 오류: {e}")
+
+    def rebuild_summaries(self, tables=None):
+        """
+        요약 테이블과 트리거를 지우고 기본 테이블에서 다시 만듭니다 (트리거 밖에서 데이터를 고친 뒤 사용).
+        테이블마다 한 트랜잭션이며, 실패한 테이블은 이전 상태로 돌아갑니다. 반환: 다시 만든 테이블 목록
+        명령줄: python db_manager.py --rebuild-summaries
+        """
+        rebuilt = []
+        for table in list(tables or SUMMARY_MEASURES):
+            measures = SUMMARY_MEASURES[table]
+            cumulative_columns = ", ".join(CUMULATIVE_PREFIX + m for m in measures)
+            try:
+                with self.connection:
+                    self.connection.execute("BEGIN")  # DROP/CREATE 도 같은 트랜잭션으로 (실패하면 함께 롤백)
+                    for name, _ in _summary_triggers(table):
+                        self.connection.execute(f"DROP TRIGGER IF EXISTS {name}")
+                    self.connection.execute(f"DROP TABLE IF EXISTS {monthly_table(table)}")
+                    self.connection.execute(f"DROP TABLE IF EXISTS {cumulative_table(table)}")
+                    for ddl in _summary_ddl(table):
+                        self.connection.execute(ddl)
+                    self.connection.execute(f"""
+                        INSERT INTO {monthly_table(table)} (월, {", ".join(measures)}, 일수)
+                        SELECT substr(날짜, 1, 7), {", ".join(f"COALESCE(SUM({m}), 0)" for m in measures)}, COUNT(*)
+                        FROM {table} WHERE 날짜 IS NOT NULL GROUP BY 1
+                    """)
+                    self.connection.execute(f"""
+                        INSERT INTO {cumulative_table(table)} (날짜, {cumulative_columns})
+                        SELECT substr(날짜, 1, 10), {", ".join(f"SUM(COALESCE(SUM({m}), 0)) OVER (ORDER BY substr(날짜, 1, 10))" for m in measures)}
+                        FROM {table} WHERE 날짜 IS NOT NULL GROUP BY 1
+                    """)
+                    self._install_summary_triggers(table)
+            except sqlite3.Error as e:
+                print(f"'{table}' 요약 테이블 재생성 오류: {e}")
+                continue
+            rebuilt.append(table)
+            print(f"'{table}' 요약 테이블을 다시 만들었습니다.")
+        return rebuilt
+
+    def get_monthly_summary(self, table, month):
+        """월 합계 한 행 {'월', <컬럼>..., '일수'} (month: 'YYYY-MM' 또는 날짜). 없으면 None"""
+        month = month if isinstance(month, str) and len(month) == 7 else _to_date(month).isoformat()[:7]
+        cursor = self.reader().execute(f"SELECT * FROM {monthly_table(table)} WHERE 월 = ?", (month,))
+        row = cursor.fetchone()
+        return dict(zip([c[0] for c in cursor.description], row)) if row else None
+
+    def get_cumulative_summary(self, table, as_of):
+        """as_of 날짜까지의 누적 합계 {<컬럼>: 값} (그 이전 데이터가 없으면 0)"""
+        measures = SUMMARY_MEASURES[table]
+        row = self.reader().execute(
+            f"SELECT {', '.join(CUMULATIVE_PREFIX + m for m in measures)} FROM {cumulative_table(table)} "
+            f"WHERE 날짜 <= ? ORDER BY 날짜 DESC LIMIT 1",
+            (_to_date(as_of).isoformat(),),
+        ).fetchone()
+        return dict(zip(measures, row or [0] * len(measures)))
+
+    def get_range_total(self, table, start_date, end_date):
+        """start_date~end_date(양 끝 포함) 합계 {<컬럼>: 값} - 누적 행 두 개의 차이로 계산"""
+        end = self.get_cumulative_summary(table, end_date)
+        before = self.get_cumulative_summary(table, _to_date(start_date) - timedelta(days=1))
+        return {m: end[m] - before[m] for m in end}
+
+    def create_change_log(self):
+        """
+        변경 로그 테이블과 추적 테이블(CHANGE_LOG_TABLES 중 존재하는 것)의 트리거를 만듭니다.
+        트리거를 새로 설치한 테이블은 'R' 행을 남겨 소비자가 전체를 다시 읽게 합니다.
+        """
+        try:
+            with self.connection:
+                self.connection.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+                        버전 INTEGER PRIMARY KEY AUTOINCREMENT,
+                        테이블 TEXT NOT NULL,
+                        행_id INTEGER,
+                        작업 TEXT NOT NULL
+                    )
+                """)
+                self.connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{CHANGE_LOG_TABLE}_테이블 ON {CHANGE_LOG_TABLE}(테이블, 버전)"
+                )
+                for table in CHANGE_LOG_TABLES:
+                    if not table_exists(self.connection, table) or _is_tracked(self.connection, table):
+                        continue
+                    for ddl in _change_log_ddl(table):
+                        self.connection.execute(ddl)
+                    self.connection.execute(
+                        f"INSERT INTO {CHANGE_LOG_TABLE} (테이블, 행_id, 작업) VALUES (?, NULL, 'R')", (table,)
+                    )
+                    print(f"'{table}' 테이블의 변경 로그 트리거를 만들었습니다.")
+        except sqlite3.Error as e:
+            print(f"변경 로그 생성 오류: {e}")
+
+    def pull_changes(self, since_version, tables=None):
+        """읽기 전용 연결로 since_version 이후 변경분 조회 (pull_changes 참고)"""
+        return pull_changes(self.reader(), since_version, tables)
+
+    def prune_change_log(self, up_to_version):
+        """
+        up_to_version 이하의 변경 로그를 지웁니다. 그 전 버전에서 조회하는 소비자는 전체를 다시 읽습니다.
+        명령줄: python db_manager.py --prune-change-log <버전> (전처리는 실행마다 테이블 사본이 받은 버전까지 정리)
+        """
+        try:
+            removed = prune_change_log(self.connection, up_to_version)
+            print(f"변경 로그 {removed}행을 정리했습니다.")
+        except sqlite3.Error as e:
+            print(f"변경 로그 정리 오류: {e}")
+
+    def create_date_indexes(self):
+        """
+        날짜 조회/정렬용 인덱스를 만듭니다 (DATE_INDEXES).
+        UNIQUE 로 바꾸는 테이블에 같은 날짜 행이 여러 개 있으면 행을 지우지 않고 UNIQUE 인덱스 대신
+        일반 인덱스(idx_<테이블>_날짜_중복)만 만든 뒤 중복 날짜를 알려줍니다. 중복을 정리하면 다음 실행 때 UNIQUE 로 바뀝니다.
+        """
+        cursor = self.connection.cursor()
+        try:
+            existing = {row[0] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for table, unique in DATE_INDEXES.items():
+                if table not in existing:
+                    continue
+                index_name = f"idx_{table}_날짜"
+                if cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?", (index_name,)).fetchone():
+                    continue
+                if unique:
+                    duplicates = cursor.execute(f"""
+                        SELECT 날짜, COUNT(*) FROM {table}
+                        GROUP BY 날짜 HAVING COUNT(*) > 1
+                        ORDER BY 날짜
+                    """).fetchall()
+                    if duplicates:
+                        shown = ", ".join(f"{day}({count}행)" for day, count in duplicates[:10])
+                        more = f" 외 {len(duplicates) - 10}일" if len(duplicates) > 10 else ""
+                        print(f"'{table}' 테이블에 같은 날짜 행이 있어 날짜 UNIQUE 인덱스를 만들지 않았습니다: {shown}{more}")
+                        print("  중복 행을 정리한 뒤 다시 실행하면 UNIQUE 인덱스를 만듭니다.")
+                        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name}_중복 ON {table}(날짜)")
+                        continue
+                    cursor.execute(f"CREATE UNIQUE INDEX {index_name} ON {table}(날짜)")
+                    cursor.execute(f"DROP INDEX IF EXISTS {index_name}_중복")
+                else:
+                    cursor.execute(f"CREATE INDEX {index_name} ON {table}(날짜)")
+                print(f"'{table}' 테이블에 날짜 인덱스를 만들었습니다{' (UNIQUE)' if unique else ''}.")
+            self.connection.commit()
+        except sqlite3.Error as e:
+            print(f"날짜 인덱스 생성 오류: {e}")
+            self.connection.rollback()
     
     def create_tables(self):
         """모든 테이블 생성"""
@@ -180,17 +825,115 @@ class DatabaseManager:
             print(f"테슬라_지급 데이터 삽입 완료: {날짜}")
         except sqlite3.Error as e:
             print(f"테슬라_지급 데이터 삽입 오류: {e}")
-    
+
+    # --- 일괄 저장 (executemany + 트랜잭션 한 번) ---
+    def _has_unique_date(self, table):
+        """테이블에 날짜 단독 UNIQUE 제약/인덱스가 있는지 (ON CONFLICT(날짜) 사용 가능 여부)"""
+        cursor = self.connection.cursor()
+        for index in cursor.execute(f"PRAGMA index_list({table})").fetchall():
+            if not index[2]:  # unique 가 아닌 인덱스
+                continue
+            columns = [info[2] for info in cursor.execute(f"PRAGMA index_info('{index[1]}')").fetchall()]
+            if columns == ["날짜"]:
+                return True
+        return False
+
+    @staticmethod
+    def _to_rows(data, columns):
+        """DataFrame 또는 (튜플/딕셔너리) 반복 가능 객체를 columns 순서의 튜플 목록으로 변환합니다."""
+        if hasattr(data, "itertuples"):  # DataFrame
+            frame = data[columns].copy()
+            for column in columns:
+                if str(frame[column].dtype).startswith("datetime64"):
+                    frame[column] = frame[column].dt.strftime("%Y-%m-%d")
+            # numpy 정수/실수는 sqlite3 에 바인딩되지 않으므로 파이썬 값으로 변환합니다.
+            return [tuple(row) for row in frame.astype(object).itertuples(index=False, name=None)]
+        return [tuple(row[c] for c in columns) if isinstance(row, dict) else tuple(row) for row in data]
+
+    def _upsert_rows(self, table, columns, rows):
+        """
+        날짜별 한 행인 테이블에 행들을 덮어씁니다 (커밋하지 않음).
+        날짜 UNIQUE 가 있으면 INSERT ... ON CONFLICT(날짜) DO UPDATE, 없으면 같은 트랜잭션 안에서
+        해당 날짜 행을 지우고 다시 넣습니다. 반환: 저장한 행 수
+        """
+        if not rows:
+            return 0
+        # 같은 날짜가 여러 번 들어오면 마지막 값만 저장합니다 (두 방식 모두 같은 결과).
+        date_position = columns.index("날짜")
+        rows = list({row[date_position]: row for row in rows}.values())
+        cursor = self.connection.cursor()
+        column_list = ", ".join(columns)
+        placeholders = ", ".join("?" for _ in columns)
+        if self._has_unique_date(table):
+            updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != "날짜")
+            cursor.executemany(
+                f"INSERT INTO {table} ({column_list}) VALUES ({placeholders}) "
+                f"ON CONFLICT(날짜) DO UPDATE SET {updates}",
+                rows,
+            )
+        else:
+            cursor.executemany(f"DELETE FROM {table} WHERE 날짜 = ?", [(row[date_position],) for row in rows])
+            cursor.executemany(f"INSERT INTO {table} ({column_list}) VALUES ({placeholders})", rows)
+        return len(rows)
+
+    def _replace_special_rows(self, rows):
+        """특이사항은 날짜별로 여러 건일 수 있으므로 전체를 지우고 다시 넣습니다 (커밋하지 않음)."""
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM 특이사항")
+        cursor.executemany("INSERT INTO 특이사항 (날짜, 특이사항, 건) VALUES (?, ?, ?)", rows)
+        return len(rows)
+
+    def bulk_upsert_pipeline_data(self, data):
+        """파이프라인 일괄 저장. data: DataFrame 또는 (날짜, 파이프라인) 목록"""
+        return self.bulk_save(pipeline=data)["파이프라인"]
+
+    def bulk_upsert_support_data(self, data):
+        """지원신청 일괄 저장. data: DataFrame 또는 (날짜, 지원신청, PAK_내부지원, 접수후취소, 미신청건, 보완) 목록"""
+        return self.bulk_save(support=data)["지원신청"]
+
+    def bulk_upsert_tesla_data(self, data):
+        """테슬라_지급 일괄 저장. data: DataFrame 또는 (날짜, 배분, 신청, 지급_잔여) 목록"""
+        return self.bulk_save(tesla=data)["테슬라_지급"]
+
+    def bulk_replace_special_data(self, data):
+        """특이사항 전체 교체. data: DataFrame 또는 (날짜, 특이사항, 건) 목록"""
+        return self.bulk_save(special=data)["특이사항"]
+
+    def bulk_save(self, pipeline=None, support=None, tesla=None, special=None):
+        """
+        여러 테이블을 한 트랜잭션(커밋 한 번)으로 저장합니다. None 인 테이블은 건드리지 않습니다.
+        중간에 오류가 나면 전체를 롤백하고 예외를 다시 발생시킵니다.
+        반환: {테이블명: 저장한 행 수}
+        """
+        targets = [
+            ("파이프라인", pipeline, ["날짜", "파이프라인"]),
+            ("지원신청", support, ["날짜", "지원신청", "PAK_내부지원", "접수후취소", "미신청건", "보완"]),
+            ("테슬라_지급", tesla, ["날짜", "배분", "신청", "지급_잔여"]),
+        ]
+        saved = {}
+        try:
+            with self.connection:  # 정상 종료 시 커밋, 예외 시 롤백
+                for table, data, columns in targets:
+                    if data is not None:
+                        saved[table] = self._upsert_rows(table, columns, self._to_rows(data, columns))
+                if special is not None:
+                    saved["특이사항"] = self._replace_special_rows(self._to_rows(special, ["날짜", "특이사항", "건"]))
+        except sqlite3.Error as e:
+            print(f"일괄 저장 오류 (롤백됨): {e}")
+            raise
+        print("일괄 저장 완료: " + ", ".join(f"{table} {count}건" for table, count in saved.items()))
+        return saved
+
     def get_pipeline_data(self, start_date=None, end_date=None):
         """파이프라인 데이터 조회"""
-        cursor = self.connection.cursor()
+        cursor = self.reader().cursor()
         try:
             if start_date and end_date:
                 cursor.execute('''
-                    SELECT * FROM 파이프라인 
-                    WHERE 날짜 BETWEEN ? AND ?
+                    SELECT * FROM 파이프라인
+                    WHERE 날짜 >= ? AND 날짜 < ?
                     ORDER BY 날짜
-                ''', (start_date, end_date))
+                ''', date_range_params(start_date, end_date))
             else:
                 cursor.execute('SELECT * FROM 파이프라인 ORDER BY 날짜')
             
@@ -201,14 +944,14 @@ class DatabaseManager:
     
     def get_support_data(self, start_date=None, end_date=None):
         """지원신청 데이터 조회"""
-        cursor = self.connection.cursor()
+        cursor = self.reader().cursor()
         try:
             if start_date and end_date:
                 cursor.execute('''
-                    SELECT * FROM 지원신청 
-                    WHERE 날짜 BETWEEN ? AND ?
+                    SELECT * FROM 지원신청
+                    WHERE 날짜 >= ? AND 날짜 < ?
                     ORDER BY 날짜
-                ''', (start_date, end_date))
+                ''', date_range_params(start_date, end_date))
             else:
                 cursor.execute('SELECT * FROM 지원신청 ORDER BY 날짜')
             
@@ -219,14 +962,14 @@ class DatabaseManager:
     
     def get_special_data(self, start_date=None, end_date=None):
         """특이사항 데이터 조회"""
-        cursor = self.connection.cursor()
+        cursor = self.reader().cursor()
         try:
             if start_date and end_date:
                 cursor.execute('''
-                    SELECT * FROM 특이사항 
-                    WHERE 날짜 BETWEEN ? AND ?
+                    SELECT * FROM 특이사항
+                    WHERE 날짜 >= ? AND 날짜 < ?
                     ORDER BY 날짜
-                ''', (start_date, end_date))
+                ''', date_range_params(start_date, end_date))
             else:
                 cursor.execute('SELECT * FROM 특이사항 ORDER BY 날짜')
             
@@ -237,14 +980,14 @@ class DatabaseManager:
 
     def get_tesla_data(self, start_date=None, end_date=None):
         """테슬라_지급 데이터 조회"""
-        cursor = self.connection.cursor()
+        cursor = self.reader().cursor()
         try:
             if start_date and end_date:
                 cursor.execute('''
-                    SELECT * FROM 테슬라_지급 
-                    WHERE 날짜 BETWEEN ? AND ?
+                    SELECT * FROM 테슬라_지급
+                    WHERE 날짜 >= ? AND 날짜 < ?
                     ORDER BY 날짜
-                ''', (start_date, end_date))
+                ''', date_range_params(start_date, end_date))
             else:
                 cursor.execute('SELECT * FROM 테슬라_지급 ORDER BY 날짜')
             
@@ -253,17 +996,46 @@ class DatabaseManager:
             print(f"테슬라_지급 데이터 조회 오류: {e}")
             return []
     
+    def query_frame(self, table, columns=None, start_date=None, end_date=None, chunksize=None):
+        """읽기 전용 연결로 DataFrame 조회 (read_frame 참고)"""
+        return read_frame(self.reader(), table, columns, start_date, end_date, chunksize)
+
+    def query_aggregate(self, table, measures=(), by="day", count_as=None, start_date=None, end_date=None):
+        """읽기 전용 연결로 일/월/분기 합계 조회 (read_aggregate 참고)"""
+        return read_aggregate(self.reader(), table, measures, by, count_as, start_date, end_date)
+
+    def query_stats(self, limit=15):
+        """이 프로세스에서 실행한 쿼리의 형태별 통계 표 (횟수, p50/p95, 행 수, 잠금 대기 - query_log 참고)"""
+        return QUERY_LOG.format_summary(limit)
+
     def close(self):
-        """데이터베이스 연결 종료"""
-        if self.connection:
-            self.connection.close()
-            print("데이터베이스 연결이 종료되었습니다.")
+        """데이터베이스 연결 종료 (모든 스레드의 연결)"""
+        self.pool.close_all()
+        print("데이터베이스 연결이 종료되었습니다.")
 
 
 # 사용 예시
 if __name__ == "__main__":
+    # --slow-ms N: 느린 문장 기준(ms), --query-log 파일: 문장별 기록을 JSONL 로 추가 (query_log 참고)
+    if "--slow-ms" in sys.argv:
+        QUERY_LOG.configure(slow_ms=float(sys.argv[sys.argv.index("--slow-ms") + 1]))
+    if "--query-log" in sys.argv:
+        QUERY_LOG.configure(path=sys.argv[sys.argv.index("--query-log") + 1])
+
     # 데이터베이스 매니저 인스턴스 생성
     db = DatabaseManager()
+
+    # --rebuild-summaries: 요약 테이블(월별/누적)을 기본 테이블에서 다시 만듭니다.
+    if "--rebuild-summaries" in sys.argv:
+        db.rebuild_summaries()
+        db.close()
+        sys.exit(0)
+
+    # --prune-change-log N: 버전 N 이하의 변경 로그를 지웁니다 (그보다 오래된 사본을 가진 소비자는 전체를 다시 읽음).
+    if "--prune-change-log" in sys.argv:
+        db.prune_change_log(int(sys.argv[sys.argv.index("--prune-change-log") + 1]))
+        db.close()
+        sys.exit(0)
     
     # 예시 데이터 삽입
     # db.insert_pipeline_data('2025-01-15', 150)
@@ -285,6 +1057,11 @@ if __name__ == "__main__":
     special_data = db.get_special_data()
     for row in special_data:
         print(row)
+
+    # --query-stats: 실행한 쿼리의 형태별 소요시간(p50/p95)/행 수/잠금 대기 요약
+    if "--query-stats" in sys.argv:
+        print("\n=== 쿼리 통계 ===")
+        print(db.query_stats())
     
     # 연결 종료
     db.close()
\ No newline at end of file
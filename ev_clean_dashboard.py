@@ -10,6 +10,9 @@ import plotly.graph_objects as go
 from datetime import datetime
 import numpy as np
 
+from excel_ingest import read_columns
+from workbook_cache import read_excel_cached
+
 # Streamlit 페이지 설정
 st.set_page_config(
     page_title="전기차 보조금 현황",
@@ -82,10 +85,10 @@ st.markdown("""
 
 @st.cache_data
 def load_tesla_data():
-    """테슬라 EV 데이터 로드"""
+    """테슬라 EV 데이터 로드 (대시보드는 지역구분 컬럼만 사용하므로 해당 컬럼만 스트리밍)"""
     try:
         tesla_file = '2025년 테슬라 EV추출파일.xlsx'
-        df_tesla = pd.read_excel(tesla_file, engine='openpyxl')
+        df_tesla = read_columns(tesla_file, ['지역구분'])
         return df_tesla
     except Exception as e:
         st.error(f"테슬라 데이터 로드 오류: {e}")
@@ -99,7 +102,7 @@ def load_all_data():
         
         # 총괄현황 데이터
         overview_file = folder_path + '/총괄현황(전기자동차 승용).xls'
-        df_overview = pd.read_excel(overview_file, header=3, engine='xlrd')
+        df_overview = read_excel_cached(overview_file, header=3, engine='xlrd')
         
         columns = [
             '시도', '지역', '차종', '접수방법', '공고_요약', '공고_전체', '공고_우선순위', '공고_법인기관', '공고_택시', '공고_일반',
@@ -120,10 +123,10 @@ def load_all_data():
         
         # 신청현황 데이터
         status_file = folder_path + '/전기차 신청현황.xls'
-        df_amount = pd.read_excel(status_file, header=4, nrows=8, engine='xlrd').iloc[:, :6]
+        df_amount = read_excel_cached(status_file, header=4, nrows=8, engine='xlrd').iloc[:, :6]
         df_amount.columns = ['단계', '신청대수', '신청국비(만원)', '신청지방비(만원)', '신청추가지원금(만원)', '신청금액합산(만원)']
         
-        df_step = pd.read_excel(status_file, header=17, nrows=1, engine='xlrd').iloc[:1,:]
+        df_step = read_excel_cached(status_file, header=17, nrows=1, engine='xlrd').iloc[:1,:]
         df_step.columns = ['차종', '신청', '승인', '출고', '자격부여', '대상자선정', '지급신청', '지급완료', '취소']
         
         # 숫자형 변환
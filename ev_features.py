@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+
+BIRTH_DATE_COL = "생년월일_날짜"
+AGE_BINS = [-np.inf, 20, 30, 40, 50, 60, 70, np.inf]
+AGE_LABELS = ["10대", "20대", "30대", "40대", "50대", "60대", "70대 이상"]
+UNKNOWN_AGE_LABEL = "미상"
+
+
+def _clean_text(series):
+    """결측치는 빈 문자열로, 나머지는 앞뒤 공백을 제거한 문자열로 변환합니다."""
+    return series.astype(object).where(series.notna(), "").astype(str).str.strip()
+
+
+def _on_uniques(series, func):
+    """
+    고유값에만 func 를 적용한 뒤 원래 위치로 펼칩니다.
+    차종/신청유형/생년월일은 행 수에 비해 고유값이 훨씬 적어 문자열 연산 비용이 크게 줄어듭니다.
+    """
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    mapped = func(pd.Series(uniques, dtype=object))
+    return pd.Series(mapped.to_numpy()[codes], index=series.index, dtype=mapped.dtype)
+
+
+def classify_tesla_model(series):
+    """차종 컬럼을 'Model Y' / 'Model 3' / '기타'로 분류합니다."""
+    return _on_uniques(series, _classify_tesla_model)
+
+
+def _classify_tesla_model(series):
+    text = _clean_text(series)
+    return pd.Series(
+        np.select(
+            [text.str.contains("Model Y", regex=False), text.str.contains("Model 3", regex=False)],
+            ["Model Y", "Model 3"],
+            default="기타",
+        ),
+        index=series.index,
+        dtype=object,
+    )
+
+
+def classify_applicant_type(series):
+    """신청유형 컬럼을 '개인사업자' / '법인' / '개인' / '기타'로 분류합니다."""
+    return _on_uniques(series, _classify_applicant_type)
+
+
+def _classify_applicant_type(series):
+    text = _clean_text(series)
+    return pd.Series(
+        np.select(
+            [
+                text.str.contains("개인사업자", regex=False),
+                text.str.contains("단체", regex=False) | text.str.contains("법인", regex=False),
+                text.str.contains("개인", regex=False),
+            ],
+            ["개인사업자", "법인", "개인"],
+            default="기타",
+        ),
+        index=series.index,
+        dtype=object,
+    )
+
+
+def parse_birth_dates(series):
+    """
+    생년월일(법인등록번호) 컬럼을 datetime64로 변환합니다.
+    - 8자리 숫자: YYYYMMDD
+    - '-' 포함: 공백 앞부분을 YYYY-MM-DD 로 해석
+    - 10자리 숫자(법인등록번호) 및 그 외 형식: NaT
+    """
+    return _on_uniques(series, _parse_birth_dates)
+
+
+def _parse_birth_dates(series):
+    text = _clean_text(series)
+    is_digit = text.str.isdigit()
+    compact = text.where(is_digit & (text.str.len() == 8))
+    dashed = text.where(~is_digit & text.str.contains("-", regex=False)).str.split(" ").str[0]
+
+    parsed_compact = pd.to_datetime(compact, format="%Y%m%d", errors="coerce")
+    parsed_dashed = pd.to_datetime(dashed, format="%Y-%m-%d", errors="coerce")
+    return parsed_compact.fillna(parsed_dashed)
+
+
+def ages_at(birth_dates, reference_date=None):
+    """
+    기준일(reference_date, 기본값 오늘) 기준 만 나이를 계산합니다.
+    0~120세 범위를 벗어나거나 생년월일이 없으면 NaN 입니다.
+    """
+    ref = pd.Timestamp(reference_date) if reference_date is not None else pd.Timestamp.now()
+    birth_dates = pd.to_datetime(birth_dates, errors="coerce")
+    before_birthday = (birth_dates.dt.month > ref.month) | (
+        (birth_dates.dt.month == ref.month) & (birth_dates.dt.day > ref.day)
+    )
+    ages = ref.year - birth_dates.dt.year - before_birthday.astype(int)
+    return ages.where((ages >= 0) & (ages <= 120)).astype(float)
+
+
+def classify_age_group(ages):
+    """나이를 10대~70대 이상 연령대로 분류합니다. 나이가 없으면 '미상'입니다."""
+    groups = pd.cut(ages, bins=AGE_BINS, labels=AGE_LABELS, right=False)
+    return groups.astype(object).where(groups.notna(), UNKNOWN_AGE_LABEL)
+
+
+def add_age_columns(df, reference_date=None, birth_col=BIRTH_DATE_COL):
+    """
+    저장된 생년월일(birth_col) 기준으로 '나이'/'연령대' 컬럼을 다시 계산한 프레임을 반환합니다.
+    화면 표시 시점에 호출하면 재전처리 없이도 날짜가 바뀐 다음 날 나이가 맞게 표시됩니다.
+    """
+    if df is None or df.empty or birth_col not in df.columns:
+        return df
+    ages = ages_at(df[birth_col], reference_date)
+    return df.assign(나이=ages, 연령대=classify_age_group(ages))
@@ -0,0 +1,81 @@
+import os
+
+import pandas as pd
+
+from workbook_cache import cached_parse, read_excel_cached
+
+STREAM_CHUNK_ROWS = 20000
+
+
+def read_sheet(path, sheet_name=0, **kwargs):
+    """엑셀 시트 하나를 읽습니다. (프로세스 풀 작업 단위, 파싱 결과는 workbook_cache 에 캐시)"""
+    return read_excel_cached(path, sheet_name=sheet_name, **kwargs)
+
+
+def default_workers():
+    """기본 워커 수 (CPU 코어 수, 최대 8)"""
+    return min(8, os.cpu_count() or 1)
+
+
+def _typed_chunk(rows, names, date_columns):
+    """행 튜플 목록을 DataFrame으로 바꾸고 날짜 컬럼은 datetime64로 변환합니다."""
+    chunk = pd.DataFrame.from_records(rows, columns=names)
+    for col in date_columns:
+        if col in chunk.columns:
+            chunk[col] = pd.to_datetime(chunk[col], errors="coerce")
+    return chunk
+
+
+def iter_column_chunks(path, columns, sheet_name=0, date_columns=(), chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    .xlsx 시트를 openpyxl read-only 모드로 한 행씩 읽으면서 필요한 컬럼만 남겨
+    chunk_rows 행 단위 DataFrame을 순서대로 반환합니다.
+    전체 시트를 한 번에 만들지 않으므로 파일이 커져도 파싱 중 메모리는 청크 크기로 유지됩니다.
+
+    columns: 읽을 헤더(첫 행) 이름 목록. 시트에 없는 컬럼은 건너뜁니다.
+    date_columns: datetime64로 변환할 컬럼
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+        sheet.reset_dimensions()  # 내보내기 도구가 기록한 시트 크기 정보가 틀린 경우 대비
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None) or ()
+        positions = {}
+        for idx, name in enumerate(header):
+            if name in columns and name not in positions:
+                positions[name] = idx
+        names = [c for c in columns if c in positions]
+        indices = [positions[c] for c in names]
+
+        buffer = []
+        emitted = False
+        for row in rows:
+            if row is None or all(v is None for v in row):
+                continue  # pd.read_excel 과 같이 빈 행은 건너뜁니다
+            buffer.append(tuple(row[i] if i < len(row) else None for i in indices))
+            if len(buffer) >= chunk_rows:
+                yield _typed_chunk(buffer, names, date_columns)
+                buffer = []
+                emitted = True
+        if buffer or not emitted:
+            yield _typed_chunk(buffer, names, date_columns)
+    finally:
+        workbook.close()
+
+
+def read_columns(path, columns, sheet_name=0, date_columns=(), chunk_rows=STREAM_CHUNK_ROWS):
+    """
+    iter_column_chunks 로 필요한 컬럼만 스트리밍해 하나의 DataFrame으로 합칩니다.
+    결과는 workbook_cache 에 (파일 내용, 시트, 컬럼) 기준으로 캐시됩니다.
+    """
+    def parse():
+        chunks = list(iter_column_chunks(path, columns, sheet_name, date_columns, chunk_rows))
+        if not chunks:
+            return pd.DataFrame(columns=[])
+        return pd.concat(chunks, ignore_index=True)
+
+    key_args = {"reader": "stream", "sheet_name": sheet_name, "columns": list(columns), "date_columns": list(date_columns)}
+    return cached_parse(path, key_args, parse)
@@ -69,10 +69,16 @@ class DatabaseManagementApp(QMainWindow):
         self.refresh_button.clicked.connect(self.load_data)
         self.refresh_button.setMinimumHeight(40)
         
+        # 쿼리 통계 버튼
+        self.query_stats_button = QPushButton('쿼리 통계')
+        self.query_stats_button.clicked.connect(self.show_query_stats)
+        self.query_stats_button.setMinimumHeight(40)
+        
         button_layout.addWidget(self.edit_button)
         button_layout.addWidget(self.update_button)
         button_layout.addWidget(self.refresh_button)
         button_layout.addStretch()
+        button_layout.addWidget(self.query_stats_button)
         
         layout.addLayout(button_layout)
     
@@ -638,72 +644,65 @@ class DatabaseManagementApp(QMainWindow):
             QMessageBox.critical(self, '오류', f'데이터 로드 중 오류가 발생했습니다: {str(e)}')
     
     def update_database(self):
-        """데이터베이스 업데이트"""
+        """데이터베이스 업데이트 (네 테이블을 한 트랜잭션으로 일괄 저장)"""
         try:
-            # 파이프라인 데이터 업데이트 (합계 행 제외)
+            # 파이프라인 데이터 (합계 행 제외)
+            pipeline_rows = []
             for row in range(31):  # 합계 행 제외
                 date_item = self.pipeline_table.item(row, 0)
                 pipeline_item = self.pipeline_table.item(row, 1)
                 
                 if date_item and pipeline_item:
-                    date_str = date_item.text()
-                    pipeline_value = int(pipeline_item.text() or 0)
-                    
-                    # 기존 데이터 삭제 후 새로 삽입
-                    cursor = self.db_manager.connection.cursor()
-                    cursor.execute('DELETE FROM 파이프라인 WHERE 날짜 = ?', (date_str,))
-                    self.db_manager.insert_pipeline_data(date_str, pipeline_value)
+                    pipeline_rows.append((date_item.text(), int(pipeline_item.text() or 0)))
             
-            # 지원신청 데이터 업데이트 (합계 행 제외)
+            # 지원신청 데이터 (합계 행 제외)
+            support_rows = []
             for row in range(31):  # 합계 행 제외
                 date_item = self.support_table.item(row, 0)
                 
                 if date_item:
-                    date_str = date_item.text()
                     values = []
                     
                     for col in range(1, 6):
                         item = self.support_table.item(row, col)
                         values.append(int(item.text() or 0) if item else 0)
                     
-                    # 기존 데이터 삭제 후 새로 삽입
-                    cursor = self.db_manager.connection.cursor()
-                    cursor.execute('DELETE FROM 지원신청 WHERE 날짜 = ?', (date_str,))
-                    self.db_manager.insert_support_data(date_str, *values)
+                    support_rows.append((date_item.text(), *values))
             
-            # 테슬라_지급 데이터 업데이트 (합계 행 제외)
+            # 테슬라_지급 데이터 (합계 행 제외)
+            tesla_rows = []
             for row in range(31): # 합계 행 제외
                 date_item = self.tesla_table.item(row, 0)
 
                 if date_item:
-                    date_str = date_item.text()
                     values = []
 
                     for col in range(1, 4):
                         item = self.tesla_table.item(row, col)
                         values.append(int(item.text() or 0) if item else 0)
 
-                    # 기존 데이터 삭제 후 새로 삽입
-                    cursor = self.db_manager.connection.cursor()
-                    cursor.execute('DELETE FROM 테슬라_지급 WHERE 날짜 = ?', (date_str,))
-                    self.db_manager.insert_tesla_data(date_str, *values)
+                    tesla_rows.append((date_item.text(), *values))
 
-            # 특이사항 데이터 업데이트 (전체 삭제 후 재삽입)
-            cursor = self.db_manager.connection.cursor()
-            cursor.execute('DELETE FROM 특이사항')
-            
+            # 특이사항 데이터 (전체 교체)
+            special_rows = []
             for row in range(self.special_table.rowCount()):
                 date_item = self.special_table.item(row, 0)
                 special_item = self.special_table.item(row, 1)
                 count_item = self.special_table.item(row, 2)
                 
                 if date_item and special_item and count_item:
-                    date_str = date_item.text()
                     special_text = special_item.text()
-                    count_value = int(count_item.text() or 0)
                     
                     if special_text.strip():  # 빈 특이사항은 저장하지 않음
-                        self.db_manager.insert_special_data(date_str, special_text, count_value)
+                        special_rows.append((date_item.text(), special_text, int(count_item.text() or 0)))
+            
+            # 날짜별 upsert + 특이사항 교체를 커밋 한 번으로 저장 (오류 시 전체 롤백)
+            self.db_manager.bulk_save(
+                pipeline=pipeline_rows,
+                support=support_rows,
+                tesla=tesla_rows,
+                special=special_rows,
+            )
             
             # 수정 모드 비활성화
             self.toggle_edit_mode()
@@ -713,6 +712,16 @@ class DatabaseManagementApp(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, '오류', f'데이터 업데이트 중 오류가 발생했습니다: {str(e)}')
     
+    def show_query_stats(self):
+        """이번 실행에서 조회/저장한 쿼리의 형태별 소요시간(p50/p95)/행 수/잠금 대기를 보여줍니다."""
+        stats = self.db_manager.query_stats()
+        message_box = QMessageBox(self)
+        message_box.setWindowTitle('쿼리 통계')
+        message_box.setText('최근 실행한 쿼리의 형태별 통계입니다. (자세히 보기)')
+        message_box.setDetailedText(stats)
+        message_box.setFont(QFont('Consolas', 9))
+        message_box.exec()
+    
     def closeEvent(self, event):
         """애플리케이션 종료 시 데이터베이스 연결 해제"""
         self.db_manager.close()
@@ -0,0 +1,110 @@
+"""
+지도 레이어: 정적 지오메트리 + 분기별 값 테이블.
+
+지도 경계(preprocessed_map.geojson, extract_regions.py 로 병합)는 분기와 관계없이 같으므로 그대로 두고,
+분기별 지역 카운트를 지도 지역(sggnm)에 매칭한 결과는 전처리에서 작은 값 테이블로 미리 계산합니다.
+  - map_quarter_values    : sggnm(지역 id) + 분기별 값 컬럼(전체, 1Q ~ 4Q)
+  - map_unmatched_regions : 분기, 지역구분, 카운트 (지도 지역에 매칭되지 않은 df_6 지역)
+뷰어는 실행 시 지오메트리에 값 몇백 개만 붙입니다 (join_map_layer).
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+REGION_ID = "sggnm"
+MAP_QUARTERS = ("전체", "1Q", "2Q", "3Q", "4Q")
+UNMATCHED_COLUMNS = ["분기", "지역구분", "카운트"]
+
+
+def match_region_counts(region_names, region_counts):
+    """
+    지도 지역명 목록에 지역별 카운트를 매칭합니다.
+    1) 이름이 같은 지역  2) '... {지역}'으로 끝나는 지역  3) 지도 키의 시/시도+시 후보 순서로 찾습니다.
+    반환: (지도 지역 순서의 값 목록, 매칭되지 않은 {지역구분: 카운트})
+    """
+    values = []
+    unmatched = set(region_counts.keys())
+
+    for region_name in region_names:
+        matched_count = 0
+
+        # 직접 매칭
+        if region_name in region_counts:
+            matched_count = region_counts[region_name]
+            unmatched.discard(region_name)
+        else:
+            # 1) 기존: '... {시}'로 끝나는 경우
+            for region, count in region_counts.items():
+                if region_name.endswith(" " + str(region)):
+                    matched_count = count
+                    unmatched.discard(region)
+                    break
+
+            # 2) 보강: 지도 키에서 시/시도+시를 모두 후보로 매칭
+            if matched_count == 0:
+                # '경기도 부천시소사구' → sido='경기도', key_body='부천시소사구' → city='부천시'
+                parts = region_name.split(" ", 1)
+                sido = parts[0] if len(parts) == 2 else ""
+                key_body = parts[1] if len(parts) == 2 else region_name
+
+                m = re.search(r'(.+?시)', str(key_body))
+                map_city_base = m.group(1) if m else key_body
+
+                candidates = [map_city_base]  # '부천시'
+                if sido and map_city_base:
+                    candidates.append(f"{sido} {map_city_base}")  # '경기도 부천시'
+
+                for cand in candidates:
+                    if cand in region_counts:
+                        matched_count = region_counts[cand]
+                        unmatched.discard(cand)
+                        break
+
+        values.append(matched_count)
+
+    # 집합 순서는 실행마다 달라지므로 region_counts 순서로 돌려줍니다 (같은 입력이면 같은 아티팩트).
+    return values, {region: count for region, count in region_counts.items() if region in unmatched}
+
+
+def build_map_layers(preprocessed_map, quarterly_counts):
+    """
+    분기별 지역 카운트를 지도 지역에 매칭해 값 테이블을 만듭니다. (전처리 단계에서 실행)
+    반환: (map_quarter_values, map_unmatched_regions) DataFrame
+    """
+    features = (preprocessed_map or {}).get("features", [])
+    region_names = [feature["properties"][REGION_ID] for feature in features]
+
+    values = pd.DataFrame({REGION_ID: region_names})
+    unmatched_rows = []
+    for quarter in MAP_QUARTERS:
+        counts = (quarterly_counts or {}).get(quarter, {})
+        matched, unmatched = match_region_counts(region_names, counts)
+        values[quarter] = np.asarray(matched, dtype=np.int32)
+        unmatched_rows += [(quarter, region, int(count)) for region, count in unmatched.items()]
+
+    return values, pd.DataFrame(unmatched_rows, columns=UNMATCHED_COLUMNS)
+
+
+def join_map_layer(preprocessed_map, values, unmatched, quarter):
+    """
+    정적 지오메트리에 해당 분기 값을 붙인 GeoJSON 과 매칭되지 않은 지역 표(지역구분, 카운트)를 반환합니다.
+    지오메트리는 복사하지 않고 참조합니다 (반환값의 geometry 는 수정하지 않습니다).
+    """
+    if not preprocessed_map:
+        return None, pd.DataFrame(columns=UNMATCHED_COLUMNS[1:])
+
+    value_by_region = dict(zip(values[REGION_ID], values[quarter])) if quarter in values.columns else {}
+    features = [
+        {
+            "type": feature["type"],
+            "geometry": feature["geometry"],
+            "properties": {**feature["properties"], "value": int(value_by_region.get(feature["properties"][REGION_ID], 0))},
+        }
+        for feature in preprocessed_map["features"]
+    ]
+    if unmatched.empty:
+        unmatched_df = pd.DataFrame(columns=UNMATCHED_COLUMNS[1:])
+    else:
+        unmatched_df = unmatched.loc[unmatched["분기"] == quarter, UNMATCHED_COLUMNS[1:]].reset_index(drop=True)
+    return {"type": preprocessed_map["type"], "features": features}, unmatched_df
@@ -5,11 +5,24 @@ import plotly.express as px
 import os
 import re
 
-@st.cache_data
-def load_preprocessed_map(geojson_path):
+from data_access import dataset_version, get_frame, get_preprocessed_map, get_quarterly_counts
+from ev_features import add_age_columns
+from map_layers import build_map_layers, join_map_layer
+
+
+def _file_version(path):
+    """파일 버전 토큰 (수정 시각, 파일이 없으면 None)"""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+@st.cache_data(max_entries=1)
+def load_preprocessed_map(geojson_path, version=None):
     """
     미리 병합된 가벼운 GeoJSON 파일을 로드합니다.
     이 함수는 무거운 지오메트리 연산을 수행하지 않습니다.
+    version(파일 수정 시각)이 바뀌면 다시 읽습니다.
     """
     try:
         with open(geojson_path, 'r', encoding='utf-8') as f:
@@ -21,79 +34,21 @@ def load_preprocessed_map(geojson_path):
         st.error(f"지도 데이터 로드 중 오류: {e}")
         return None
 
-@st.cache_data
-def get_filtered_data_optimized(data, selected_quarter):
-    """사전 계산된 분기별 데이터에서 바로 반환"""
-    quarterly_counts = data.get("quarterly_region_counts", {})
-    return quarterly_counts.get(selected_quarter, {})
-    
-@st.cache_data
-def apply_counts_to_map_optimized(_preprocessed_map, _region_counts):
-    """메모리 효율적인 GeoJSON 매핑"""
-    if not _preprocessed_map:
-        return None, pd.DataFrame()
-
-    # 깊은 복사 대신 참조로 처리하고 필요한 부분만 수정
-    final_geojson = {
-        'type': _preprocessed_map['type'],
-        'features': []
-    }
-    
-    # 지역별 카운트 맵 생성 (한 번만)
-    region_count_map = _region_counts
-    unmatched_regions = set(_region_counts.keys())
-    
-    for feature in _preprocessed_map['features']:
-        new_feature = {
-            'type': feature['type'],
-            'geometry': feature['geometry'],  # 지오메트리는 참조만
-            'properties': feature['properties'].copy()  # 속성만 복사
-        }
-        
-        region_name = new_feature['properties']['sggnm']
-        matched_count = 0
-        
-        # 직접 매칭
-        if region_name in region_count_map:
-            matched_count = region_count_map[region_name]
-            unmatched_regions.discard(region_name)
-        else:
-            # 1) 기존: '... {시}'로 끝나는 경우
-            for region, count in region_count_map.items():
-                if region_name.endswith(" " + region):
-                    matched_count = count
-                    unmatched_regions.discard(region)
-                    break
-
-            # 2) 보강: 지도 키에서 시/시도+시를 모두 후보로 매칭
-            if matched_count == 0:
-                # '경기도 부천시소사구' → sido='경기도', key_body='부천시소사구' → city='부천시'
-                parts = region_name.split(" ", 1)
-                sido = parts[0] if len(parts) == 2 else ""
-                key_body = parts[1] if len(parts) == 2 else region_name
-
-                m = re.search(r'(.+?시)', str(key_body))
-                map_city_base = m.group(1) if m else key_body
-
-                candidates = [map_city_base]  # '부천시'
-                if sido and map_city_base:
-                    candidates.append(f"{sido} {map_city_base}")  # '경기도 부천시'
-
-                for cand in candidates:
-                    if cand in region_count_map:
-                        matched_count = region_count_map[cand]
-                        unmatched_regions.discard(cand)
-                        break
-        
-        new_feature['properties']['value'] = matched_count
-        final_geojson['features'].append(new_feature)
-    
-    unmatched_df = pd.DataFrame({
-        '지역구분': list(unmatched_regions),
-        '카운트': [region_count_map.get(r, 0) for r in unmatched_regions]
-    })
-
-    return final_geojson, unmatched_df
+# 지오메트리/값 테이블은 모든 세션이 공유합니다. version 이 바뀐 빌드에서만 다시 준비합니다.
+@st.cache_resource(max_entries=1)
+def load_map_layers(version):
+    """
+    지도 레이어 (정적 지오메트리, 분기별 값 테이블, 매칭 안 된 지역 표)를 로드합니다.
+    값 테이블은 전처리에서 미리 계산되며(map_layers.py), 값 테이블이 없는 이전 아티팩트라면 여기서 한 번 계산합니다.
+    """
+    preprocessed_map = get_preprocessed_map()
+    if not preprocessed_map:
+        preprocessed_map = load_preprocessed_map('preprocessed_map.geojson', _file_version('preprocessed_map.geojson'))
+    values = get_frame("map_quarter_values")
+    unmatched = get_frame("map_unmatched_regions")
+    if values.empty and preprocessed_map:
+        values, unmatched = build_map_layers(preprocessed_map, get_quarterly_counts())
+    return preprocessed_map, values, unmatched
 
 @st.cache_data
 def get_model_column_map():
@@ -183,8 +138,8 @@ def build_subsidy_map(df_master):
 	return subsidy_map
 
 @st.cache_data
-def create_korea_map(_merged_geojson, map_style, color_scale_name, subsidy_map=None, models_to_show=None, demographics_map=None):
-    """Plotly 지도를 생성합니다. (캐시 적용, 성능 최적화)"""
+def create_korea_map(_merged_geojson, map_style, color_scale_name, subsidy_map=None, models_to_show=None, demographics_map=None, map_key=None):
+    """Plotly 지도를 생성합니다. (캐시 적용, 성능 최적화 / map_key: _merged_geojson 을 구분하는 데이터 버전·분기)"""
     if not _merged_geojson or not _merged_geojson['features']: 
         return None, pd.DataFrame()
     
@@ -359,7 +314,7 @@ def _build_demographics_map(df_6, geojson, selected_quarter):
             if not sggnm:
                 continue
 
-            # 지도 지역명에서 후보 지역 키 생성 (apply_counts_to_map_optimized와 유사)
+            # 지도 지역명에서 후보 지역 키 생성 (map_layers.match_region_counts와 유사)
             parts = sggnm.split(" ", 1)
             sido = parts[0] if len(parts) == 2 else ""
             key_body = parts[1] if len(parts) == 2 else sggnm
@@ -423,10 +378,14 @@ def _build_demographics_map(df_6, geojson, selected_quarter):
     except Exception:
         return {}
 
-def show_map_viewer(data, df_6, use_preloaded=True):
-    """지도 뷰어 표시 - 사전 로딩된 데이터 활용 옵션 추가"""
+def show_map_viewer(data, df_6):
+    """지도 뷰어 표시 (정적 지오메트리에 전처리에서 계산된 분기별 값을 붙여 표시)"""
     
     st.header("🗺️ 지도 시각화")
+    # 연령대는 저장된 생년월일로 오늘 기준 다시 계산
+    df_6 = add_age_columns(df_6)
+    # 지도 캐시 키: 지도/분기 값 데이터셋이 바뀐 빌드에서만 지도를 다시 그립니다.
+    map_version = dataset_version("preprocessed_map_geojson", "quarterly_region_counts", "map_quarter_values")
     col_q_main, col_q_info = st.columns([8, 2])
     with col_q_main:
         quarter_options = ['전체', '1Q', '2Q', '3Q']
@@ -444,168 +403,84 @@ def show_map_viewer(data, df_6, use_preloaded=True):
         else:
             st.markdown("<div style='text-align:right; font-size:17px; color:#888;'>조회 기간<br><b>데이터 없음</b></div>", unsafe_allow_html=True)
     
-    # 사전 로딩된 데이터 사용
-    if use_preloaded and hasattr(st.session_state, 'map_preloaded_data'):
-        preloaded_data = st.session_state.map_preloaded_data.get(selected_quarter)
+    # 정적 지오메트리 + 분기 값 조인 (지역 수백 개의 숫자만 붙이므로 세션별 사전 로딩이 필요 없음)
+    preprocessed_map, map_values, map_unmatched = load_map_layers(map_version)
+    final_geojson, unmatched_df = join_map_layer(preprocessed_map, map_values, map_unmatched, selected_quarter)
+    if not final_geojson:
+        return
         
-        if preloaded_data:
-            final_geojson = preloaded_data['geojson']
-            unmatched_df = preloaded_data['unmatched']
-            
-            st.sidebar.header("⚙️ 지도 설정")
-            map_styles = {"기본 (밝음)": "carto-positron", "기본 (어두움)": "carto-darkmatter"}
-            color_scales = ["Reds","Blues", "Greens", "Viridis"]
-            selected_style = st.sidebar.selectbox("지도 스타일", list(map_styles.keys()))
-            selected_color = st.sidebar.selectbox("색상 스케일", color_scales)
-            # 툴팁에 표시할 모델 선택 및 보조금 맵 생성
-            model_map = get_model_column_map()
-            model_options = list(model_map.keys())
-            selected_models = st.sidebar.multiselect(
-                "툴팁에 표시할 모델",
-                options=model_options,
-                default=["Model 3 RWD", "Model Y New RWD"]
-            )
-            df_master = data.get("df_master", pd.DataFrame())
-            subsidy_map = build_subsidy_map(df_master)
-            
-            # 지도와 매칭 정보를 나란히 배치 (9:1 비율)
-            map_col, info_col = st.columns([9, 1])
-            
-            with map_col:
-                # 인구통계 맵 생성 후 즉시 지도 표시 (캐시된 데이터 사용)
-                demo_map = _build_demographics_map(df_6, final_geojson, selected_quarter)
-                result = create_korea_map(
-                    final_geojson, map_styles[selected_style], selected_color,
-                    subsidy_map, selected_models, demographics_map=demo_map
-                )
-                if result:
-                    fig, df = result
-                    st.plotly_chart(fig, use_container_width=True)
-            
-            with info_col:
-                # 매칭되지 않은 지역 목록을 오른쪽에 작게 표시
-                if not unmatched_df.empty:
-                    st.markdown("**⚠️ 매칭 안됨**")
-                    # 작은 폰트로 표시
-                    for _, row in unmatched_df.iterrows():
-                        st.markdown(f"<small>{row['지역구분']} ({row['카운트']})</small>", unsafe_allow_html=True)
-                else:
-                    st.markdown("**✅ 매칭 완료**")
-                    st.markdown("<small>모든 지역 매칭됨</small>", unsafe_allow_html=True)
-            
-            # 사이드바 메트릭들
-            if result:
-                fig, df = result
-                st.sidebar.metric("총 지역 수", len(df))
-                st.sidebar.metric("데이터가 있는 지역", len(df[df['value'] > 0]))
-                st.sidebar.metric("최대 신청 건수", f"{df['value'].max():,}")
-                st.sidebar.metric("값 0 지역 수", len(df[df['value'] == 0]))
-                
-                # 데이터 테이블 표시 (지도 아래)
-                st.subheader("데이터 테이블")
-                df_nonzero = df[df['value'] > 0][['sggnm', 'value']].sort_values('value', ascending=False)
-                df_zero = df[df['value'] == 0][['sggnm', 'value']].sort_values('sggnm')
-                
-                if not df_nonzero.empty:
-                    st.dataframe(df_nonzero, use_container_width=True)
-                else:
-                    st.info("value > 0 인 지역이 없습니다.")
-                
-                if not df_zero.empty:
-                    st.markdown("---")
-                    st.subheader("값 0 지역 목록")
-                    html_zero = df_zero.to_html(classes='custom_table', border=0, index=False)
-                    st.markdown(html_zero, unsafe_allow_html=True)
-                else:
-                    st.info("value = 0 인 지역이 없습니다.")
-                    
-            return  # 사전 로딩 데이터 사용 완료
-    
-    # 기존 로직 (fallback) - 사전 로딩 실패시
-    st.warning("사전 로딩된 데이터를 사용할 수 없어 기존 방식으로 로딩합니다...")
+    st.sidebar.header("⚙️ 지도 설정")
+    map_styles = {"기본 (밝음)": "carto-positron", "기본 (어두움)": "carto-darkmatter"}
+    color_scales = ["Reds","Blues", "Greens", "Viridis"]
+    selected_style = st.sidebar.selectbox("지도 스타일", list(map_styles.keys()))
+    selected_color = st.sidebar.selectbox("색상 스케일", color_scales)
+    # 툴팁에 표시할 모델 선택 및 보조금 맵 생성
+    model_map = get_model_column_map()
+    model_options = list(model_map.keys())
+    selected_models = st.sidebar.multiselect(
+        "툴팁에 표시할 모델",
+        options=model_options,
+        default=["Model 3 RWD", "Model Y New RWD"]
+    )
+    df_master = data.get("df_master", pd.DataFrame())
+    subsidy_map = build_subsidy_map(df_master)
     
-    # 미리 처리된 가벼운 지도 파일을 로드 (캐시됨)
-    preprocessed_map = load_preprocessed_map('preprocessed_map.geojson')
+    # 지도와 매칭 정보를 나란히 배치 (9:1 비율)
+    map_col, info_col = st.columns([9, 1])
     
-    if preprocessed_map and not df_6.empty:
-        # 분기별 필터링된 데이터 가져오기 (캐시됨)
-        region_counts = get_filtered_data_optimized(data, selected_quarter)
-        
-        # 필터링된 데이터를 지도에 적용 (캐시됨)
-        final_geojson, unmatched_df = apply_counts_to_map_optimized(preprocessed_map, region_counts)
-        
-        st.sidebar.header("⚙️ 지도 설정")
-        map_styles = {"기본 (밝음)": "carto-positron", "기본 (어두움)": "carto-darkmatter"}
-        color_scales = ["Reds","Blues", "Greens", "Viridis"]
-        selected_style = st.sidebar.selectbox("지도 스타일", list(map_styles.keys()))
-        selected_color = st.sidebar.selectbox("색상 스케일", color_scales)
-        # 툴팁에 표시할 모델 선택 및 보조금 맵 생성
-        model_map = get_model_column_map()
-        model_options = list(model_map.keys())
-        selected_models = st.sidebar.multiselect(
-            "툴팁에 표시할 모델",
-            options=model_options,
-            default=["Model 3 RWD", "Model Y New RWD"]
+    with map_col:
+        # 인구통계 맵 생성 후 지도 생성 (캐시됨)
+        demo_map = _build_demographics_map(df_6, final_geojson, selected_quarter)
+        result = create_korea_map(
+            final_geojson, map_styles[selected_style], selected_color,
+            subsidy_map, selected_models, demographics_map=demo_map, map_key=(map_version, selected_quarter)
         )
-        df_master = data.get("df_master", pd.DataFrame())
-        subsidy_map = build_subsidy_map(df_master)
-        
-        # 지도와 매칭 정보를 나란히 배치 (9:1 비율)
-        map_col, info_col = st.columns([9, 1])
+        if result:
+            fig, df = result
+            st.plotly_chart(fig, use_container_width=True)
+    
+    with info_col:
+        # 매칭되지 않은 지역 목록을 오른쪽에 작게 표시
+        if not unmatched_df.empty:
+            st.markdown("**⚠️ 매칭 안됨**")
+            # 작은 폰트로 표시
+            for _, row in unmatched_df.iterrows():
+                st.markdown(f"<small>{row['지역구분']} ({row['카운트']})</small>", unsafe_allow_html=True)
+        else:
+            st.markdown("**✅ 매칭 완료**")
+            st.markdown("<small>모든 지역 매칭됨</small>", unsafe_allow_html=True)
+    
+    # 사이드바 메트릭들
+    if result:
+        fig, df = result
+        st.sidebar.metric("총 지역 수", len(df))
+        st.sidebar.metric("데이터가 있는 지역", len(df[df['value'] > 0]))
+        st.sidebar.metric("최대 신청 건수", f"{df['value'].max():,}")
+        st.sidebar.metric("값 0 지역 수", len(df[df['value'] == 0]))
         
-        with map_col:
-            # 인구통계 맵 생성 후 지도 생성 (캐시됨)
-            demo_map = _build_demographics_map(df_6, final_geojson, selected_quarter)
-            result = create_korea_map(
-                final_geojson, map_styles[selected_style], selected_color,
-                subsidy_map, selected_models, demographics_map=demo_map
-            )
-            if result:
-                fig, df = result
-                st.plotly_chart(fig, use_container_width=True)
+        # 데이터 테이블 표시 (지도 아래)
+        st.subheader("데이터 테이블")
+
+        # 값 유무에 따라 분할
+        df_nonzero = df[df['value'] > 0][['sggnm', 'value']].sort_values('value', ascending=False)
+        df_zero = df[df['value'] == 0][['sggnm', 'value']].sort_values('sggnm')
         
-        with info_col:
-            # 매칭되지 않은 지역 목록을 오른쪽에 작게 표시
-            if not unmatched_df.empty:
-                st.markdown("**⚠️ 매칭 안됨**")
-                # 작은 폰트로 표시
-                for _, row in unmatched_df.iterrows():
-                    st.markdown(f"<small>{row['지역구분']} ({row['카운트']})</small>", unsafe_allow_html=True)
-            else:
-                st.markdown("**✅ 매칭 완료**")
-                st.markdown("<small>모든 지역 매칭됨</small>", unsafe_allow_html=True)
+        if not df_nonzero.empty:
+            st.dataframe(df_nonzero, use_container_width=True)
+        else:
+            st.info("value > 0 인 지역이 없습니다.")
         
-        if result:
-            fig, df = result
-            st.sidebar.metric("총 지역 수", len(df))
-            st.sidebar.metric("데이터가 있는 지역", len(df[df['value'] > 0]))
-            st.sidebar.metric("최대 신청 건수", f"{df['value'].max():,}")
-            st.sidebar.metric("값 0 지역 수", len(df[df['value'] == 0]))
-            
-            st.subheader("데이터 테이블")
-
-            # 값 유무에 따라 분할
-            df_nonzero = df[df['value'] > 0][['sggnm', 'value']].sort_values('value', ascending=False)
-            df_zero = df[df['value'] == 0][['sggnm', 'value']].sort_values('sggnm')
-
-            # value > 0 테이블 (기존 상단 테이블 대체)
-            if not df_nonzero.empty:
-                st.dataframe(df_nonzero, use_container_width=True)
-            else:
-                st.info("value > 0 인 지역이 없습니다.")
-
-            # value = 0 테이블 (아래 별도 섹션)
-            if not df_zero.empty:
-                st.markdown("---")
-                st.subheader("값 0 지역 목록")
-                html_zero = df_zero.to_html(classes='custom_table', border=0, index=False)
-                st.markdown(html_zero, unsafe_allow_html=True)
-            else:
-                st.info("value = 0 인 지역이 없습니다.")
+        if not df_zero.empty:
+            st.markdown("---")
+            st.subheader("값 0 지역 목록")
+            html_zero = df_zero.to_html(classes='custom_table', border=0, index=False)
+            st.markdown(html_zero, unsafe_allow_html=True)
+        else:
+            st.info("value = 0 인 지역이 없습니다.")
 
 def main():
     """지도 뷰어를 독립적으로 실행하기 위한 메인 함수"""
-    import pickle
+    from data_access import get_artifacts
     import pytz
     from datetime import datetime
     
@@ -640,13 +515,11 @@ def main():
     </style>
     """, unsafe_allow_html=True)
     
-    # 데이터 로딩
-    @st.cache_data(ttl=3600)
+    # 데이터 로딩 (data_access 가 프로세스당 한 번만 로드하고 새 빌드가 들어오면 바로 교체합니다)
     def load_data():
         """전처리된 데이터 파일을 로드합니다."""
         try:
-            with open("preprocessed_data.pkl", "rb") as f:
-                return pickle.load(f)
+            return get_artifacts()
         except FileNotFoundError:
             st.error("전처리된 데이터 파일(preprocessed_data.pkl)을 찾을 수 없습니다.")
             st.info("먼저 '전처리.py'를 실행하여 데이터 파일을 생성해주세요.")
@@ -0,0 +1,219 @@
+import hashlib
+import os
+import pickle
+import time
+import tracemalloc
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from excel_ingest import default_workers
+
+STAGE_KINDS = ("load", "normalize", "derive", "aggregate", "write", "publish")
+
+
+class StageFailed(Exception):
+    """필수 단계가 실패해 파이프라인을 끝까지 실행하지 못했을 때 발생합니다."""
+
+
+class Stage:
+    """
+    파이프라인 단계 선언.
+
+    name: 단계 이름 (캐시 키로도 사용)
+    func: func(*의존 단계 출력, *args) 형태로 호출되는 모듈 최상위 함수
+    deps: 의존하는 단계 이름 목록. 출력은 같은 순서로 func 에 전달됩니다.
+    kind: load / normalize / derive / aggregate / write / publish
+    inputs: 외부 입력(파일/테이블) 지문 목록을 반환하는 함수. 의존 단계 출력과 함께 캐시 키가 됩니다.
+    process: True 이면 프로세스 풀에서 실행합니다 (엑셀 파싱처럼 CPU를 쓰는 단계).
+    cache: False 이면 입력이 같아도 항상 실행합니다.
+           파일 쓰기, 푸시처럼 부수 효과가 있는 단계를 캐시하면 입력이 같을 때 부수 효과도 건너뜁니다.
+    output_files: 단계가 부수 효과로 만드는 파일 경로 목록. 하나라도 없으면 캐시가 있어도 다시 실행합니다.
+    fallback: 선택 단계가 실패했을 때 대신 사용할 값을 만드는 함수.
+              None 이면 필수 단계로, 실패하면 이후 단계를 실행하지 않습니다.
+    """
+
+    def __init__(self, name, func, deps=(), kind="load", args=(), inputs=None, process=False, cache=True, fallback=None,
+                 output_files=()):
+        if kind not in STAGE_KINDS:
+            raise ValueError(f"알 수 없는 단계 종류: {kind}")
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.kind = kind
+        self.args = tuple(args)
+        self.inputs = inputs
+        self.process = process
+        self.cache = cache
+        self.fallback = fallback
+        self.output_files = tuple(output_files)
+
+
+def _measured_call(func, args, trace_memory=False):
+    """
+    함수를 실행하고 (결과, 소요시간, 최대 메모리 증가량)을 반환합니다.
+    trace_memory=True 이면 실행 중인 프로세스의 tracemalloc 으로 메모리를 측정합니다.
+    (tracemalloc 은 openpyxl 파싱처럼 객체를 많이 만드는 작업을 몇 배 느리게 하므로 기본값은 끔)
+    """
+    if not trace_memory:
+        started = time.perf_counter()
+        result = func(*args)
+        return result, time.perf_counter() - started, 0
+
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] - baseline
+    return result, elapsed, max(peak, 0)
+
+
+def _digest(value):
+    """단계 출력의 내용 해시. 하위 단계의 캐시 키로 사용합니다."""
+    return hashlib.sha256(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)).hexdigest()
+
+
+class PipelineRunner:
+    """
+    선언된 단계를 의존 관계 순서로 실행합니다.
+
+    - 의존 단계가 모두 끝난 단계들은 동시에 실행합니다 (process=True 는 프로세스 풀, 나머지는 스레드 풀).
+    - 단계 출력은 BuildCache 에 저장하고, 외부 입력 지문과 의존 단계 출력 해시가 같으면 재사용합니다.
+      따라서 상위 단계 출력이 바뀐 경우에만 하위 단계가 다시 실행됩니다.
+    - 실행이 끝나면 단계별 소요시간 표를 출력합니다. trace_memory=True 이면 최대 메모리도 측정합니다.
+    """
+
+    def __init__(self, stages, cache, max_workers=None, trace_memory=False):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache = cache
+        self.max_workers = max_workers or default_workers()
+        self.trace_memory = trace_memory
+        self.outputs = {}
+        self.digests = {}
+        self.records = {}
+        self._validate()
+
+    def _validate(self):
+        for stage in self.stages.values():
+            for dep in stage.deps:
+                if dep not in self.stages:
+                    raise ValueError(f"'{stage.name}' 단계의 의존 단계 '{dep}' 가 선언되지 않았습니다.")
+
+    def _cache_inputs(self, stage):
+        inputs = list(stage.inputs()) if stage.inputs else []
+        inputs += [{"stage": dep, "digest": self.digests[dep]} for dep in stage.deps]
+        return inputs
+
+    def _record(self, stage, status, elapsed=0.0, peak=0, error=None):
+        self.records[stage.name] = {"kind": stage.kind, "status": status, "elapsed": elapsed, "peak": peak, "error": error}
+
+    def _finish(self, stage, inputs, result, elapsed, peak):
+        self.outputs[stage.name] = result
+        self.digests[stage.name] = _digest(result)
+        if stage.cache:
+            self.cache.store(stage.name, inputs, {"output": result, "digest": self.digests[stage.name]})
+        self._record(stage, "실행", elapsed, peak)
+
+    def _fail(self, stage, error, elapsed=0.0, peak=0):
+        if stage.fallback is None:
+            self._record(stage, "실패", elapsed, peak, error)
+            return
+        # 선택 단계: 대체값으로 계속 진행하되 결과 표와 경고에 남깁니다.
+        result = stage.fallback()
+        self.outputs[stage.name] = result
+        self.digests[stage.name] = _digest(result)
+        self._record(stage, "대체값", elapsed, peak, error)
+
+    def run(self):
+        """모든 단계를 실행하고 {단계 이름: 출력}을 반환합니다. 필수 단계가 실패하면 StageFailed 를 발생시킵니다."""
+        started = time.perf_counter()
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        inline = self.max_workers <= 1
+        threads = None if inline else ThreadPoolExecutor(max_workers=self.max_workers)
+        processes = None if inline else ProcessPoolExecutor(max_workers=self.max_workers)
+        pending = dict(self.stages)
+        running = {}  # future -> (stage, cache inputs)
+
+        try:
+            while pending or running:
+                # 실행 가능한 단계 시작 (프로세스 단계를 먼저 제출해 스레드 실행 중 fork 를 피합니다)
+                ready = [s for s in pending.values() if all(d in self.records for d in s.deps)]
+                ready.sort(key=lambda s: not s.process)
+                for stage in ready:
+                    del pending[stage.name]
+                    failed_deps = [d for d in stage.deps if self.records[d]["status"] in ("실패", "건너뜀")]
+                    if failed_deps:
+                        self._record(stage, "건너뜀", error=f"의존 단계 실패: {', '.join(failed_deps)}")
+                        continue
+
+                    try:
+                        inputs = self._cache_inputs(stage)
+                    except Exception as e:
+                        self._fail(stage, f"입력 확인 실패: {e}")
+                        continue
+                    if stage.cache:
+                        hit, cached = self.cache.lookup(stage.name, inputs)
+                        if hit and all(os.path.exists(path) for path in stage.output_files):
+                            self.outputs[stage.name] = cached["output"]
+                            self.digests[stage.name] = cached["digest"]
+                            self._record(stage, "캐시")
+                            continue
+
+                    args = tuple(self.outputs[d] for d in stage.deps) + stage.args
+                    if inline:
+                        try:
+                            self._finish(stage, inputs, *_measured_call(stage.func, args, self.trace_memory))
+                        except Exception as e:
+                            self._fail(stage, f"{type(e).__name__}: {e}")
+                        continue
+                    executor = processes if stage.process else threads
+                    running[executor.submit(_measured_call, stage.func, args, self.trace_memory)] = (stage, inputs)
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage, inputs = running.pop(future)
+                    try:
+                        self._finish(stage, inputs, *future.result())
+                    except Exception as e:
+                        self._fail(stage, f"{type(e).__name__}: {e}")
+        finally:
+            if threads:
+                threads.shutdown()
+            if processes:
+                processes.shutdown()
+            self.cache.save()
+
+        self.print_report(time.perf_counter() - started)
+        failed = [name for name, r in self.records.items() if r["status"] == "실패"]
+        if failed:
+            raise StageFailed(f"필수 단계 실패: {', '.join(failed)}")
+        return self.outputs
+
+    def print_report(self, total_elapsed):
+        """단계별 상태/소요시간/최대 메모리 표를 출력합니다."""
+        # 최대 메모리 열은 trace_memory(--profile-memory) 로 측정할 때만 출력합니다.
+        memory_header = f"{'최대 메모리(MB)':>16}" if self.trace_memory else ""
+        print()
+        print(f"{'단계':<24}{'종류':<11}{'상태':<8}{'시간(초)':>9}{memory_header}")
+        print("-" * 72)
+        for name, r in self.records.items():
+            peak = f"{r['peak'] / (1024 * 1024):>16.1f}" if self.trace_memory else ""
+            print(f"{name:<24}{r['kind']:<11}{r['status']:<8}{r['elapsed']:>9.2f}{peak}")
+        print("-" * 72)
+        if self.trace_memory:
+            print(f"전체 {total_elapsed:.2f}초 (메모리 측정 중에는 실행 시간이 늘어나며, "
+                  f"스레드로 동시에 실행된 단계의 메모리는 서로 겹쳐 측정될 수 있습니다)")
+        else:
+            print(f"전체 {total_elapsed:.2f}초 (단계별 최대 메모리는 --profile-memory 로 측정)")
+
+        problems = {name: r for name, r in self.records.items() if r["error"]}
+        if problems:
+            print()
+            for name, r in problems.items():
+                label = "빈 데이터로 대체" if r["status"] == "대체값" else r["status"]
+                print(f"⚠️ [{name}] {label}: {r['error']}")
@@ -1,21 +1,45 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import pickle
+from data_access import dataset_version, get_artifacts, get_frame
 from datetime import datetime, timedelta
 import re
 import altair as alt
 
+CUMULATIVE_PREFIX = "누적_"  # db_manager 요약 테이블의 누적 컬럼 (전처리가 붙임)
+
+
+def range_total(df, column, start, end):
+    """
+    start~end(양 끝 포함) 날짜의 column 합계.
+    누적_<컬럼>이 있으면 날짜 이분 탐색으로 두 누적값의 차이를 구하고, 없으면 해당 기간 행을 합산합니다.
+    """
+    if df.empty or '날짜' not in df.columns or column not in df.columns:
+        return 0
+    cumulative_col = CUMULATIVE_PREFIX + column
+    if cumulative_col not in df.columns or df[cumulative_col].isna().any():
+        mask = (df['날짜'].dt.date >= start) & (df['날짜'].dt.date <= end)
+        return df.loc[mask, column].sum()
+
+    days = df['날짜'].to_numpy()
+    cumulative = df[cumulative_col].to_numpy()
+    opening = cumulative[0] - df[column].iloc[0]  # 첫 행 이전(다른 연도 포함)까지의 누적
+
+    def through(day):
+        position = np.searchsorted(days, np.datetime64(day + timedelta(days=1)), side='left')
+        return opening if position == 0 else cumulative[position - 1]
+
+    return through(end) - through(start - timedelta(days=1))
+
+
 def show_polestar_viewer(data, today_kst):
     """폴스타 뷰어 대시보드를 표시합니다."""
     
-    # pkl에서 폴스타 DataFrame 로드
-    @st.cache_data
-    def load_polestar_data():
+    # 아티팩트에서 폴스타 DataFrame 두 개만 로드 (세션 간 복사 없이 공유, 데이터셋 버전이 바뀌면 다시 로드)
+    @st.cache_resource(max_entries=1)
+    def load_polestar_data(version):
         try:
-            with open("preprocessed_data.pkl", "rb") as f:
-                data = pickle.load(f)
-            return data.get('df_pole_pipeline', pd.DataFrame()), data.get('df_pole_apply', pd.DataFrame())
+            return get_frame('df_pole_pipeline'), get_frame('df_pole_apply')
         except FileNotFoundError:
             st.error("preprocessed_data.pkl 파일을 찾을 수 없습니다. 먼저 전처리.py를 실행해주세요.")
             return pd.DataFrame(), pd.DataFrame()
@@ -23,7 +47,7 @@ def show_polestar_viewer(data, today_kst):
             st.error(f"데이터 로드 중 오류: {e}")
             return pd.DataFrame(), pd.DataFrame()
     
-    df_pole_pipeline, df_pole_apply = load_polestar_data()
+    df_pole_pipeline, df_pole_apply = load_polestar_data(dataset_version('df_pole_pipeline', 'df_pole_apply'))
     
     # 월별 집계 계산 함수를 일별 데이터도 포함하도록 수정
     @st.cache_data
@@ -31,47 +55,24 @@ def show_polestar_viewer(data, today_kst):
         """선택된 날짜의 데이터를 계산"""
         selected_date = pd.to_datetime(selected_date).date()
         
-        # 파이프라인 당일 데이터
-        pipeline_today = 0
-        if not pipeline_df.empty and '날짜' in pipeline_df.columns:
-            today_pipeline = pipeline_df[pipeline_df['날짜'].dt.date == selected_date]
-            pipeline_today = today_pipeline['파이프라인'].sum()
-        
-        # 지원신청 당일 데이터
-        apply_today = pak_today = cancel_today = unreceived_today = supplement_today = 0
-        if not apply_df.empty and '날짜' in apply_df.columns:
-            today_apply = apply_df[apply_df['날짜'].dt.date == selected_date]
-            apply_today = today_apply['지원신청'].sum()
-            pak_today = today_apply['PAK_내부지원'].sum()
-            cancel_today = today_apply['접수후취소'].sum()
-            unreceived_today = today_apply['미신청건'].sum()
-            supplement_today = today_apply['보완'].sum()
+        # 당일 데이터
+        pipeline_today = range_total(pipeline_df, '파이프라인', selected_date, selected_date)
+        apply_today = range_total(apply_df, '지원신청', selected_date, selected_date)
+        pak_today = range_total(apply_df, 'PAK_내부지원', selected_date, selected_date)
+        cancel_today = range_total(apply_df, '접수후취소', selected_date, selected_date)
+        unreceived_today = range_total(apply_df, '미신청건', selected_date, selected_date)
+        supplement_today = range_total(apply_df, '보완', selected_date, selected_date)
         
         # 월 누계 데이터 (선택된 날짜가 속한 월의 1일부터 선택된 날짜까지)
         month_start = selected_date.replace(day=1)
         month_end = selected_date
         
-        # 파이프라인 월 누계
-        pipeline_month_total = 0
-        if not pipeline_df.empty and '날짜' in pipeline_df.columns:
-            month_pipeline = pipeline_df[
-                (pipeline_df['날짜'].dt.date >= month_start) & 
-                (pipeline_df['날짜'].dt.date <= month_end)
-            ]
-            pipeline_month_total = month_pipeline['파이프라인'].sum()
-        
-        # 지원신청 월 누계
-        apply_month_total = pak_month_total = cancel_month_total = unreceived_total = supplement_total = 0
-        if not apply_df.empty and '날짜' in pipeline_df.columns:
-            month_apply = apply_df[
-                (apply_df['날짜'].dt.date >= month_start) & 
-                (apply_df['날짜'].dt.date <= month_end)
-            ]
-            apply_month_total = month_apply['지원신청'].sum()
-            pak_month_total = month_apply['PAK_내부지원'].sum()
-            cancel_month_total = month_apply['접수후취소'].sum()
-            unreceived_total = month_apply['미신청건'].sum()
-            supplement_total = month_apply['보완'].sum()
+        pipeline_month_total = range_total(pipeline_df, '파이프라인', month_start, month_end)
+        apply_month_total = range_total(apply_df, '지원신청', month_start, month_end)
+        pak_month_total = range_total(apply_df, 'PAK_내부지원', month_start, month_end)
+        cancel_month_total = range_total(apply_df, '접수후취소', month_start, month_end)
+        unreceived_total = range_total(apply_df, '미신청건', month_start, month_end)
+        supplement_total = range_total(apply_df, '보완', month_start, month_end)
         
         return {
             'pipeline_today': pipeline_today,
@@ -120,26 +121,12 @@ def show_polestar_viewer(data, today_kst):
     year = selected_date.year
     cumulative_start = dt(year, 6, 1).date()
     
-    # 누적 파이프라인 계산
-    total_pipeline = 0
-    if not df_pole_pipeline.empty and '날짜' in df_pole_pipeline.columns:
-        cumulative_pipeline = df_pole_pipeline[
-            (df_pole_pipeline['날짜'].dt.date >= cumulative_start) & 
-            (df_pole_pipeline['날짜'].dt.date <= selected_date)
-        ]
-        total_pipeline = cumulative_pipeline['파이프라인'].sum()
-    
-    # 누적 지원신청 및 기타 계산
-    total_apply = total_unreceived = total_supplement = total_cancel = 0
-    if not df_pole_apply.empty and '날짜' in df_pole_apply.columns:
-        cumulative_apply = df_pole_apply[
-            (df_pole_apply['날짜'].dt.date >= cumulative_start) & 
-            (df_pole_apply['날짜'].dt.date <= selected_date)
-        ]
-        total_apply = cumulative_apply['지원신청'].sum()
-        total_unreceived = cumulative_apply['미신청건'].sum()
-        total_supplement = cumulative_apply['보완'].sum()
-        total_cancel = cumulative_apply['접수후취소'].sum()
+    # 누적 파이프라인/지원신청 및 기타 계산
+    total_pipeline = range_total(df_pole_pipeline, '파이프라인', cumulative_start, selected_date)
+    total_apply = range_total(df_pole_apply, '지원신청', cumulative_start, selected_date)
+    total_unreceived = range_total(df_pole_apply, '미신청건', cumulative_start, selected_date)
+    total_supplement = range_total(df_pole_apply, '보완', cumulative_start, selected_date)
+    total_cancel = range_total(df_pole_apply, '접수후취소', cumulative_start, selected_date)
     
     # 변동량 계산
     delta_pipeline = current_date_data['pipeline_today'] - yesterday_data['pipeline_today']
@@ -441,7 +428,6 @@ def show_polestar_viewer(data, today_kst):
 # 독립 실행을 위한 메인 함수
 def main():
     """폴스타 뷰어를 독립적으로 실행하기 위한 메인 함수"""
-    import pickle
     import pytz
     from datetime import datetime
     
@@ -476,13 +462,11 @@ def main():
     </style>
     """, unsafe_allow_html=True)
     
-    # 데이터 로딩
-    @st.cache_data(ttl=3600)
+    # 데이터 로딩 (data_access 가 프로세스당 한 번만 로드하고 새 빌드가 들어오면 바로 교체합니다)
     def load_data():
         """전처리된 데이터 파일을 로드합니다."""
         try:
-            with open("preprocessed_data.pkl", "rb") as f:
-                return pickle.load(f)
+            return get_artifacts()
         except FileNotFoundError:
             st.error("전처리된 데이터 파일(preprocessed_data.pkl)을 찾을 수 없습니다.")
             st.info("먼저 '전처리.py'를 실행하여 데이터 파일을 생성해주세요.")
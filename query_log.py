@@ -0,0 +1,290 @@
+"""
+SQLite 쿼리 계측 (DatabaseManager, 전처리 공용).
+
+db_manager.open_connection 으로 연 연결은 문장마다
+  SQL, 소요시간(실행 + 결과 행 가져오기), 반환/변경 행 수, 잠금 대기 시간, 오류
+를 기록합니다. 기록은 프로세스 공용 링 버퍼(QUERY_LOG)에 쌓이고, JSONL 파일을 지정하면 한 줄씩 추가됩니다.
+느린 문장(slow_ms 이상)은 같은 연결에서 EXPLAIN QUERY PLAN 을 실행해 실행 계획을 함께 남깁니다.
+
+잠금 대기: 연결은 항상 SQLite busy_timeout(busy_timeout_ms)으로 기다립니다 (commit, with conn, 백업 포함).
+잠금을 기다릴 수 있는 문장(WAL 의 쓰기 문장, 롤백 저널 모드의 문장)은 먼저 busy_timeout 0 으로 실행해 보고,
+"database is locked" 이면 busy_timeout 을 되돌려 다시 실행하며 그 시간을 잠금 대기로 기록합니다.
+(롤백 저널 모드의 executemany 는 중간 행에서 잠길 수 있어 다시 실행하지 않으므로 잠금 대기를 따로 재지 않습니다.)
+
+환경변수
+  GREET_QUERY_LOG     : JSONL 파일 경로 (없으면 링 버퍼에만 기록)
+  GREET_SLOW_QUERY_MS : 느린 문장 기준 (기본 200ms)
+요약: QUERY_LOG.summary() / format_summary() - 문장 형태(리터럴을 ? 로 바꾼 SQL)별 횟수, p50/p95/최대, 행 수, 잠금 대기
+"""
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from functools import lru_cache
+
+RING_CAPACITY = 2000
+SLOW_QUERY_MS = float(os.environ.get("GREET_SLOW_QUERY_MS", 200))
+QUERY_LOG_PATH = os.environ.get("GREET_QUERY_LOG")
+EXPLAIN_PREFIXES = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE", "REPLACE")
+BUSY_MESSAGE = "database is locked"
+SQL_PREVIEW = 500  # 기록에 남기는 SQL 최대 길이
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def query_shape(sql):
+    """요약 키: 공백을 한 칸으로 줄이고 문자열/숫자 리터럴과 (?, ?, ...) 목록을 ? 로 바꾼 SQL"""
+    shape = _LITERALS.sub("?", _SPACES.sub(" ", sql).strip())
+    return _PLACEHOLDER_LIST.sub("(?)", shape)
+
+
+def _percentile(sorted_values, q):
+    """nearest-rank 백분위수"""
+    return sorted_values[max(math.ceil(q * len(sorted_values)) - 1, 0)]
+
+
+class QueryLog:
+    """문장 기록 링 버퍼 (스레드 안전). path 를 주면 기록마다 JSONL 한 줄을 추가합니다."""
+
+    def __init__(self, capacity=RING_CAPACITY, slow_ms=SLOW_QUERY_MS, path=QUERY_LOG_PATH):
+        self.slow_ms = slow_ms
+        self.path = path
+        self._entries = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def configure(self, slow_ms=None, path=None, capacity=None):
+        """느린 문장 기준, JSONL 경로, 링 버퍼 크기를 바꿉니다 (None 인 항목은 유지)."""
+        with self._lock:
+            if slow_ms is not None:
+                self.slow_ms = slow_ms
+            if path is not None:
+                self.path = path or None
+            if capacity is not None:
+                self._entries = deque(self._entries, maxlen=capacity)
+
+    def record(self, entry):
+        with self._lock:
+            self._entries.append(entry)
+            if not self.path:
+                return
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({**entry, "shape": query_shape(entry["sql"])}, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"쿼리 로그 기록 오류 ({self.path}): {e}")
+                self.path = None  # 한 번 실패하면 링 버퍼에만 기록합니다.
+
+    def entries(self):
+        with self._lock:
+            return list(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def summary(self):
+        """문장 형태별 통계 목록 (총 소요시간 큰 순서)"""
+        groups = {}
+        for entry in self.entries():
+            groups.setdefault(query_shape(entry["sql"]), []).append(entry)
+        rows = []
+        for shape, entries in groups.items():
+            elapsed = sorted(e["elapsed_ms"] for e in entries)
+            rows.append({
+                "shape": shape,
+                "count": len(entries),
+                "total_ms": sum(elapsed),
+                "p50_ms": _percentile(elapsed, 0.50),
+                "p95_ms": _percentile(elapsed, 0.95),
+                "max_ms": elapsed[-1],
+                "rows": sum(e["rows"] for e in entries),
+                "lock_wait_ms": sum(e["lock_wait_ms"] for e in entries),
+                "slow": sum(e["elapsed_ms"] >= self.slow_ms for e in entries),
+                "errors": sum(bool(e["error"]) for e in entries),
+            })
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def format_summary(self, limit=15, width=70):
+        """summary() 를 표 문자열로 (상위 limit 개 형태, SQL 은 width 자까지)"""
+        rows = self.summary()
+        if not rows:
+            return "기록된 쿼리가 없습니다."
+        lines = [
+            f"{'횟수':>6}{'p50(ms)':>10}{'p95(ms)':>10}{'최대(ms)':>10}{'행 수':>9}{'잠금(ms)':>10}{'느림':>6}{'오류':>6}  SQL",
+            "-" * (70 + width),
+        ]
+        for row in rows[:limit]:
+            shape = row["shape"] if len(row["shape"]) <= width else row["shape"][:width - 3] + "..."
+            lines.append(
+                f"{row['count']:>6}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{row['max_ms']:>10.2f}{row['rows']:>9}"
+                f"{row['lock_wait_ms']:>10.1f}{row['slow']:>6}{row['errors']:>6}  {shape}"
+            )
+        if len(rows) > limit:
+            lines.append(f"... 외 {len(rows) - limit}개 형태")
+        lines.append(f"느린 문장 기준 {self.slow_ms:g}ms, 최근 {len(self.entries())}개 문장 기준")
+        return "\n".join(lines)
+
+
+QUERY_LOG = QueryLog()
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """
+    실행/가져오기 시간을 재는 커서. SELECT 는 결과를 끝까지 가져오거나(fetchall, 반복 종료),
+    커서를 닫거나 다시 실행할 때 기록합니다. 나머지 문장은 실행 직후 기록합니다.
+    """
+
+    _pending = None  # 기록 대기 중인 문장 {sql, params, elapsed, rows, lock_wait}
+
+    def _may_wait(self, sql, many):
+        """busy_timeout 0 으로 먼저 실행해 잠금 대기를 잴 문장인지"""
+        conn = self.connection
+        if conn.wal:
+            return not sql.lstrip()[:6].upper() == "SELECT"  # WAL 에서 읽기는 쓰기를 기다리지 않습니다.
+        return not many
+
+    def _set_busy_timeout(self, ms):
+        sqlite3.Cursor(self.connection).execute(f"PRAGMA busy_timeout = {int(ms)}")
+
+    def _run(self, method, sql, parameters, many=False):
+        self._finish()
+        probe = self._may_wait(sql, many)
+        started = time.perf_counter()
+        lock_wait = 0.0
+        try:
+            if probe:
+                self._set_busy_timeout(0)
+            try:
+                method(sql, parameters)
+            except sqlite3.OperationalError as e:
+                if not probe or str(e) != BUSY_MESSAGE:
+                    raise
+                # 잠겨 있으면 busy_timeout 을 되돌려 SQLite 가 기다리게 하고 그 시간을 잽니다.
+                self._set_busy_timeout(self.connection.busy_timeout_ms)
+                probe = False
+                waited_from = time.perf_counter()
+                try:
+                    method(sql, parameters)
+                finally:
+                    lock_wait = time.perf_counter() - waited_from
+            finally:
+                if probe:
+                    self._set_busy_timeout(self.connection.busy_timeout_ms)
+        except sqlite3.Error as e:
+            self._pending = {"sql": sql, "params": parameters, "elapsed": time.perf_counter() - started, "rows": 0,
+                             "lock_wait": lock_wait}
+            self._finish(error=f"{type(e).__name__}: {e}")
+            raise
+        self._pending = {"sql": sql, "params": parameters, "elapsed": time.perf_counter() - started, "rows": 0,
+                         "lock_wait": lock_wait}
+        if self.description is None:
+            self._pending["rows"] = max(self.rowcount, 0)
+            self._finish()
+        return self
+
+    def _fetched(self, started, count, done):
+        if self._pending is not None:
+            self._pending["elapsed"] += time.perf_counter() - started
+            self._pending["rows"] += count
+            if done:
+                self._finish()
+
+    def _finish(self, error=None):
+        pending, self._pending = self._pending, None
+        if pending is None:
+            return
+        conn = self.connection
+        log = conn.query_log
+        elapsed_ms = pending["elapsed"] * 1000
+        plan = None
+        sql = pending["sql"]
+        if elapsed_ms >= log.slow_ms and error is None and sql.lstrip().upper().startswith(EXPLAIN_PREFIXES):
+            params = pending["params"]
+            if isinstance(params, list) and params and isinstance(params[0], (tuple, list, dict)):
+                params = params[0]  # executemany: 첫 행의 파라미터로 계획을 봅니다.
+            try:
+                plan = [row[3] for row in sqlite3.Cursor(conn).execute("EXPLAIN QUERY PLAN " + sql, params)]
+            except sqlite3.Error:
+                plan = None
+        log.record({
+            "time": datetime.now().isoformat(timespec="milliseconds"),
+            "db": conn.label,
+            "sql": sql if len(sql) <= SQL_PREVIEW else sql[:SQL_PREVIEW] + "...",
+            "elapsed_ms": round(elapsed_ms, 3),
+            "rows": pending["rows"],
+            "lock_wait_ms": round(pending["lock_wait"] * 1000, 3),
+            "error": error,
+            "plan": plan,
+        })
+
+    def execute(self, sql, parameters=()):
+        return self._run(super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        # 잠금 대기 후 다시 실행할 수 있도록 파라미터를 목록으로 받아 둡니다.
+        return self._run(super().executemany, sql, list(seq_of_parameters), many=True)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(started, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(started, len(rows), len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(started, len(rows), True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(started, 0, True)
+            raise
+        self._fetched(started, 1, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """InstrumentedCursor 로 문장을 실행하는 연결 (db_manager.open_connection 이 사용)"""
+
+    query_log = QUERY_LOG
+    label = ""
+    busy_timeout_ms = 5000
+    wal = False  # open_connection 이 journal_mode 결과로 설정합니다.
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
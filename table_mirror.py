@@ -0,0 +1,121 @@
+"""
+data.db 테이블의 로컬 사본 (전처리용).
+
+전처리는 실행마다 테이블 전체를 다시 읽는 대신, 지난 실행에서 저장한 사본에
+db_manager.pull_changes 로 받은 변경분(추가/수정/삭제 행)만 적용합니다.
+사본은 CACHE_DIR/db_<테이블>.pkl 에 {"version": 변경 로그 버전, "frame": rowid 인덱스 DataFrame} 으로 저장합니다.
+다음 경우에는 테이블 전체를 다시 읽고 사본을 새로 만듭니다.
+  - reuse=False (전체 실행) 또는 사본이 없거나 읽을 수 없음
+  - pull_changes 가 reload 로 알려 준 테이블 (트리거 없음/재설치, 로그 정리)
+  - 테이블 컬럼이 바뀌었거나, 변경분을 적용한 행 수가 테이블 행 수와 다름
+versions 에는 이번 실행에서 읽은 테이블별 저장된 사본의 버전이 남습니다. 그 이하의 로그는 다음 실행에 필요 없으므로
+전처리가 실행 후 테이블별로 정리합니다 (전처리.prune_db_change_log).
+"""
+import os
+import pickle
+
+import pandas as pd
+
+from build_cache import CACHE_DIR
+from db_manager import (ROWID_COLUMN, change_log_version, date_range_params, parse_dates, pull_changes,
+                        read_snapshot)
+
+
+class TableMirror:
+    """테이블 사본 저장소. reuse=True 이면 저장된 사본에 변경분을 적용하고, False 이면 항상 전체를 읽습니다."""
+
+    def __init__(self, cache_dir=CACHE_DIR, reuse=True):
+        self.cache_dir = cache_dir
+        self.reuse = reuse
+        self.versions = {}  # 이번 실행에서 읽은 테이블 -> 저장된 사본의 변경 로그 버전
+
+    def _path(self, table):
+        return os.path.join(self.cache_dir, f"db_{table}.pkl")
+
+    def _read_saved(self, table):
+        try:
+            with open(self._path(table), "rb") as f:
+                saved = pickle.load(f)
+            return saved if isinstance(saved, dict) and "frame" in saved else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"테이블 사본 '{table}' 로드 실패, 전체를 다시 읽습니다: {e}")
+            return None
+
+    def _save(self, table, version, frame):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_path = f"{self._path(table)}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                pickle.dump({"version": version, "frame": frame}, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(table))
+            self.versions[table] = version
+        except Exception as e:
+            print(f"테이블 사본 '{table}' 저장 중 오류: {e}")
+
+    @staticmethod
+    def _full_read(conn, table):
+        return pd.read_sql_query(
+            f"SELECT rowid AS {ROWID_COLUMN}, * FROM \"{table}\" ORDER BY rowid", conn, index_col=ROWID_COLUMN
+        )
+
+    @staticmethod
+    def _apply(frame, changes):
+        """사본에 변경분을 적용한 새 DataFrame. 컬럼 구성이 다르면 None (전체를 다시 읽음)"""
+        upserted, deleted = changes["upserted"], changes["deleted"]
+        if list(upserted.columns) != list(frame.columns):
+            return None
+        frame = frame.drop(index=frame.index.intersection(upserted.index.union(pd.Index(deleted))))
+        if not upserted.empty:
+            frame = pd.concat([frame, upserted[frame.columns]]).sort_index().infer_objects()
+        return frame
+
+    def load(self, conn, table):
+        """
+        테이블 전체 행 (rowid 순서, 인덱스 _rowid). 날짜 등 값은 SQLite 에 저장된 그대로입니다.
+        버전 확인과 변경분/전체 조회는 한 읽기 트랜잭션 안에서 합니다.
+        """
+        saved = self._read_saved(table) if self.reuse else None
+        with read_snapshot(conn):
+            if saved is not None and saved["version"] is not None:
+                delta = pull_changes(conn, saved["version"], [table])
+                if table not in delta["reload"]:
+                    changes = delta["changes"][table]
+                    frame = self._apply(saved["frame"], changes)
+                    count = conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+                    if frame is not None and len(frame) == count:
+                        if not changes["upserted"].empty or changes["deleted"]:
+                            print(f"'{table}' 테이블 사본에 변경분을 적용했습니다 "
+                                  f"(추가/수정 {len(changes['upserted'])}행, 삭제 {len(changes['deleted'])}행).")
+                            self._save(table, delta["version"], frame)
+                        else:
+                            self.versions[table] = saved["version"]  # 바뀐 행이 없으면 사본을 다시 쓰지 않습니다.
+                        return frame
+            version = change_log_version(conn)
+            frame = self._full_read(conn, table)
+        self._save(table, version, frame)
+        return frame
+
+
+# --- 사본 조회 (db_manager.read_frame / read_aggregate(by="day") 와 같은 결과) ---
+def _in_range(frame, start_date, end_date):
+    if start_date is None and end_date is None:
+        return frame
+    start, end = date_range_params(start_date, end_date)
+    return frame[(frame["날짜"] >= start) & (frame["날짜"] < end)]
+
+
+def select_rows(frame, columns=None, start_date=None, end_date=None):
+    """컬럼 선택/날짜 범위 조회 (날짜순, 같은 날짜는 rowid 순). 날짜 컬럼은 datetime 으로 변환합니다."""
+    frame = _in_range(frame, start_date, end_date)
+    frame = frame.sort_values("날짜", kind="stable", na_position="first")
+    return parse_dates(frame[list(columns) if columns else list(frame.columns)].reset_index(drop=True))
+
+
+def daily_sum(frame, measures, start_date=None, end_date=None):
+    """날짜(일)별 합계. 날짜 컬럼은 datetime 입니다."""
+    frame = _in_range(frame, start_date, end_date)
+    day = frame["날짜"].str.slice(0, 10).rename("날짜")
+    totals = frame[list(measures)].groupby(day, sort=True).sum(min_count=1)
+    return parse_dates(totals.reset_index())
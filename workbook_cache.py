@@ -0,0 +1,134 @@
+import hashlib
+import json
+import os
+import pickle
+
+import pandas as pd
+
+CACHE_DIR = ".workbook_cache"
+MAX_CACHE_BYTES = 512 * 1024 * 1024  # 512MB
+
+# Parquet 왕복 후에도 값/타입이 그대로 유지되는 object 컬럼 유형
+_LOSSLESS_OBJECT_TYPES = ("string", "empty", "boolean", "integer", "floating", "date")
+
+_file_hash_memo = {}
+
+
+def file_content_hash(path):
+    """파일 내용 sha256. 같은 프로세스에서는 (경로, 크기, mtime)이 같으면 다시 계산하지 않습니다."""
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _file_hash_memo:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        _file_hash_memo[memo_key] = digest.hexdigest()
+    return _file_hash_memo[memo_key]
+
+
+def _cache_key(content_hash, key_args):
+    args = json.dumps(key_args, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(f"{content_hash}|{args}".encode("utf-8")).hexdigest()
+
+
+def _parquet_lossless(df):
+    """Parquet로 저장했다가 읽어도 동일한 프레임이 되는지 확인합니다."""
+    if not all(isinstance(c, str) for c in df.columns):
+        return False
+    for col in df.columns:
+        if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True) not in _LOSSLESS_OBJECT_TYPES:
+            return False
+    return True
+
+
+def _find_blob(key, cache_dir):
+    for ext in (".parquet", ".pkl"):
+        path = os.path.join(cache_dir, key + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _write_blob(df, key, cache_dir):
+    """파싱된 시트를 Parquet(불가능하면 pickle) 파일로 저장합니다."""
+    os.makedirs(cache_dir, exist_ok=True)
+    if _parquet_lossless(df):
+        path = os.path.join(cache_dir, key + ".parquet")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        df.to_parquet(tmp_path, index=True)
+    else:
+        path = os.path.join(cache_dir, key + ".pkl")
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+
+def evict(cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """캐시 크기가 max_bytes 를 넘으면 가장 오래 사용되지 않은 파일부터 삭제합니다 (LRU)."""
+    if not os.path.isdir(cache_dir):
+        return
+    entries = []
+    for name in os.listdir(cache_dir):
+        if name.endswith(".tmp"):
+            continue
+        path = os.path.join(cache_dir, name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except FileNotFoundError:
+            pass
+
+
+def cached_parse(path, key_args, parse, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+    """
+    parse() 결과(DataFrame)를 (파일 내용 해시, key_args) 기준으로 디스크에 캐시합니다.
+    key_args 에는 결과에 영향을 주는 인자(시트, 헤더, 읽을 컬럼 등)를 모두 넣어야 합니다.
+    """
+    key = _cache_key(file_content_hash(path), key_args)
+    blob = _find_blob(key, cache_dir)
+    if blob:
+        try:
+            df = pd.read_parquet(blob) if blob.endswith(".parquet") else pd.read_pickle(blob)
+            os.utime(blob)  # LRU 순서 갱신
+            return df
+        except Exception as e:
+            print(f"엑셀 캐시 읽기 실패, 다시 파싱합니다 ({path}): {e}")
+
+    df = parse()
+    try:
+        _write_blob(df, key, cache_dir)
+        evict(cache_dir, max_bytes)
+    except Exception as e:
+        print(f"엑셀 캐시 저장 중 오류 ({path}): {e}")
+    return df
+
+
+def read_excel_cached(path, sheet_name=0, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, **kwargs):
+    """
+    pd.read_excel 과 같은 인자로 시트를 읽되, 파싱 결과를 디스크에 캐시합니다.
+    캐시 키는 (파일 내용 해시, 시트, header/nrows/usecols 등 인자)이므로
+    파일 내용이 바뀌면 자동으로 다시 파싱합니다.
+    sheet_name 이 None/리스트(여러 시트)인 경우는 캐시하지 않습니다.
+    """
+    if sheet_name is None or isinstance(sheet_name, (list, tuple)):
+        return pd.read_excel(path, sheet_name=sheet_name, **kwargs)
+
+    return cached_parse(
+        path,
+        {"sheet_name": sheet_name, **kwargs},
+        lambda: pd.read_excel(path, sheet_name=sheet_name, **kwargs),
+        cache_dir=cache_dir,
+        max_bytes=max_bytes,
+    )
@@ -4,61 +4,22 @@ import pandas as pd
 from pandas.tseries.offsets import CustomBusinessDay
 import numpy as np
 import altair as alt
-import pickle
 import os
 import json
 import re
-import plotly.express as px
-from shapely.geometry import shape
-from shapely.ops import unary_union
 
 import sys
 from datetime import datetime, timedelta, date
 import pytz
 
-# 별도 뷰어 모듈 임포트
-from polestar_viewer import show_polestar_viewer
-from map_viewer import show_map_viewer, apply_counts_to_map_optimized
-from car_region_dashboard import show_car_region_dashboard
-import ev_캘린더 as ev_cal # 캘린더 모듈 임포트
+from data_access import dataset_version, get_artifacts, get_frame, get_quarterly_counts, get_update_time
+from daily_rollup import rollup_from_data
+from retail_summary import calculate_retail_summary, calculate_retail_monthly_summary
 
+# 별도 뷰어 모듈(폴스타/지도/분석, 캘린더)은 해당 뷰어를 선택했을 때 임포트합니다.
+# '내부' 리포트 첫 화면이 plotly, 지도(geometry) 모듈 로딩을 기다리지 않도록 하기 위함입니다.
+# 임포트 소요 시간은 benchmarks/import_report.py 로 확인할 수 있습니다.
 
-# 기존 import 섹션 뒤에 추가
-@st.cache_data(ttl=7200)  # 2시간 캐시
-def preload_map_data():
-    """애플리케이션 시작 시 지도 데이터를 미리 로드합니다."""
-    try:
-        # 1. 전처리된 지도 파일 로드
-        if os.path.exists('preprocessed_map.geojson'):
-            with open('preprocessed_map.geojson', 'r', encoding='utf-8') as f:
-                preprocessed_map = json.load(f)
-        else:
-            return None, {}
-        
-        # 2. 분기별 데이터 모두 미리 처리
-        quarter_options = ['전체', '1Q', '2Q', '3Q']
-        preloaded_maps = {}
-        
-        for quarter in quarter_options:
-            # 분기별 지역 카운트 가져오기
-            quarterly_counts = st.session_state.quarterly_counts
-            region_counts = quarterly_counts.get(quarter, {})
-            
-            # 지도에 데이터 적용
-            final_geojson, unmatched_df = apply_counts_to_map_optimized(
-                preprocessed_map, region_counts
-            )
-            
-            preloaded_maps[quarter] = {
-                'geojson': final_geojson,
-                'unmatched': unmatched_df
-            }
-        
-        return preprocessed_map, preloaded_maps
-        
-    except Exception as e:
-        st.error(f"지도 사전 로딩 중 오류: {e}")
-        return None, {}
 
 # --- 페이지 설정 및 기본 스타일 ---
 st.set_page_config(layout="wide")
@@ -101,15 +62,23 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # --- 데이터 및 메모 로딩 함수 ---
-@st.cache_data(ttl=3600)
+# data_access 가 프로세스당 한 번만 로드해 모든 세션이 공유하므로 별도 캐시를 두지 않습니다.
 def load_data():
-    """전처리된 데이터 파일을 로드합니다."""
+    """
+    전처리된 데이터 아티팩트를 로드합니다. (데이터셋은 처음 접근할 때 로드)
+    DataFrame 은 메모리 맵한 Arrow IPC 파일을 가리키는 읽기 전용 프레임으로, 숫자/날짜 컬럼은 모든 세션과 서버 프로세스가 공유합니다.
+    """
     try:
-        with open("preprocessed_data.pkl", "rb") as f:
-            return pickle.load(f)
+        return get_artifacts()
     except FileNotFoundError:
         st.error("전처리된 데이터 파일(preprocessed_data.pkl)을 찾을 수 없습니다.")
         st.info("먼저 '전처리.py'를 실행하여 데이터 파일을 생성해주세요.")
+        st.stop()
+
+@st.cache_resource(max_entries=1)
+def load_daily_rollup(version):
+    """리테일 요약용 일별 집계표(누적합 조회 도우미)를 로드합니다. version 이 바뀔 때만 다시 만듭니다."""
+    return rollup_from_data(load_data())
 
 def get_base_city_name(sggnm_str):
     """
@@ -129,6 +98,9 @@ def load_and_process_data(region_counts, geojson_path):
     df_6 데이터를 GeoJSON과 매칭하고, 3가지 케이스에 맞춰
     GeoJSON의 경계를 동적으로 병합하여 최종 지도 데이터를 생성합니다.
     """
+    from shapely.geometry import shape
+    from shapely.ops import unary_union
+
     try:
         # 1. GeoJSON 파일 로드
         with open(geojson_path, 'r', encoding='utf-8') as f:
@@ -258,27 +230,25 @@ def save_memo_file(path:str, content:str):
 
 # --- 데이터 로딩 ---
 data = load_data()
-df = data["df"]
-df_1 = data["df_1"]
-df_2 = data["df_2"]
-df_3 = data["df_3"]
-df_4 = data["df_4"]
-df_5 = data["df_5"]
-df_sales = data["df_sales"]
-df_fail_q3 = data["df_fail_q3"]
-df_2_fail_q3 = data["df_2_fail_q3"]
-update_time_str = data["update_time_str"]
-df_master = data.get("df_master", pd.DataFrame())  # 지자체 정리 master.xlsx 데이터
-df_6 = data.get("df_6", pd.DataFrame())  # 지역구분 데이터
-df_tesla_ev = data["df_tesla_ev"]
-preprocessed_map_geojson = data["preprocessed_map_geojson"]
+df = get_frame("df")
+df_1 = get_frame("df_1")
+df_2 = get_frame("df_2")
+df_3 = get_frame("df_3")
+df_4 = get_frame("df_4")
+df_5 = get_frame("df_5")
+df_sales = get_frame("df_sales")
+df_fail_q3 = get_frame("df_fail_q3")
+df_2_fail_q3 = get_frame("df_2_fail_q3")
+update_time_str = get_update_time()
+df_master = get_frame("df_master")  # 지자체 정리 master.xlsx 데이터
+df_6 = get_frame("df_6")  # 지역구분 데이터
+df_tesla_ev = get_frame("df_tesla_ev")
+daily_rollup = load_daily_rollup(dataset_version("daily_rollup"))
 
 def load_quarterly_counts():
-    """분기별 카운트 데이터만 별도로 로드"""
+    """분기별 카운트 데이터 (공유 아티팩트의 dict 를 그대로 반환하므로 세션별 복사본이 생기지 않습니다)"""
     try:
-        with open("preprocessed_data.pkl", "rb") as f:
-            data = pickle.load(f)
-        return data.get("quarterly_region_counts", {})
+        return get_quarterly_counts()
     except:
         return {}
 
@@ -296,111 +266,11 @@ def preprocess_sales_data(df_sales):
     sales_by_month = df_sales.set_index('월')['대수'].to_dict()
     return sales_by_month
 
-def calculate_retail_summary(view_option, start_date, end_date, day0, day1, q3_start_default, q3_start_distribute, df_1, df_2, df_5, df_fail_q3, df_2_fail_q3):
-    """
-    리테일 현황 요약 데이터를 계산하여 DataFrame으로 반환합니다.
-    """
-    is_period_view = view_option == '기간별 조회'
-
-    # 날짜 컬럼 타입 보정 (함수 내에서 안전하게 처리)
-    for df in [df_fail_q3, df_2_fail_q3]:
-        if '날짜' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['날짜']):
-            df['날짜'] = pd.to_datetime(df['날짜'], errors='coerce')
-
-    if is_period_view:
-        # 기간별 조회: 선택한 기간의 합계와 누적 총계만 표시
-        cnt_period_mail = ((df_5['날짜'].dt.date >= start_date) & (df_5['날짜'].dt.date <= end_date)).sum()
-        cnt_total_mail = ((df_5['날짜'].dt.date >= q3_start_default) & (df_5['날짜'].dt.date <= end_date)).sum()
-
-        cnt_period_apply = int(df_1.loc[(df_1['날짜'].dt.date >= start_date) & (df_1['날짜'].dt.date <= end_date), '개수'].sum())
-        cnt_total_apply = int(df_1.loc[(df_1['날짜'].dt.date >= q3_start_default) & (df_1['날짜'].dt.date <= end_date), '개수'].sum())
-
-        cnt_period_distribute = int(df_2.loc[(df_2['날짜'].dt.date >= start_date) & (df_2['날짜'].dt.date <= end_date), '배분'].sum())
-        cnt_total_distribute = int(df_2.loc[(df_2['날짜'].dt.date >= q3_start_distribute) & (df_2['날짜'].dt.date <= end_date), '배분'].sum())
-
-        cnt_period_request = int(df_2.loc[(df_2['날짜'].dt.date >= start_date) & (df_2['날짜'].dt.date <= end_date), '신청'].sum())
-        cnt_total_request = int(df_2.loc[(df_2['날짜'].dt.date >= q3_start_distribute) & (df_2['날짜'].dt.date <= end_date), '신청'].sum())
-
-        cnt_period_fail = int(((df_fail_q3['날짜'].dt.date >= start_date) & (df_fail_q3['날짜'].dt.date <= end_date)).sum())
-        cnt_total_fail = int(((df_fail_q3['날짜'].dt.date >= q3_start_default) & (df_fail_q3['날짜'].dt.date <= end_date)).sum())
-
-        cnt_period_fail_2 = int(df_2_fail_q3.loc[(df_2_fail_q3['날짜'].dt.date >= start_date) & (df_2_fail_q3['날짜'].dt.date <= end_date), '미신청건'].sum())
-        cnt_total_fail_2 = int(df_2_fail_q3.loc[(df_2_fail_q3['날짜'].dt.date >= q3_start_default) & (df_2_fail_q3['날짜'].dt.date <= end_date), '미신청건'].sum())
-
-        table_data = pd.DataFrame({
-            ('지원', '파이프라인', '메일 건수'): [cnt_period_mail, cnt_total_mail],
-            ('지원', '신청', '신청 건수'): [cnt_period_apply, cnt_total_apply],
-            ('지원', '신청', '미신청건'): [cnt_period_fail, cnt_total_fail],
-            ('지급', '지급 처리', '지급 배분건'): [cnt_period_distribute, cnt_total_distribute],
-            ('지급', '지급 처리', '지급신청 건수'): [cnt_period_request, cnt_total_request],
-            ('지급', '지급 처리', '미신청건'): [cnt_period_fail_2, cnt_total_fail_2]
-        }, index=['선택기간', '누적 총계 (3분기)'])
-
-    else:
-        # 기존 로직: 금일/전일/누적 표시
-        cnt_today_mail = (df_5['날짜'].dt.date == day0).sum()
-        cnt_yesterday_mail = (df_5['날짜'].dt.date == day1).sum()
-        cnt_total_mail = ((df_5['날짜'].dt.date >= q3_start_default) & (df_5['날짜'].dt.date <= day0)).sum()
-
-        cnt_today_apply = int(df_1.loc[df_1['날짜'].dt.date == day0, '개수'].sum())
-        cnt_yesterday_apply = int(df_1.loc[df_1['날짜'].dt.date == day1, '개수'].sum())
-        cnt_total_apply = int(df_1.loc[(df_1['날짜'].dt.date >= q3_start_default) & (df_1['날짜'].dt.date <= day0), '개수'].sum())
-
-        cnt_today_distribute = int(df_2.loc[df_2['날짜'].dt.date == day0, '배분'].sum())
-        cnt_yesterday_distribute = int(df_2.loc[df_2['날짜'].dt.date == day1, '배분'].sum())
-        cnt_total_distribute = int(df_2.loc[(df_2['날짜'].dt.date >= q3_start_distribute) & (df_2['날짜'].dt.date <= day0), '배분'].sum())
-
-        cnt_today_request = int(df_2.loc[df_2['날짜'].dt.date == day0, '신청'].sum())
-        cnt_yesterday_request = int(df_2.loc[df_2['날짜'].dt.date == day1, '신청'].sum())
-        cnt_total_request = int(df_2.loc[(df_2['날짜'].dt.date >= q3_start_distribute) & (df_2['날짜'].dt.date <= day0), '신청'].sum())
-
-        cnt_yesterday_fail = int((df_fail_q3['날짜'].dt.date == day1).sum())
-        cnt_today_fail = int((df_fail_q3['날짜'].dt.date == day0).sum())
-        cnt_total_fail = int(((df_fail_q3['날짜'].dt.date >= q3_start_default) & (df_fail_q3['날짜'].dt.date <= day0)).sum())
-
-        cnt_yesterday_fail_2 = int(df_2_fail_q3.loc[df_2_fail_q3['날짜'].dt.date == day1, '미신청건'].sum())
-        cnt_today_fail_2 = int(df_2_fail_q3.loc[df_2_fail_q3['날짜'].dt.date == day0, '미신청건'].sum())
-        cnt_total_fail_2 = int(df_2_fail_q3.loc[(df_2_fail_q3['날짜'].dt.date >= q3_start_default) & (df_2_fail_q3['날짜'].dt.date <= day0), '미신청건'].sum())
-
-        delta_mail = cnt_today_mail - cnt_yesterday_mail
-        delta_apply = cnt_today_apply - cnt_yesterday_apply
-        delta_fail = cnt_today_fail - cnt_yesterday_fail
-        delta_distribute = cnt_today_distribute - cnt_yesterday_distribute
-        delta_request = cnt_today_request - cnt_yesterday_request
-        delta_fail_2 = cnt_today_fail_2 - cnt_yesterday_fail_2
-
-        def format_delta(value):
-            if value > 0: return f'<span style="color:blue;">+{value}</span>'
-            elif value < 0: return f'<span style="color:red;">{value}</span>'
-            return str(value)
-
-        table_data = pd.DataFrame({
-            ('지원', '파이프라인', '메일 건수'): [cnt_yesterday_mail, cnt_today_mail, cnt_total_mail],
-            ('지원', '신청', '신청 건수'): [cnt_yesterday_apply, cnt_today_apply, cnt_total_apply],
-            ('지원', '신청', '미신청건'): [cnt_yesterday_fail, cnt_today_fail, cnt_total_fail],
-            ('지급', '지급 처리', '지급 배분건'): [cnt_yesterday_distribute, cnt_today_distribute, cnt_total_distribute],
-            ('지급', '지급 처리', '지급신청 건수'): [cnt_yesterday_request, cnt_today_request, cnt_total_request],
-            ('지급', '지급 처리', '미신청건'): [cnt_yesterday_fail_2, cnt_today_fail_2, cnt_total_fail_2]
-        }, index=[f'전일 ({day1})', f'금일 ({day0})', '누적 총계 (3분기)'])
-
-        table_data.loc['변동'] = [
-            format_delta(delta_mail), format_delta(delta_apply), format_delta(delta_fail),
-            format_delta(delta_distribute), format_delta(delta_request), format_delta(delta_fail_2)
-        ]
-
-    return table_data
 
+# 세션 상태에는 공유 객체의 참조만 저장합니다 (세션별 데이터 복사본 없음).
+# 매 실행마다 다시 대입하므로 새 빌드가 들어오면 열려 있는 세션에도 바로 반영됩니다.
+st.session_state.quarterly_counts = load_quarterly_counts()
 
-if 'quarterly_counts' not in st.session_state:
-    st.session_state.quarterly_counts = load_quarterly_counts()
-
-# 지도 데이터 사전 로딩
-if 'map_preloaded' not in st.session_state:
-    with st.spinner('🗺️ 지도 데이터를 준비하는 중입니다...'):
-        preprocessed_map, preloaded_maps = preload_map_data()
-        st.session_state.map_preprocessed = preprocessed_map
-        st.session_state.map_preloaded_data = preloaded_maps
-        st.session_state.map_preloaded = True
 
 
 # --- 시간대 설정 ---
@@ -420,14 +290,6 @@ cbd = CustomBusinessDay(weekmask='Mon Tue Wed Thu Fri', holidays=pd.to_datetime(
 
 # --- 사이드바: 조회 옵션 설정 ---
 with st.sidebar:
-    if hasattr(st.session_state, 'map_preloaded') and st.session_state.map_preloaded:
-        st.success("✅ 지도 준비 완료")
-        if hasattr(st.session_state, 'map_preloaded_data'):
-            quarters_ready = len(st.session_state.map_preloaded_data)
-    else:
-        st.warning("⏳ 지도 준비 중...")
-
-
     st.header("👁️ 뷰어 옵션")
     viewer_option = st.radio("뷰어 유형을 선택하세요.", ('내부', '테슬라', '폴스타', '지도', '분석'), key="viewer_option")
     st.markdown("---")
@@ -654,391 +516,6 @@ def format_special_memos(df_notes, year):
         
     return "<br>".join(html_parts)
 
-def calculate_retail_monthly_summary(period_option, viewer_option, day0, df_1, df_2, df_5, sales_data):
-    """
-    기간 옵션에 따라 리테일 월별 요약 HTML 테이블을 생성하고 스타일을 적용합니다.
-    """
-    # 날짜 변수 정의
-    current_year = day0.year
-    june_23 = datetime(current_year, 6, 23).date()
-    june_24 = datetime(current_year, 6, 24).date()
-    july_1 = datetime(current_year, 7, 1).date()
-    july_31 = datetime(current_year, 7, 31).date()
-    august_1 = datetime(current_year, 8, 1).date()
-    september_1 = datetime(current_year, 9, 1).date()
-
-    retail_df = pd.DataFrame() # 초기화
-    html_retail = ""
-
-    # ----- 기간별 필터링 함수 (내부 함수) -----
-    def filter_by_period(df):
-        if period_option == '3Q' or period_option in ('3분기'):
-            return df[df['분기'] == '3분기']
-        if period_option == '2Q' or period_option in ('2분기'):
-            return df[df['분기'] == '2분기']
-        if period_option == '1Q' or period_option in ('1분기'):
-            return df[df['분기'] == '1분기']
-        if period_option.endswith('월'):
-            try:
-                month_num = int(period_option[:-1])
-                return df[df['날짜'].dt.month == month_num]
-            except ValueError:
-                return df
-        return df
-
-    # --- 계산 로직 시작 ---
-    if period_option == '전체':
-        # ... (이전과 동일한 '전체' 옵션 계산 로직) ...
-        monthly_data = {}
-        for month in range(1, 10):
-            mail_count = apply_count = distribute_count = 0
-            if month in [1, 2, 3]:
-                mail_count = int(df_5[df_5['날짜'].dt.month == month].shape[0])
-                apply_count = int(df_1[df_1['날짜'].dt.month == month]['개수'].sum())
-                distribute_count = int(df_2[df_2['날짜'].dt.month == month]['배분'].sum())
-            elif month in [4, 5]:
-                mail_count = int(df_5[df_5['날짜'].dt.month == month].shape[0])
-                apply_count = int(df_1[df_1['날짜'].dt.month == month]['개수'].sum())
-                distribute_count = int(df_2[df_2['날짜'].dt.month == month]['배분'].sum())
-            elif month == 6:
-                mail_count = int(df_5[(df_5['날짜'].dt.month == 6) & (df_5['날짜'].dt.date <= june_23)].shape[0])
-                apply_count = int(df_1[(df_1['날짜'].dt.month == 6) & (df_1['날짜'].dt.date <= june_23)]['개수'].sum())
-                distribute_count = int(df_2[df_2['날짜'].dt.month == month]['배분'].sum())
-            elif month == 7:
-                mail_count = int(df_5[(df_5['날짜'].dt.date >= june_24) & (df_5['날짜'].dt.date <= july_31)].shape[0])
-                apply_count = int(df_1[(df_1['날짜'].dt.date >= june_24) & (df_1['날짜'].dt.date <= july_31)]['개수'].sum())
-                distribute_count = int(df_2[(df_2['날짜'].dt.date >= july_1) & (df_2['날짜'].dt.date <= july_31)]['배분'].sum())
-            elif month == 8:
-                mail_count = int(df_5[(df_5['날짜'].dt.date >= august_1) & (df_5['날짜'].dt.date <= day0)].shape[0])
-                apply_count = int(df_1[(df_1['날짜'].dt.date >= august_1) & (df_1['날짜'].dt.date <= day0)]['개수'].sum())
-                distribute_count = int(df_2[(df_2['날짜'].dt.date >= august_1) & (df_2['날짜'].dt.date <= day0)]['배분'].sum())
-            elif month == 9:
-                mail_count = int(df_5[(df_5['날짜'].dt.date >= september_1) & (df_5['날짜'].dt.date <= day0)].shape[0])
-                apply_count = int(df_1[(df_1['날짜'].dt.month == 9) & (df_1['날짜'].dt.date <= day0)]['개수'].sum())
-                distribute_count = int(df_2[(df_2['날짜'].dt.month == 9) & (df_2['날짜'].dt.date <= day0)]['배분'].sum())
-            
-            sales_count = sales_data.get(month, 0)
-            pipe_sales_ratio = f"{(mail_count / sales_count * 100):.1f}" if sales_count > 0 else "0.0"
-            monthly_data[month] = {'파이프라인': mail_count, '지원신청완료': apply_count, '취소': 0, '지급신청': distribute_count, '판매현황': sales_count, 'Pipe/판매(%)': pipe_sales_ratio}
-
-        q_totals = {}
-        for q in [1, 2, 3]:
-            q_months = range((q-1)*3 + 1, q*3 + 1)
-            
-            q_pipeline = sum(monthly_data[m]['파이프라인'] for m in q_months)
-            q_sales = sum(monthly_data[m]['판매현황'] for m in q_months)
-            q_ratio = f"{(q_pipeline / q_sales * 100):.1f}" if q_sales > 0 else "0.0"
-
-            q_totals[q] = {
-                '파이프라인': q_pipeline,
-                '지원신청완료': sum(monthly_data[m]['지원신청완료'] for m in q_months),
-                '취소': sum(monthly_data[m]['취소'] for m in q_months),
-                '지급신청': sum(monthly_data[m]['지급신청'] for m in q_months),
-                '판매현황': q_sales,
-                'Pipe/판매(%)': q_ratio
-            }
-        q_totals[3]['취소'] = 500
-        # '총계' 계산
-        total_all = {
-            key: sum(q_totals[q][key] for q in [1,2,3]) 
-            for key in ['파이프라인', '지원신청완료', '취소', '지급신청', '판매현황']
-        }
-        
-        total_pipeline = total_all['파이프라인']
-        total_sales = total_all['판매현황']
-        total_ratio = f"{(total_pipeline / total_sales * 100):.1f}" if total_sales > 0 else "0.0"
-        total_all['Pipe/판매(%)'] = total_ratio
-        
-        q1_target, q2_target, q3_target = 4300, 10000, 10000
-        q_targets = {1: q1_target, 2: q2_target, 3: q3_target}
-        q_progress = {q: q_totals[q]['파이프라인'] / q_targets[q] if q_targets[q] > 0 else 0 for q in [1,2,3]}
-        
-        html_retail = '<table class="custom_table" border="0"><thead><tr>'
-        html_retail += '<th rowspan="2" style="background-color: #f7f7f9;">항목</th>'
-        for q in [1, 2, 3]:
-            html_retail += f'<th colspan="4" style="background-color: #ffe0b2;">Q{q}</th>'
-        html_retail += '<th rowspan="2" style="background-color: #c7ceea;">총계</th></tr><tr>'
-        for q in [1, 2, 3]:
-            for month in range((q-1)*3 + 1, q*3 + 1):
-                html_retail += f'<th style="background-color: #fff2cc;">{month}월</th>'
-            html_retail += '<th style="background-color: #ffe0b2;">계</th>'
-        html_retail += '</tr></thead><tbody>'
-        html_retail += '<tr><th style="background-color: #f7f7f9;">타겟 (진척률)</th>'
-        for q in [1, 2, 3]:
-            html_retail += f'<td colspan="4" style="background-color:#e0f7fa;">{q_targets[q]} ({q_progress[q]:.1%})</td>'
-        html_retail += f'<td style="background-color:#e6e8f0;">{sum(q_targets.values())}</td></tr>'
-        rows = ['파이프라인', '지원신청완료', '취소', '지급신청']
-        if viewer_option == '내부':
-            rows.extend(['판매현황', 'Pipe/판매(%)'])
-        for i, row_name in enumerate(rows):
-            html_retail += f'<tr style="background-color: #fafafa;">' if (i+1) % 2 == 1 else '<tr>'
-            if row_name == '판매현황' or row_name == 'Pipe/판매(%)':
-                html_retail += f'<th style="background-color: #d4edda; color: #155724;">{row_name}</th>'
-            else:
-                html_retail += f'<th style="background-color: #f7f7f9;">{row_name}</th>'
-            for q in [1, 2, 3]:
-                for month in range((q-1)*3 + 1, q*3 + 1):
-                    html_retail += f'<td>{monthly_data[month][row_name]}</td>'
-                html_retail += f'<td style="background-color: #fff2e6;">{q_totals[q][row_name]}</td>'
-            html_retail += f'<td style="background-color: #e6e8f0;">{total_all[row_name]}</td></tr>'
-        html_retail += '</tbody></table>'
-
-    elif period_option == '1Q' or period_option == '1분기':
-        # Q1 데이터 계산 (1, 2, 3월)
-        q1_monthly_data = {}
-        for month in [1, 2, 3]:
-            month_mail = int(df_5[df_5['날짜'].dt.month == month].shape[0])
-            month_apply = int(df_1[df_1['날짜'].dt.month == month]['개수'].sum())
-            month_distribute = int(df_2[df_2['날짜'].dt.month == month]['배분'].sum())
-            month_sales = sales_data.get(month, 0)
-            # month_ratio = f"{(month_mail / month_sales * 100):.1f}%" if month_sales > 0 else "0.0%"
-            q1_monthly_data[f'{month}'] = [month_mail, month_apply, month_distribute, month_sales] #, month_ratio]
-        
-        # Q1 합계 계산
-        q1_total_mail = sum(q1_monthly_data[f'{m}'][0] for m in [1, 2, 3])
-        q1_total_apply = sum(q1_monthly_data[f'{m}'][1] for m in [1, 2, 3])
-        q1_total_distribute = sum(q1_monthly_data[f'{m}'][2] for m in [1, 2, 3])
-        q1_total_sales = sum(q1_monthly_data[f'{m}'][3] for m in [1, 2, 3])
-        # q1_total_ratio = f"{(q1_total_mail / q1_total_sales * 100):.1f}%" if q1_total_sales > 0 else "0.0%"
-
-        # 타겟 설정
-        q1_target = 4300
-        
-        # 진척률 계산
-        q1_progress_rate = q1_total_mail / q1_target if q1_target > 0 else 0
-        
-        retail_df_data = {
-            '1': ['', q1_monthly_data['1'][0], q1_monthly_data['1'][1], '', q1_monthly_data['1'][2]],
-            '2': ['', q1_monthly_data['2'][0], q1_monthly_data['2'][1], '', q1_monthly_data['2'][2]],
-            '3': ['', q1_monthly_data['3'][0], q1_monthly_data['3'][1], '', q1_monthly_data['3'][2]],
-            '계': ['', q1_total_mail, q1_total_apply, '', q1_total_distribute]
-        }
-        retail_index = ['타겟 (진척률)', '파이프라인', '지원신청완료', '취소', '지급신청']
-        if viewer_option == '내부':
-            retail_index.extend(['판매현황']) #, '비율'])
-            retail_df_data['1'].extend([q1_monthly_data['1'][3]]) #, q1_monthly_data['1'][4]])
-            retail_df_data['2'].extend([q1_monthly_data['2'][3]]) #, q1_monthly_data['2'][4]])
-            retail_df_data['3'].extend([q1_monthly_data['3'][3]]) #, q1_monthly_data['3'][4]])
-            retail_df_data['계'].extend([q1_total_sales]) #, q1_total_ratio])
-        retail_df = pd.DataFrame(retail_df_data, index=retail_index)
-        
-    elif period_option == '2Q' or period_option == '2분기':
-        # Q2 데이터 계산 (4, 5, 6월) - 6월은 6월 23일까지
-        q2_monthly_data = {}
-        
-        # 6월 23일 날짜 객체 생성 (현재 연도 기준)
-        current_year = datetime.now().year
-        june_23 = datetime(current_year, 6, 23).date()
-        
-        for month in [4, 5, 6]:
-            month_mail = int(df_5[df_5['날짜'].dt.month == month].shape[0])
-            
-            # 6월의 경우 6월 23일까지의 데이터만 포함
-            if month == 6:
-                month_apply = int(df_1[
-                    (df_1['날짜'].dt.month == 6) & 
-                    (df_1['날짜'].dt.date <= june_23)
-                ]['개수'].sum())
-            else:
-                month_apply = int(df_1[df_1['날짜'].dt.month == month]['개수'].sum())
-            
-            month_distribute = int(df_2[df_2['날짜'].dt.month == month]['배분'].sum())
-            month_sales = sales_data.get(month, 0)
-            # month_ratio = f"{(month_mail / month_sales * 100):.1f}%" if month_sales > 0 else "0.0%"
-            q2_monthly_data[f'{month}'] = [month_mail, month_apply, month_distribute, month_sales] #, month_ratio]
-        
-        # Q2 합계 계산
-        q2_total_mail = sum(q2_monthly_data[f'{m}'][0] for m in [4, 5, 6])
-        q2_total_apply = sum(q2_monthly_data[f'{m}'][1] for m in [4, 5, 6])
-        q2_total_distribute = sum(q2_monthly_data[f'{m}'][2] for m in [4, 5, 6])
-        q2_total_sales = sum(q2_monthly_data[f'{m}'][3] for m in [4, 5, 6])
-        # q2_total_ratio = f"{(q2_total_mail / q2_total_sales * 100):.1f}%" if q2_total_sales > 0 else "0.0%"
-        
-        # 타겟 설정
-        q2_target = 10000
-        
-        # 진척률 계산
-        q2_progress_rate = q2_total_mail / q2_target if q2_target > 0 else 0
-        
-        # 데이터프레임 생성
-        retail_df_data = {
-            '4': ['', q2_monthly_data['4'][0], q2_monthly_data['4'][1], '', q2_monthly_data['4'][2]],
-            '5': ['', q2_monthly_data['5'][0], q2_monthly_data['5'][1], '', q2_monthly_data['5'][2]],
-            '6': ['', q2_monthly_data['6'][0], q2_monthly_data['6'][1], '', q2_monthly_data['6'][2]],
-            '계': ['', q2_total_mail, q2_total_apply, '', q2_total_distribute]
-        }
-        retail_index = ['타겟 (진척률)', '파이프라인', '지원신청완료', '취소', '지급신청']
-        if viewer_option == '내부':
-            retail_index.extend(['판매현황']) #, '비율'])
-            retail_df_data['4'].extend([q2_monthly_data['4'][3]]) #, q2_monthly_data['4'][4]])
-            retail_df_data['5'].extend([q2_monthly_data['5'][3]]) #, q2_monthly_data['5'][4]])
-            retail_df_data['6'].extend([q2_monthly_data['6'][3]]) #, q2_monthly_data['6'][4]])
-            retail_df_data['계'].extend([q2_total_sales]) #, q2_total_ratio])
-        retail_df = pd.DataFrame(retail_df_data, index=retail_index)
-    
-    elif period_option in ('3Q', '3분기'):
-        # --- 3Q 월별 데이터 계산 (수정된 로직) ---
-        q3_monthly_data = {}
-        
-        # 7월 데이터 (전체 월)
-        q3_monthly_data['7'] = [
-            int(df_5[(df_5['날짜'].dt.date >= june_24) & (df_5['날짜'].dt.date <= july_31)].shape[0]),
-            int(df_1[(df_1['날짜'].dt.date >= june_24) & (df_1['날짜'].dt.date <= july_31)]['개수'].sum()),
-            int(df_2[(df_2['날짜'].dt.date >= july_1) & (df_2['날짜'].dt.date <= july_31)]['배분'].sum()),
-            sales_data.get(7, 0)
-        ]
-        # q3_monthly_data['7'].append(f"{(q3_monthly_data['7'][0] / q3_monthly_data['7'][3] * 100):.1f}%" if q3_monthly_data['7'][3] > 0 else "0.0%")
-        
-        # 8월 데이터 (월초 ~ 현재)
-        q3_monthly_data['8'] = [
-            int(df_5[(df_5['날짜'].dt.date >= august_1) & (df_5['날짜'].dt.date <= day0)].shape[0]),
-            int(df_1[(df_1['날짜'].dt.date >= august_1) & (df_1['날짜'].dt.date <= day0)]['개수'].sum()),
-            int(df_2[(df_2['날짜'].dt.date >= august_1) & (df_2['날짜'].dt.date <= day0)]['배분'].sum()),
-            sales_data.get(8, 0)
-        ]
-        # q3_monthly_data['8'].append(f"{(q3_monthly_data['8'][0] / q3_monthly_data['8'][3] * 100):.1f}%" if q3_monthly_data['8'][3] > 0 else "0.0%")
-
-        # 9월 데이터 (월초 ~ 현재)
-        q3_monthly_data['9'] = [
-            int(df_5[(df_5['날짜'].dt.date >= september_1) & (df_5['날짜'].dt.date <= day0)].shape[0]),
-            int(df_1[(df_1['날짜'].dt.month.isin([9])) & (df_1['날짜'].dt.date <= day0)]['개수'].sum()),
-            int(df_2[(df_2['날짜'].dt.month.isin([9])) & (df_2['날짜'].dt.date <= day0)]['배분'].sum()),
-            sales_data.get(9, 0)
-        ]
-        # q3_monthly_data['9'].append(f"{(q3_monthly_data['9'][0] / q3_monthly_data['9'][3] * 100):.1f}%" if q3_monthly_data['9'][3] > 0 else "0.0%")
-
-        q3_total_mail = sum(q3_monthly_data[m][0] for m in ['7', '8', '9'])
-        q3_total_apply = sum(q3_monthly_data[m][1] for m in ['7', '8', '9'])
-        q3_total_distribute = sum(q3_monthly_data[m][2] for m in ['7', '8', '9'])
-        q3_total_sales = sum(q3_monthly_data[m][3] for m in ['7', '8', '9'])
-        # q3_total_ratio = f"{(q3_total_mail / q3_total_sales * 100):.1f}%" if q3_total_sales > 0 else "0.0%"
-
-        q3_target = 10000
-        q3_progress = q3_total_mail / q3_target if q3_target > 0 else 0
-        
-        retail_df_data = {
-            '7': ['', q3_monthly_data['7'][0], q3_monthly_data['7'][1], '', q3_monthly_data['7'][2]],
-            '8': ['', q3_monthly_data['8'][0], q3_monthly_data['8'][1], '', q3_monthly_data['8'][2]],
-            '9': ['', q3_monthly_data['9'][0], q3_monthly_data['9'][1], '', q3_monthly_data['9'][2]],
-            '계': ['', q3_total_mail, q3_total_apply, 500, q3_total_distribute]
-        }
-        retail_index = ['타겟 (진척률)', '파이프라인', '지원신청완료', '취소', '지급신청']
-        if viewer_option == '내부':
-            retail_index.extend(['판매현황']) #, '비율'])
-            retail_df_data['7'].extend([q3_monthly_data['7'][3]]) #, q3_monthly_data['7'][4]])
-            retail_df_data['8'].extend([q3_monthly_data['8'][3]]) #, q3_monthly_data['8'][4]])
-            retail_df_data['9'].extend([q3_monthly_data['9'][3]]) #, q3_monthly_data['9'][4]])
-            retail_df_data['계'].extend([q3_total_sales]) #, q3_total_ratio])
-        retail_df = pd.DataFrame(retail_df_data, index=retail_index)
-    
-    else:
-        # 기존 로직 유지 (다른 기간 선택 시)
-        df5_p = filter_by_period(df_5)
-        df1_p = filter_by_period(df_1)
-        df2_p = filter_by_period(df_2)
-        mail_total = int(df5_p.shape[0])
-        apply_total = int(df1_p['개수'].sum())
-        distribute_total = int(df2_p['배분'].sum())
-
-        try:
-            selected_month = int(period_option[:-1])
-            sales_total = sales_data.get(selected_month, 0)
-            # ratio_total = f"{(mail_total / sales_total * 100):.1f}%" if sales_total > 0 else "0.0%"
-        except (ValueError, TypeError):
-            selected_month = None
-            sales_total = ''
-            # ratio_total = ''
-
-        retail_df_data = {period_option: [mail_total, apply_total, distribute_total]}
-        retail_index = ['파이프라인', '신청', '지급신청']
-        if viewer_option == '내부':
-            retail_index.extend(['판매현황']) #, '비율'])
-            retail_df_data[period_option].extend([sales_total]) #, ratio_total])
-        retail_df = pd.DataFrame(retail_df_data, index=retail_index)
-
-
-    # --- HTML 변환 및 스타일링 ---
-    if period_option != '전체':
-        html_retail = retail_df.to_html(classes='custom_table', border=0, escape=False)
-        if viewer_option == '내부':
-                html_retail = html_retail.replace('<th>판매현황</th>', '<th style="background-color: #d4edda; color: #155724;">판매현황</th>')
-
-    # 이미지 형태에 맞는 스타일링 적용
-    if period_option in ['1Q', '1분기', '2Q', '2분기', '3Q', '3분기']:
-        # 타겟 값들에 배경색 적용
-        target_values = ['4300', '10000']
-        for target in target_values:
-            html_retail = html_retail.replace(f'<td>{target}</td>', f'<td style="background-color: #f0f0f0;">{target}</td>')
-        
-        import re
-        # 1Q/1분기에서 '타겟 (진척률)' 행을 병합하고 배경색 적용 (3분기 방식과 동일하게)
-        if period_option in ('1Q', '1분기'):
-            target_text = f"{q1_target} ({q1_progress_rate:.1%})"
-            html_retail = re.sub(
-                r'(<tr>\s*<th>타겟 \(진척률\)</th>)(.*?)(</tr>)',
-                lambda m: m.group(1) + 
-                            re.sub(
-                                r'<td([^>]*)>([^<]*)</td>\s*<td([^>]*)>([^<]*)</td>\s*<td([^>]*)>([^<]*)</td>\s*<td([^>]*)>([^<]*)</td>',
-                                f'<td\\1 colspan="4" style="background-color:#e0f7fa;">{target_text}</td>',
-                                m.group(2), count=1
-                            ) + 
-                            m.group(3),
-                html_retail,
-                flags=re.DOTALL
-            )
-
-        # 2Q/2분기에서 '타겟 (진척률)' 행을 병합하고 배경색 적용 (3분기 방식과 동일하게)
-        elif period_option in ('2Q', '2분기'):
-            target_text = f"{q2_target} ({q2_progress_rate:.1%})"
-            html_retail = re.sub(
-                r'(<tr>\s*<th>타겟 \(진척률\)</th>)(.*?)(</tr>)',
-                lambda m: m.group(1) + 
-                            re.sub(
-                                r'<td([^>]*)>([^<]*)</td>\s*<td([^>]*)>([^<]*)</td>\s*<td([^>]*)>([^<]*)</td>\s*<td([^>]*)>([^<]*)</td>',
-                                f'<td\\1 colspan="4" style="background-color:#e0f7fa;">{target_text}</td>',
-                                m.group(2), count=1
-                            ) + 
-                            m.group(3),
-                html_retail,
-                flags=re.DOTALL
-            )
-
-        # 3Q/3분기에서 '타겟 (진척률)' 행을 병합하고 배경색 적용
-        elif period_option in ('3Q', '3분기'):
-            target_text = f"{q3_target} ({q3_progress:.1%})"
-            html_retail = re.sub(
-                r'(<tr>\s*<th>타겟 \(진척률\)</th>)(.*?)(</tr>)',
-                lambda m: m.group(1) + 
-                            re.sub(
-                                r'<td([^>]*)>([^<]*)</td>\s*<td([^>]*)>([^<]*)</td>\s*<td([^>]*)>([^<]*)</td>\s*<td([^>]*)>([^<]*)</td>',
-                                f'<td\\1 colspan="4" style="background-color:#e0f7fa;">{target_text}</td>',
-                                m.group(2), count=1
-                            ) + 
-                            m.group(3),
-                html_retail,
-                flags=re.DOTALL
-            )
-        
-        # 빈 셀들을 공백으로 표시
-        html_retail = html_retail.replace('<td></td>', '<td style="background-color: #fafafa;">&nbsp;</td>')
-        
-        # "계" 컬럼 하이라이트 (개별 분기 선택 시)
-        html_retail = re.sub(
-            r'(<th[^>]*>계</th>)',
-            r'<th style="background-color: #ffe0b2;">계</th>',
-            html_retail
-        )
-        
-        # "계" 행의 데이터 셀들도 하이라이트
-        html_retail = re.sub(
-            r'(<tr>\s*<th>계</th>)(.*?)(</tr>)',
-            lambda m: m.group(1) + re.sub(r'<td([^>]*)>', r'<td\1 style="background-color:#ffe0b2;">', m.group(2)) + m.group(3),
-            html_retail,
-            flags=re.DOTALL
-        )
-            
-    return html_retail
-
 if viewer_option == '내부' or viewer_option == '테슬라':
 
     # --- 대시보드 표시 ---
@@ -1059,7 +536,7 @@ if viewer_option == '내부' or viewer_option == '테슬라':
         table_data = calculate_retail_summary(
             view_option, start_date, end_date, day0, day1,
             q3_start_default, q3_start_distribute,
-            df_1, df_2, df_5, df_fail_q3, df_2_fail_q3
+            daily_rollup
         )
 
         # 결과 표시
@@ -1189,6 +666,7 @@ if viewer_option == '내부' or viewer_option == '테슬라':
             # 3. 데이터 처리 및 캘린더 생성
             # 이제 캘린더는 내부적으로 date_key를 사용하여 스스로 상태를 관리함
             current_calendar_date = st.session_state[date_key]
+            import ev_캘린더 as ev_cal # 캘린더 모듈 ('내부' 리포트에서만 사용)
             number_data, tooltip_data = ev_cal.data_processing(df_fail_q3, current_calendar_date.year, current_calendar_date.month)
             
             ev_cal.create_mini_calendar(
@@ -1247,7 +725,7 @@ if viewer_option == '내부' or viewer_option == '테슬라':
 
         # 리팩토링된 함수를 호출하여 최종 HTML 생성
         final_html = calculate_retail_monthly_summary(
-            period_option, viewer_option, day0, df_1, df_2, df_5, sales_data
+            period_option, viewer_option, day0, daily_rollup, sales_data
         )
         
         # 결과 표시
@@ -1446,25 +924,15 @@ if viewer_option == '내부' or viewer_option == '테슬라':
                     if month == 6:
                         # 6월은 6월 23일까지만 집계
                         june_23 = datetime(selected_date.year, 6, 23).date()
-                        month_count = int(df_5[
-                            (df_5['날짜'].dt.year == selected_date.year) &
-                            (df_5['날짜'].dt.month == 6) &
-                            (df_5['날짜'].dt.date <= june_23)
-                        ].shape[0])
+                        month_count = daily_rollup.month_total('메일', selected_date.year, 6, until=june_23)
                     elif month == 7:
                         # 7월은 6월 24일부터 7월 31일까지 집계
                         june_24 = datetime(selected_date.year, 6, 24).date()
                         july_31 = datetime(selected_date.year, 7, 31).date()
-                        month_count = int(df_5[
-                            (df_5['날짜'].dt.date >= june_24) &
-                            (df_5['날짜'].dt.date <= july_31)
-                        ].shape[0])
+                        month_count = daily_rollup.total('메일', june_24, july_31)
                     else:
                         # 다른 월들은 전체 월 집계
-                        month_count = int(df_5[
-                            (df_5['날짜'].dt.year == selected_date.year) &
-                            (df_5['날짜'].dt.month == month)
-                        ].shape[0])
+                        month_count = daily_rollup.month_total('메일', selected_date.year, month)
                     
                     pipeline_counts[month] = month_count
 
@@ -1559,16 +1027,16 @@ if viewer_option == '내부' or viewer_option == '테슬라':
 
 # 폴스타 뷰 시작 부분
 if viewer_option == '폴스타':
+    from polestar_viewer import show_polestar_viewer
     show_polestar_viewer(data, today_kst)
 
 # --- 지도 뷰어 ---
 if viewer_option == '지도':
-    if hasattr(st.session_state, 'map_preloaded') and st.session_state.map_preloaded:
-        show_map_viewer(data, df_6, use_preloaded=True)
-    else:
-        st.warning("지도 데이터가 아직 준비되지 않았습니다.")
-        show_map_viewer(data, df_6, use_preloaded=False)
+    # 지도 레이어(지오메트리 + 분기별 값 테이블)는 전처리에서 준비되므로 세션별 사전 로딩이 없습니다.
+    from map_viewer import show_map_viewer
+    show_map_viewer(data, df_6)
 
 # --- 분석 뷰어 ---
 if viewer_option == '분석':
+    from car_region_dashboard import show_car_region_dashboard
     show_car_region_dashboard(data, today_kst)
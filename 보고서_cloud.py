@@ -11,6 +11,8 @@ from datetime import datetime, timedelta, date
 import pytz
 import os
 
+from cloud_profile import CLOUD_DATA_FILE, build_cloud_data
+
 # --- 페이지 설정 및 기본 스타일 ---
 st.set_page_config(
     page_title="전기차 보조금 현황 보고서",
@@ -88,13 +90,15 @@ st.markdown("""
 # --- 안전한 데이터 로딩 함수들 ---
 @st.cache_data(ttl=3600)
 def safe_load_data():
-    """안전하게 전처리된 데이터 파일을 로드합니다."""
+    """
+    안전하게 클라우드용 전처리 파일(preprocessed_cloud.pkl, 집계만 포함)을 로드합니다.
+    """
     try:
-        if os.path.exists("preprocessed_data.pkl"):
-            with open("preprocessed_data.pkl", "rb") as f:
+        if os.path.exists(CLOUD_DATA_FILE):
+            with open(CLOUD_DATA_FILE, "rb") as f:
                 return pickle.load(f)
         else:
-            st.warning("⚠️ preprocessed_data.pkl 파일을 찾을 수 없습니다.")
+            st.warning(f"⚠️ {CLOUD_DATA_FILE} 파일을 찾을 수 없습니다.")
             return create_empty_data_structure()
     except Exception as e:
         st.error(f"데이터 로드 중 오류: {e}")
@@ -102,24 +106,9 @@ def safe_load_data():
 
 def create_empty_data_structure():
     """빈 데이터 구조를 생성합니다."""
-    empty_df = pd.DataFrame()
-    return {
-        "df": empty_df,
-        "df_1": empty_df,
-        "df_2": empty_df,
-        "df_3": empty_df,
-        "df_4": empty_df,
-        "df_5": empty_df,
-        "df_sales": empty_df,
-        "df_fail_q3": empty_df,
-        "df_2_fail_q3": empty_df,
-        "update_time_str": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "df_master": empty_df,
-        "df_6": empty_df,
-        "df_tesla_ev": empty_df,
-        "preprocessed_map_geojson": None,
-        "quarterly_region_counts": {}
-    }
+    empty_data = build_cloud_data({})
+    empty_data["update_time_str"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return empty_data
 
 def safe_load_memo(filename="memo.txt"):
     """안전하게 메모를 로드합니다."""
@@ -147,13 +136,9 @@ df_2 = data.get("df_2", pd.DataFrame())
 df_3 = data.get("df_3", pd.DataFrame())
 df_4 = data.get("df_4", pd.DataFrame())
 df_5 = data.get("df_5", pd.DataFrame())
-df_sales = data.get("df_sales", pd.DataFrame())
-df_fail_q3 = data.get("df_fail_q3", pd.DataFrame())
-df_2_fail_q3 = data.get("df_2_fail_q3", pd.DataFrame())
-update_time_str = data.get("update_time_str", "데이터 없음")
-df_master = data.get("df_master", pd.DataFrame())
-df_6 = data.get("df_6", pd.DataFrame())
-df_tesla_ev = data.get("df_tesla_ev", pd.DataFrame())
+update_time_str = data.get("update_time_str") or "데이터 없음"
+region_counts = data.get("region_counts", pd.DataFrame())  # 지역구분별 신청 건수
+tesla_ev_summary = data.get("tesla_ev_summary", pd.DataFrame())  # 차종/신청유형별 건수
 
 # --- 시간대 설정 ---
 KST = pytz.timezone('Asia/Seoul')
@@ -171,7 +156,7 @@ if not data_status:
         <h3>🚫 데이터 파일을 찾을 수 없습니다</h3>
         <p>다음 파일들이 필요합니다:</p>
         <ul>
-            <li>preprocessed_data.pkl (주요 데이터)</li>
+            <li>preprocessed_cloud.pkl (클라우드용 집계 데이터)</li>
             <li>Q1.xlsx, Q2.xlsx, Q3.xlsx (분기별 데이터)</li>
             <li>전기차 신청현황.xls</li>
             <li>2025년 테슬라 EV추출파일.xlsx</li>
@@ -427,10 +412,10 @@ elif viewer_option == '지도(테스트)':
     st.header("🗺️ 지도 뷰어")
     st.info("지도 뷰어는 GeoJSON 파일과 지역 데이터가 있을 때 표시됩니다.")
     
-    # 간단한 지도 대체 표시
-    if not df_6.empty:
+    # 간단한 지도 대체 표시 (지역별 집계)
+    if not region_counts.empty:
         st.success("지역 데이터를 찾았습니다!")
-        st.dataframe(df_6.head(), use_container_width=True)
+        st.dataframe(region_counts.head(), use_container_width=True, hide_index=True)
     else:
         st.warning("지역 데이터를 찾을 수 없습니다.")
 
@@ -438,10 +423,10 @@ elif viewer_option == '분석':
     st.header("📈 분석 뷰어")
     st.info("분석 뷰어는 Tesla EV 데이터가 있을 때 표시됩니다.")
     
-    if not df_tesla_ev.empty:
+    if not tesla_ev_summary.empty:
         st.success("Tesla EV 데이터를 찾았습니다!")
-        st.write(f"총 {len(df_tesla_ev)}개의 레코드")
-        st.dataframe(df_tesla_ev.head(), use_container_width=True)
+        st.write(f"총 {int(tesla_ev_summary['건수'].sum())}개의 레코드")
+        st.dataframe(tesla_ev_summary, use_container_width=True, hide_index=True)
     else:
         st.warning("Tesla EV 데이터를 찾을 수 없습니다.")
 
@@ -1,23 +1,58 @@
 import pandas as pd
 import pickle
 import numpy as np
-import sqlite3
 from datetime import datetime
 import json
+import sqlite3
 import subprocess
 import os
-
-conn = sqlite3.connect('data.db')
-
-def git_push_generated_files():
-    """전처리 스크립트로 생성된 데이터 파일들을 Git에 자동으로 커밋하고 푸시합니다."""
+import sys
+from contextlib import closing
+
+from artifact_publish import publish as publish_artifact_chunks
+from artifact_store import ARTIFACT_DIR, MANIFEST_FILE, write_artifacts
+from build_cache import CACHE_DIR, BuildCache
+from cloud_profile import CLOUD_DATA_FILE, write_cloud_data
+from daily_rollup import build_daily_rollup
+from dataset_schema import apply_dataset_schemas, print_schema_report
+from db_manager import (create_snapshot, cumulative_table, open_connection, prune_change_log, read_frame,
+                        table_exists)
+from ev_features import (BIRTH_DATE_COL, add_age_columns, classify_applicant_type,
+                         classify_tesla_model, parse_birth_dates)
+from excel_ingest import read_columns, read_sheet
+from map_layers import build_map_layers
+from pipeline_runner import PipelineRunner, Stage, StageFailed
+from query_log import QUERY_LOG
+from table_mirror import TableMirror, select_rows
+from workbook_cache import read_excel_cached
+
+DB_PATH = 'data.db'
+# 전처리는 data.db 를 직접 읽지 않고 실행 시작 시 만든 시점 사본을 읽습니다 (take_db_snapshot).
+DB_SNAPSHOT_PATH = os.path.join(CACHE_DIR, "data_snapshot.db")
+POLESTAR_YEAR = 2025  # 폴스타 데이터 조회 연도
+# 폴스타 조회 컬럼 (연도 범위로 조회하므로 날짜 인덱스를 사용합니다. benchmarks/query_plan_check.py 참고)
+POLESTAR_PIPELINE_COLUMNS = ["날짜", "파이프라인"]
+POLESTAR_SUPPORT_COLUMNS = ["날짜", "지원신청", "PAK_내부지원", "접수후취소", "미신청건", "보완"]
+
+# 환경변수 GREET_OBJECT_STORE 로 객체 저장소 폴더(공유/마운트 폴더)를 지정하면
+# 아티팩트(artifacts/)의 바뀐 청크를 저장소에 배포합니다 (artifact_publish.py 참고).
+# 클라우드 앱이 읽는 preprocessed_cloud.pkl 은 이 설정과 관계없이 항상 Git 으로 배포합니다.
+OBJECT_STORE = os.environ.get("GREET_OBJECT_STORE")
+
+def git_push_generated_files(update_time_str=None):
+    """
+    클라우드 앱(보고서_cloud.py)이 읽는 집계 파일(CLOUD_DATA_FILE)만 Git에 자동으로 커밋하고 푸시합니다.
+    개인정보 컬럼과 원본 행이 들어 있는 preprocessed_data.pkl 과 artifacts/ 는 로컬에만 둡니다
+    (artifacts/ 를 Git 으로 올리면 실행마다 전체 사본이 히스토리에 쌓임 - 배포는 GREET_OBJECT_STORE 사용).
+    Git 작업이 실패하면 False 를, 푸시했거나 푸시할 변경이 없으면 True 를 반환합니다.
+    """
     
-    files_to_push = ["preprocessed_data.pkl"]
+    files_to_push = [CLOUD_DATA_FILE]
     existing_files_to_push = [f for f in files_to_push if os.path.exists(f)]
 
     if not existing_files_to_push:
         print("푸시할 데이터 파일이 존재하지 않습니다.")
-        return
+        return False
 
     try:
         # 1. 변경 사항 확인
@@ -30,7 +65,7 @@ def git_push_generated_files():
         # 변경 사항이 없으면 함수 종료
         if not status_result.stdout.strip():
             print(f"{', '.join(existing_files_to_push)} 파일에 변경 사항이 없어 Git push를 건너뜁니다.")
-            return
+            return True
 
         # 2. Git 작업 수행
         print(f"{', '.join(existing_files_to_push)} 파일 변경 사항을 감지하여 Git에 푸시합니다.")
@@ -44,7 +79,9 @@ def git_push_generated_files():
         subprocess.run(add_command, check=True)
         
         # Git Commit
-        commit_message = "docs: 데이터 파일 자동 업데이트 (preprocessed_data.pkl 등)"
+        commit_message = f"docs: 데이터 파일 자동 업데이트 ({CLOUD_DATA_FILE})"
+        if update_time_str:
+            commit_message += f" - {update_time_str} 기준"
         subprocess.run(["git", "commit", "-m", commit_message], check=True)
         
         # Git Push
@@ -52,480 +89,586 @@ def git_push_generated_files():
         subprocess.run(["git", "push"], check=True)
         
         print("데이터 파일이 성공적으로 GitHub에 푸시되었습니다.")
+        return True
 
     except subprocess.CalledProcessError as e:
-        error_output = e.stderr or e.stdout
-        print(f"Git 작업 중 오류 발생: {e.stdout.decode('utf-8', errors='ignore')} {e.stderr.decode('utf-8', errors='ignore')}")
+        error_output = e.stderr or e.stdout or ""
+        print(f"Git 작업 중 오류 발생: {e} {error_output}")
     except FileNotFoundError:
         print("Git command를 찾을 수 없습니다. Git이 설치되어 있고 PATH에 등록되어 있는지 확인하세요.")
+    return False
+
+# 환경변수 GRIT_SHARED_FOLDER 로 다른 PC의 공유 폴더 경로를 지정할 수 있습니다.
+GRIT_SHARED_FOLDER = os.environ.get("GRIT_SHARED_FOLDER", 'C:/Users/HP/Desktop/그리트_공유/파일')
+EV_EXTRACT_FILE = "2025년 테슬라 EV추출파일.xlsx"
+# EV추출파일에서 각 결과가 사용하는 컬럼 (이 컬럼들만 읽습니다)
+DF6_COLUMNS = ['지역구분', '신청일자', '주소\n(등록주소지)', '성별', '생년월일\n(법인등록번호)']
+TESLA_EV_COLUMNS = ['신청일자', '차종', '신청유형', '작성자', '생년월일\n(법인등록번호)']
 
-def preprocess_and_save_data():
+
+def load_q3_db_frames(db_path=DB_PATH, mirror=None):
     """
-    Q3.xlsx, Q2.xlsx 파일에서 필요한 시트를 로드하여 전처리한 뒤
-    preprocessed_data.pkl 로 저장합니다.
+    data.db에서 3분기(지원/지급/파이프라인) 데이터를 로드합니다.
+    테이블은 TableMirror 사본으로 읽습니다 (--incremental 이면 지난 실행 이후 변경분만 조회).
     """
+    mirror = mirror or TableMirror(reuse=False)
+    with closing(open_connection(db_path, readonly=True)) as conn:
+        # 지원 데이터 (3분기): 원본 행 그대로 (df_1 은 분기별 원본 행을 이어 붙인 프레임이라 날짜별로 합치지 않습니다)
+        df_1_q3 = mirror.load(conn, "테슬라_지원신청").reset_index(drop=True)
+        # 지급 데이터 (3분기): 날짜별 한 행. 지급_잔여는 지급 미신청건으로 같은 조회에서 나눠 씁니다.
+        df_tesla = select_rows(mirror.load(conn, "테슬라_지급"), ["날짜", "배분", "신청", "지급_잔여"])
+        # 파이프라인 데이터 (3분기): 메일 건수와 분기별 RN
+        df_5_q3 = select_rows(mirror.load(conn, "pipeline"), ["날짜", "RN"])
+    df_2_q3 = df_tesla[["날짜", "배분", "신청"]]
+    df_2_fail_q3 = df_tesla[["날짜", "지급_잔여"]].rename(columns={"지급_잔여": "미신청건"})
+    return df_1_q3, df_2_q3, df_5_q3, df_2_fail_q3
+
+
+def take_db_snapshot(db_path=DB_PATH, snapshot_path=DB_SNAPSHOT_PATH):
+    """
+    전처리가 읽을 data.db 시점 사본을 만듭니다 (db_manager.create_snapshot).
+    편집기가 여러 테이블을 저장하는 도중이어도 모든 테이블을 같은 시점으로 읽고, 긴 조회가 저장을 막지 않습니다.
+    사본을 만들 수 없으면 None 을 반환하고 원본을 직접 읽습니다 (매니페스트의 db_snapshot 은 null).
+    """
+    try:
+        os.makedirs(os.path.dirname(snapshot_path) or ".", exist_ok=True)
+        snapshot = create_snapshot(db_path, snapshot_path)
+    except Exception as e:
+        print(f"data.db 시점 사본을 만들지 못해 원본을 직접 읽습니다: {e}")
+        return None
+    restarts = f", 변경으로 {snapshot['restarts']}회 다시 복사" if snapshot["restarts"] else ""
+    print(f"data.db 시점 사본 생성: {snapshot['path']} ({snapshot['pages']}페이지{restarts})")
+    return snapshot
+
+
+def prune_db_change_log(mirror, db_path=DB_PATH):
+    """
+    테이블 사본(mirror)이 받은 변경 로그를 data.db 에서 테이블별로 지웁니다 (테이블마다 저장된 사본의 버전 이하).
+    지우지 않으면 변경_로그 에 저장된 행마다 한 행씩 계속 쌓입니다. 실패해도 전처리 결과에는 영향이 없습니다.
+    이번 실행에서 읽지 않은 테이블(단계 캐시 재사용)은 사본 버전을 알 수 없으므로 건드리지 않습니다.
+    """
+    versions = {table: version for table, version in mirror.versions.items() if version}
+    if not versions or not os.path.exists(db_path):
+        return
     try:
-        # ---------- 1. 파일 경로 및 시트 로딩 ----------
-        q3_file = "Q3.xlsx"
-        q2_file = "Q2.xlsx"
-        q1_file = "Q1.xlsx"
-
-        # 3분기 시트
-        # df_1_q3 = pd.read_excel(q3_file, sheet_name="지원_EV")      # 지원 데이터 (3분기)
-        df_1_q3 = pd.read_sql_query('SELECT * FROM 테슬라_지원신청', conn)
-        # df_2_q3 = pd.read_excel(q3_file, sheet_name="지급")         # 지급 데이터 (3분기)
-        df_2_q3 = pd.read_sql_query('SELECT * FROM 테슬라_지급', conn)
-        # df_5_q3 = pd.read_excel(q3_file, sheet_name="PipeLine")     # 파이프라인 데이터 (3분기)
-        df_5_q3 = pd.read_sql_query('SELECT * FROM pipeline', conn)
-
-        # 2분기 시트
-        df_1_q2 = pd.read_excel(q2_file, sheet_name="지원_EV")      # 지원 데이터 (2분기)
-        df_2_q2 = pd.read_excel(q2_file, sheet_name="지급")         # 지급 데이터 (2분기)
-        df_5_q2 = pd.read_excel(q2_file, sheet_name="PipeLine")     # 파이프라인 데이터 (2분기)
-
-        # 1분기 시트
-        df_1_q1 = pd.read_excel(q1_file, sheet_name="지원_EV")      # 지원 데이터 (1분기)
-        df_2_q1 = pd.read_excel(q1_file, sheet_name="지급")         # 지급 데이터 (1분기)
-        df_5_q1_raw = pd.read_excel(q1_file, sheet_name="PipeLine") # 파이프라인 데이터 (1분기, 집계형)
-
-        df_fail_q3 = pd.read_excel(q3_file, sheet_name="미신청건")
-        df_2_fail_q3 = pd.read_sql_query("SELECT 날짜, 지급_잔여 AS 미신청건 FROM 테슬라_지급", conn)
-
-        # 1분기 PipeLine 시트는 날짜별 '개수'가 누적되어 있어 개수만큼 행을 복제하여 확장합니다.
-        df_5_q1_list = []
-        if {'날짜', '개수'}.issubset(df_5_q1_raw.columns):
-            df_5_q1_raw['날짜'] = pd.to_datetime(df_5_q1_raw['날짜'], errors='coerce')
-            df_5_q1_raw = df_5_q1_raw.dropna(subset=['날짜', '개수'])
-            for _, row in df_5_q1_raw.iterrows():
-                df_5_q1_list.append(pd.DataFrame({'날짜': [row['날짜']]*int(row['개수'])}))
-            df_5_q1 = pd.concat(df_5_q1_list, ignore_index=True) if df_5_q1_list else pd.DataFrame(columns=['날짜'])
-        else:
-            df_5_q1 = df_5_q1_raw.copy()
-
-        print("Q3.xlsx, Q2.xlsx, Q1.xlsx의 시트를 성공적으로 로드했습니다.")
-
-        # polestar_file 로드 부분을 data.db 사용으로 수정
-        try:
-            # 데이터베이스에서 폴스타 데이터 로드
-            def load_polestar_from_db():
-                """data.db에서 폴스타 데이터를 DataFrame으로 로드"""
-                try:
-                    
-                    # 파이프라인 데이터 조회
-                    pipeline_query = '''
-                        SELECT 날짜, 파이프라인
-                        FROM 파이프라인 
-                        WHERE strftime('%Y', 날짜) = '2025'
-                        ORDER BY 날짜
-                    '''
-                    df_pole_pipeline = pd.read_sql_query(pipeline_query, conn)
-                    
-                    # 지원신청 데이터 조회
-                    support_query = '''
-                        SELECT 날짜, 지원신청, PAK_내부지원, 접수후취소, 미신청건, 보완
-                        FROM 지원신청 
-                        WHERE strftime('%Y', 날짜) = '2025'
-                        ORDER BY 날짜
-                    '''
-                    df_pole_apply = pd.read_sql_query(support_query, conn)
-                    
-                    # 날짜 컬럼 타입 변환
-                    if not df_pole_pipeline.empty and '날짜' in df_pole_pipeline.columns:
-                        df_pole_pipeline['날짜'] = pd.to_datetime(df_pole_pipeline['날짜'], errors='coerce')
-                    if not df_pole_apply.empty and '날짜' in df_pole_apply.columns:
-                        df_pole_apply['날짜'] = pd.to_datetime(df_pole_apply['날짜'], errors='coerce')
-                    
-                    conn.close()
-                    return df_pole_pipeline, df_pole_apply
-                    
-                except sqlite3.Error as e:
-                    print(f"데이터베이스에서 폴스타 데이터 로드 중 오류: {e}")
-                    return pd.DataFrame(), pd.DataFrame()
-                except Exception as e:
-                    print(f"폴스타 데이터 처리 중 오류: {e}")
-                    return pd.DataFrame(), pd.DataFrame()
-            
-            df_pole_pipeline, df_pole_apply = load_polestar_from_db()
-            print("data.db에서 폴스타 데이터를 로드했습니다.")
-            
-        except Exception as e:
-            print(f"폴스타 데이터 로드 중 오류: {e}")
-            df_pole_pipeline = pd.DataFrame()
-            df_pole_apply = pd.DataFrame()
-
-        # ---------- 추가: 테슬라 판매현황 로드 ----------
-        tesla_sales_file = "테슬라_판매현황.xlsx"
-        try:
-            df_sales = pd.read_excel(tesla_sales_file)  # 컬럼: 월, 대수
-            # 데이터 타입 변환
-            if '월' in df_sales.columns:
-                df_sales['월'] = pd.to_numeric(df_sales['월'], errors='coerce')
-            if '대수' in df_sales.columns:
-                df_sales['대수'] = pd.to_numeric(df_sales['대수'], errors='coerce')
-            print("테슬라 판매현황 데이터를 로드했습니다.")
-        except FileNotFoundError:
-            print("'테슬라_판매현황.xlsx' 파일을 찾을 수 없습니다. 판매현황 데이터는 빈 DataFrame으로 저장됩니다.")
-            df_sales = pd.DataFrame()
-        except Exception as e:
-            print(f"테슬라 판매현황을 불러오는 중 오류: {e}")
-            df_sales = pd.DataFrame()
-
-        # ---------- 추가: 전기차 신청현황 로드 ----------
-        ev_status_file = "전기차 신청현황.xls"
-        try:
-            # 첫 번째 표: 신청금액 관련 데이터 (header=4, 데이터 8행, 칼럼수 6개로 제한)
-            df_ev_amount = pd.read_excel(ev_status_file, header=4, nrows=8).iloc[:, :6]
-            df_ev_amount.columns = ['단계', '신청대수', '신청국비(만원)', '신청지방비(만원)', '신청추가지원금(만원)', '신청금액합산(만원)']
-            
-            # 두 번째 표: 단계별 진행현황 데이터 (header=17, 데이터 1행)
-            df_ev_step = pd.read_excel(ev_status_file, header=17, nrows=1).iloc[:1,:]
-            df_ev_step.columns = ['차종', '신청', '승인', '출고', '자격부여', '대상자선정', '지급신청', '지급완료', '취소']
-            
-            print("전기차 신청현황 데이터를 로드했습니다.")
-        except FileNotFoundError:
-            print("'전기차 신청현황.xls' 파일을 찾을 수 없습니다. 전기차 신청현황 데이터는 빈 DataFrame으로 저장됩니다.")
-            df_ev_amount = pd.DataFrame()
-            df_ev_step = pd.DataFrame()
-        except Exception as e:
-            print(f"전기차 신청현황을 불러오는 중 오류: {e}")
-            df_ev_amount = pd.DataFrame()
-            df_ev_step = pd.DataFrame()
-
-        # --- 추가: 지자체 정리 master.xlsx 로드
-        try:
-            df_master = pd.read_excel("master.xlsx")
-            df_master = df_master[['지역', '현황_일반', '현황_우선', 'Model 3 RWD_기본', 'Model 3 RWD(2024)_기본', 'Model 3 LongRange_기본', 'Model 3 Performance_기본', 'Model Y New RWD_기본', 'Model Y New LongRange_기본', '지원신청서류', '지급신청서류']]
-            print("지자체 정리 데이터를 로드했습니다.")
-        except FileNotFoundError:
-            print("'master.xlsx' 파일을 찾을 수 없습니다. 지자체 정리 데이터는 빈 DataFrame으로 저장됩니다.")
-            df_master = pd.DataFrame()
-        except Exception as e:
-            print(f"지자체 정리 데이터 로드 중 오류: {e}")
-            df_master = pd.DataFrame()
-
-        # ---------- 2. 분기 컬럼 추가 및 병합 ----------
-        df_1_q3["분기"] = "3분기"; df_1_q2["분기"] = "2분기"; df_1_q1["분기"] = "1분기"
-        df_2_q3["분기"] = "3분기"; df_2_q2["분기"] = "2분기"; df_2_q1["분기"] = "1분기"
-        df_5_q3["분기"] = "3분기"; df_5_q2["분기"] = "2분기"; df_5_q1["분기"] = "1분기"
-
-        # 1분기는 2월~3월 데이터만 포함합니다.
-        for _df in [df_1_q1, df_2_q1, df_5_q1]:
-            if "날짜" in _df.columns:
-                _df["날짜"] = pd.to_datetime(_df["날짜"], errors="coerce")
-        df_1_q1 = df_1_q1[df_1_q1["날짜"].dt.month.isin([2,3])]
-        df_2_q1 = df_2_q1[df_2_q1["날짜"].dt.month.isin([2,3])]
-        df_5_q1 = df_5_q1[df_5_q1["날짜"].dt.month.isin([2,3])]
-
-        # 병합
-        df_1 = pd.concat([df_1_q3, df_1_q2, df_1_q1], ignore_index=True)
-        df_2 = pd.concat([df_2_q3, df_2_q2, df_2_q1], ignore_index=True)
-        df_5 = pd.concat([df_5_q3, df_5_q2, df_5_q1], ignore_index=True)
-
-        # ---------- 3. 날짜 컬럼 타입 변환 ----------
-        # PipeLine / 지원 / 지급 시트 공통으로 '날짜' 컬럼 존재
-        for _df in [df_5, df_1, df_2]:
-            if "날짜" in _df.columns:
-                _df["날짜"] = pd.to_datetime(_df["날짜"], errors="coerce")
-
-        # 지원 시트에 '지급신청일자'가 있다면 추가 변환 (기존 코드 호환)
-        if "지급신청일자" in df_1.columns:
-            df_1["지급신청일자_날짜"] = pd.to_datetime(df_1["지급신청일자"], errors="coerce")
-
-        # ---------- 4. 업데이트 시간 ----------
-        update_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        # ---------- 5. 기타 데이터 (변경 없음) ----------
-        # 필요 시 다른 엑셀 파일도 그대로 로드합니다.
-        try:
-            df_3 = pd.read_excel("Ent x Greet Lounge Subsidy.xlsx", sheet_name="지원신청", header=0)
-            df_4 = pd.read_excel("Ent x Greet Lounge Subsidy.xlsx", sheet_name="지급신청", header=1)
-        except FileNotFoundError:
-            # 파일이 없는 경우 빈 DataFrame 생성하여 이후 로직 오류 방지
-            df_3 = pd.DataFrame()
-            df_4 = pd.DataFrame()
-
-        try:
-            df_6 = pd.read_excel("2025년 테슬라 EV추출파일.xlsx")
-            # 필요한 컬럼만 선별(존재하는 경우에만)
-            df6_keep_cols = ['지역구분', '신청일자', '주소\n(등록주소지)', '성별', '생년월일\n(법인등록번호)']
-            existing_cols = [c for c in df6_keep_cols if c in df_6.columns]
-            df_6 = df_6[existing_cols]
-
-            # df_6용 연령/연령대 계산 유틸
-            def _calculate_age_generic(birth_value):
-                if pd.isna(birth_value):
-                    return None
-                try:
-                    birth_str = str(birth_value).strip()
-                    # 10자리 전부 숫자인 경우(법인등록번호 패턴) 제외
-                    if len(birth_str) == 10 and birth_str.isdigit():
-                        return None
-                    if len(birth_str) == 8 and birth_str.isdigit():
-                        birth_date = datetime.strptime(birth_str, '%Y%m%d').date()
-                    elif '-' in birth_str:
-                        birth_date = datetime.strptime(birth_str.split(' ')[0], '%Y-%m-%d').date()
-                    else:
-                        return None
-                    today = datetime.now().date()
-                    age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-                    return age if 0 <= age <= 120 else None
-                except Exception:
-                    return None
-
-            def _classify_age_group_generic(age):
-                if age is None:
-                    return "미상"
-                if age < 20:
-                    return "10대"
-                if age < 30:
-                    return "20대"
-                if age < 40:
-                    return "30대"
-                if age < 50:
-                    return "40대"
-                if age < 60:
-                    return "50대"
-                if age < 70:
-                    return "60대"
-                return "70대 이상"
-
-            # 날짜 파싱 및 연령대 생성
-            if '신청일자' in df_6.columns:
-                df_6['신청일자'] = pd.to_datetime(df_6['신청일자'], errors='coerce')
-            birth_col = '생년월일\n(법인등록번호)'
-            if birth_col in df_6.columns:
-                df_6['나이'] = df_6[birth_col].apply(_calculate_age_generic)
-                df_6['연령대'] = df_6['나이'].apply(_classify_age_group_generic)
-        except FileNotFoundError:
-            df_6 = pd.DataFrame()
-
-        def precompute_quarterly_counts(df_6):
-            """분기별 지역 카운트를 미리 계산하여 저장"""
-            if df_6.empty:
-                return {}
-            
-            # 신청일자 컬럼 처리
-            df_6_copy = df_6.copy()
-            df_6_copy['신청일자'] = pd.to_datetime(df_6_copy['신청일자'], errors='coerce')
-            
-            quarterly_counts = {
-                '전체': df_6_copy['지역구분'].value_counts().to_dict(),
-                '1Q': df_6_copy[df_6_copy['신청일자'].dt.month.isin([1,2,3])]['지역구분'].value_counts().to_dict(),
-                '2Q': df_6_copy[df_6_copy['신청일자'].dt.month.isin([4,5,6])]['지역구분'].value_counts().to_dict(),
-                '3Q': df_6_copy[df_6_copy['신청일자'].dt.month.isin([7,8,9])]['지역구분'].value_counts().to_dict(),
-                '4Q': df_6_copy[df_6_copy['신청일자'].dt.month.isin([10,11,12])]['지역구분'].value_counts().to_dict()
-            }
-            return quarterly_counts
-
-        quarterly_region_counts = precompute_quarterly_counts(df_6)
-
-        # ---------- 추가: 그리트_공유 폴더 데이터 로드 ----------
-        def load_grit_shared_data():
-            """그리트_공유 폴더에서 전기차 보조금 관련 데이터 로드"""
-            try:
-                folder_path = 'C:/Users/HP/Desktop/그리트_공유/파일'
-                
-                # 총괄현황 데이터
-                overview_file = folder_path + '/총괄현황(전기자동차 승용).xls'
-                df_overview = pd.read_excel(overview_file, header=3, engine='xlrd')
-                
-                # 컬럼명 설정
-                columns = [
-                    '시도', '지역', '차종', '접수방법', '공고_요약', '공고_전체', '공고_우선순위', '공고_법인기관', '공고_택시', '공고_일반',
-                    '접수_요약', '접수_전체', '접수_우선순위', '접수_법인기관', '접수_택시', '접수_일반',
-                    '잔여_전체', '잔여_일반', '출고_전체', '출고_일반', '출고잔여_요약', '비고'
-                ]
-                
-                if len(df_overview.columns) == len(columns):
-                    df_overview.columns = columns
-                
-                # 숫자형 컬럼 변환
-                numeric_cols = ['공고_전체', '공고_우선순위', '공고_일반', '접수_전체', '접수_우선순위', '접수_일반',
-                               '잔여_전체', '잔여_일반', '출고_일반']
-                
-                for col in numeric_cols:
-                    if col in df_overview.columns:
-                        df_overview[col] = pd.to_numeric(df_overview[col], errors='coerce').fillna(0)
-                
-                # 신청현황 데이터
-                status_file = folder_path + '/전기차 신청현황.xls'
-                df_amount = pd.read_excel(status_file, header=4, nrows=8, engine='xlrd').iloc[:, :6]
-                df_amount.columns = ['단계', '신청대수', '신청국비(만원)', '신청지방비(만원)', '신청추가지원금(만원)', '신청금액합산(만원)']
-                
-                df_step = pd.read_excel(status_file, header=17, nrows=1, engine='xlrd').iloc[:1,:]
-                df_step.columns = ['차종', '신청', '승인', '출고', '자격부여', '대상자선정', '지급신청', '지급완료', '취소']
-                
-                # 숫자형 변환
-                amount_cols = ['신청대수', '신청국비(만원)', '신청지방비(만원)', '신청추가지원금(만원)', '신청금액합산(만원)']
-                for col in amount_cols:
-                    if col in df_amount.columns:
-                        df_amount[col] = df_amount[col].astype(str).str.replace(',', '').replace('nan', '0')
-                        df_amount[col] = pd.to_numeric(df_amount[col], errors='coerce').fillna(0)
-                
-                step_cols = ['신청', '승인', '출고', '자격부여', '대상자선정', '지급신청', '지급완료', '취소']
-                for col in step_cols:
-                    if col in df_step.columns:
-                        df_step[col] = pd.to_numeric(df_step[col], errors='coerce').fillna(0)
-                
-                return df_overview, df_amount, df_step
-                
-            except Exception as e:
-                print(f"그리트_공유 데이터 로드 오류: {e}")
-                return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
-
-        # 그리트_공유 폴더 데이터 로드 실행
-        df_grit_overview, df_grit_amount, df_grit_step = load_grit_shared_data()
-        print("그리트_공유 폴더 데이터를 로드했습니다.")
-
-        # ---------- 추가: test1.py용 테슬라 EV 데이터 전처리 ----------
-        try:
-            df_tesla_ev = pd.read_excel("2025년 테슬라 EV추출파일.xlsx")
-            
-            # 분류 함수들
-            def classify_tesla_model(car_type):
-                if pd.isna(car_type): return "기타"
-                car_type_str = str(car_type).strip()
-                if 'Model Y' in car_type_str: return 'Model Y'
-                if 'Model 3' in car_type_str: return 'Model 3'
-                return "기타"
-
-            def classify_applicant_type(applicant_type):
-                if pd.isna(applicant_type): return "기타"
-                applicant_str = str(applicant_type).strip()
-                if '개인사업자' in applicant_str: return '개인사업자'
-                if '단체' in applicant_str or '법인' in applicant_str: return '법인'
-                if '개인' in applicant_str: return '개인'
-                return "기타"
-
-            def calculate_age(birth_date_str):
-                if pd.isna(birth_date_str): return None
-                try:
-                    birth_date_str = str(birth_date_str).strip()
-                    if len(birth_date_str) == 10 and birth_date_str.isdigit(): return None # 법인번호
-                    
-                    # 다양한 날짜 형식 처리
-                    if len(birth_date_str) == 8 and birth_date_str.isdigit():
-                        birth_date = datetime.strptime(birth_date_str, '%Y%m%d').date()
-                    elif '-' in birth_date_str:
-                        birth_date = datetime.strptime(birth_date_str.split(' ')[0], '%Y-%m-%d').date()
-                    else:
-                        return None
-                    
-                    today = datetime.now().date()
-                    age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
-                    return age if 0 <= age <= 120 else None
-                except:
-                    return None
-
-            def classify_age_group(age):
-                if age is None: return "미상"
-                if age < 20: return "10대"
-                if age < 30: return "20대"
-                if age < 40: return "30대"
-                if age < 50: return "40대"
-                if age < 60: return "50대"
-                if age < 70: return "60대"
-                return "70대 이상"
-
-            # 전처리 실행
-            df_tesla_ev['분류된_차종'] = df_tesla_ev['차종'].apply(classify_tesla_model)
-            df_tesla_ev['분류된_신청유형'] = df_tesla_ev['신청유형'].apply(classify_applicant_type)
-            
-            # 작성자 이름 변환
-            if '작성자' in df_tesla_ev.columns:
-                df_tesla_ev['작성자'] = df_tesla_ev['작성자'].replace('WU CHANGSHI', '오창실')
-            
-            # 날짜/시간 컬럼 처리
-            date_col = next((col for col in df_tesla_ev.columns if '신청일자' in col), None)
-            if date_col:
-                df_tesla_ev[date_col] = pd.to_datetime(df_tesla_ev[date_col], errors='coerce')
-            
-            birth_date_col = next((col for col in df_tesla_ev.columns if '생년월일' in col or '법인' in col), None)
-            if birth_date_col:
-                df_tesla_ev['나이'] = df_tesla_ev[birth_date_col].apply(calculate_age)
-                df_tesla_ev['연령대'] = df_tesla_ev['나이'].apply(classify_age_group)
-
-            print("테슬라 EV 데이터 전처리 완료")
-        except FileNotFoundError:
-            print("'2025년 테슬라 EV추출파일.xlsx' 파일을 찾을 수 없습니다. 테슬라 EV 데이터는 빈 DataFrame으로 저장됩니다.")
-            df_tesla_ev = pd.DataFrame()    
-        except Exception as e:
-            print(f"테슬라 EV 데이터 전처리 중 오류: {e}")
-            df_tesla_ev = pd.DataFrame()
-
-        try:
-            with open("preprocessed_map.geojson", "r", encoding="utf-8") as f:
-                preprocessed_map_geojson = json.load(f)
-            print("전처리된 지도 데이터(preprocessed_map.geojson)를 로드했습니다.")
-        except FileNotFoundError:
-            print("'preprocessed_map.geojson' 파일을 찾을 수 없습니다. 먼저 preprocess_map.py를 실행해주세요.")
-            preprocessed_map_geojson = None
-
-        # ---------- 6. 저장 ----------
-        data_to_save = {
-            "df": pd.DataFrame(),  # 더 이상 사용되지 않지만 구조 유지
-            "df_1": df_1,
-            "df_2": df_2,
-            "df_3": df_3,
-            "df_4": df_4,
-            "df_5": df_5,
-            "df_sales": df_sales,
-            "df_fail_q3": df_fail_q3,
-            "df_2_fail_q3": df_2_fail_q3,
-            "update_time_str": update_time_str,
-            "df_master": df_master,
-            "df_6": df_6,
-            "preprocessed_map_geojson": preprocessed_map_geojson,
-            "df_tesla_ev": df_tesla_ev,  # test1.py용 테슬라 EV 데이터
-            "df_pole_pipeline": df_pole_pipeline,
-            "df_pole_apply": df_pole_apply,
-            "quarterly_region_counts": quarterly_region_counts,
-            "df_ev_amount": df_ev_amount,  # 전기차 신청금액 현황
-            "df_ev_step": df_ev_step,      # 전기차 단계별 진행현황
-            "df_grit_overview": df_grit_overview,  # 그리트_공유 총괄현황 데이터
-            "df_grit_amount": df_grit_amount,      # 그리트_공유 신청금액 데이터  
-            "df_grit_step": df_grit_step           # 그리트_공유 단계별 진행현황 데이터
-        }
-
-        with open("preprocessed_data.pkl", "wb") as f:
-            pickle.dump(data_to_save, f)
-
-        print("전처리 완료 및 preprocessed_data.pkl 저장")
-
-        # ---------- 추가 저장: df_6, df_tesla_ev를 개별 pkl로 저장(간단 최적화 포함) ----------
-        try:
-            # df_6 최적화 및 저장
-            if 'df_6' in data_to_save:
-                df_6_opt = data_to_save['df_6'].copy()
-                if not df_6_opt.empty:
-                    # 날짜 파싱 및 카테고리 변환으로 메모리 최적화
-                    if '신청일자' in df_6_opt.columns:
-                        df_6_opt['신청일자'] = pd.to_datetime(df_6_opt['신청일자'], errors='coerce')
-                    for col in ['지역구분', '주소\n(등록주소지)', '성별', '연령대']:
-                        if col in df_6_opt.columns:
-                            df_6_opt[col] = df_6_opt[col].astype('category')
-                    df_6_opt.to_pickle("df_6.pkl.gz", compression="gzip")
-                    print("df_6.pkl.gz 저장(압축, 경량화) 완료")
-
-            # df_tesla_ev 최적화 및 저장
-            if 'df_tesla_ev' in data_to_save:
-                df_tesla_ev_opt = data_to_save['df_tesla_ev'].copy()
-                if not df_tesla_ev_opt.empty:
-                    # 범주형 컬럼은 카테고리로 변환하여 크기 축소
-                    for col in ['작성자', '분류된_차종', '분류된_신청유형', '연령대']:
-                        if col in df_tesla_ev_opt.columns:
-                            df_tesla_ev_opt[col] = df_tesla_ev_opt[col].astype('category')
-                    df_tesla_ev_opt.to_pickle("df_tesla_ev.pkl.gz", compression="gzip")
-                    print("df_tesla_ev.pkl.gz 저장(압축, 경량화) 완료")
-        except Exception as e:
-            print(f"개별 pkl 저장 중 오류: {e}")
-
-        # 모든 파일 저장 후 Git에 푸시
-        git_push_generated_files()
+        with closing(open_connection(db_path)) as conn:
+            removed = prune_change_log(conn, versions)
+    except sqlite3.Error as e:
+        print(f"data.db 변경 로그 정리 오류: {e}")
+        return
+    if removed:
+        print(f"data.db 변경 로그 {removed}행을 정리했습니다 ({', '.join(versions)}).")
+
+
+def load_q1_pipeline(q1_file="Q1.xlsx"):
+    """1분기 PipeLine 시트(집계형)를 로드하여 행 단위로 확장합니다."""
+    df_5_q1_raw = read_excel_cached(q1_file, sheet_name="PipeLine") # 파이프라인 데이터 (1분기, 집계형)
+
+    # 1분기 PipeLine 시트는 날짜별 '개수'가 누적되어 있어 개수만큼 행을 복제하여 확장합니다.
+    df_5_q1_list = []
+    if {'날짜', '개수'}.issubset(df_5_q1_raw.columns):
+        df_5_q1_raw['날짜'] = pd.to_datetime(df_5_q1_raw['날짜'], errors='coerce')
+        df_5_q1_raw = df_5_q1_raw.dropna(subset=['날짜', '개수'])
+        for _, row in df_5_q1_raw.iterrows():
+            df_5_q1_list.append(pd.DataFrame({'날짜': [row['날짜']]*int(row['개수'])}))
+        df_5_q1 = pd.concat(df_5_q1_list, ignore_index=True) if df_5_q1_list else pd.DataFrame(columns=['날짜'])
+    else:
+        df_5_q1 = df_5_q1_raw.copy()
+    return df_5_q1
+
+
+def _attach_cumulative(conn, table, df, date_range):
+    """
+    요약 테이블(<테이블>_누적)이 있으면 날짜별 누적_<컬럼>을 붙입니다.
+    뷰어는 월 누계/누적 총계를 행 합계 대신 누적값 두 개의 차이로 구합니다.
+    """
+    if df.empty or not table_exists(conn, cumulative_table(table)):
+        return df
+    cumulative = read_frame(conn, cumulative_table(table), None, *date_range).rename(columns={"날짜": "_일자"})
+    merged = df.assign(_일자=df["날짜"].dt.normalize()).merge(cumulative, on="_일자", how="left")
+    return merged.drop(columns="_일자")
+
+
+def load_polestar_from_db(db_path=DB_PATH, year=POLESTAR_YEAR, mirror=None):
+    """
+    data.db에서 폴스타 데이터를 DataFrame으로 로드 (날짜 컬럼은 datetime, 요약 테이블이 있으면 누적 컬럼 포함)
+    테이블은 TableMirror 사본으로 읽습니다 (--incremental 이면 지난 실행 이후 변경분만 조회).
+    """
+    mirror = mirror or TableMirror(reuse=False)
+    year_range = (f"{year}-01-01", f"{year}-12-31")
+    with closing(open_connection(db_path, readonly=True)) as conn:
+        # 파이프라인 데이터 조회
+        df_pole_pipeline = select_rows(mirror.load(conn, "파이프라인"), POLESTAR_PIPELINE_COLUMNS, *year_range)
+        df_pole_pipeline = _attach_cumulative(conn, "파이프라인", df_pole_pipeline, year_range)
+        # 지원신청 데이터 조회
+        df_pole_apply = select_rows(mirror.load(conn, "지원신청"), POLESTAR_SUPPORT_COLUMNS, *year_range)
+        df_pole_apply = _attach_cumulative(conn, "지원신청", df_pole_apply, year_range)
+    
+    print("data.db에서 폴스타 데이터를 로드했습니다.")
+    return df_pole_pipeline, df_pole_apply
+
+
+def load_sales_data(tesla_sales_file="테슬라_판매현황.xlsx"):
+    """테슬라 판매현황(월, 대수)을 로드합니다."""
+    df_sales = read_excel_cached(tesla_sales_file)  # 컬럼: 월, 대수
+    # 데이터 타입 변환
+    if '월' in df_sales.columns:
+        df_sales['월'] = pd.to_numeric(df_sales['월'], errors='coerce')
+    if '대수' in df_sales.columns:
+        df_sales['대수'] = pd.to_numeric(df_sales['대수'], errors='coerce')
+    print("테슬라 판매현황 데이터를 로드했습니다.")
+    return df_sales
+
+
+def load_ev_status(ev_status_file="전기차 신청현황.xls"):
+    """전기차 신청현황(신청금액 표, 단계별 진행현황 표)을 로드합니다."""
+    # 첫 번째 표: 신청금액 관련 데이터 (header=4, 데이터 8행, 칼럼수 6개로 제한)
+    df_ev_amount = read_excel_cached(ev_status_file, header=4, nrows=8).iloc[:, :6]
+    df_ev_amount.columns = ['단계', '신청대수', '신청국비(만원)', '신청지방비(만원)', '신청추가지원금(만원)', '신청금액합산(만원)']
+    
+    # 두 번째 표: 단계별 진행현황 데이터 (header=17, 데이터 1행)
+    df_ev_step = read_excel_cached(ev_status_file, header=17, nrows=1).iloc[:1,:]
+    df_ev_step.columns = ['차종', '신청', '승인', '출고', '자격부여', '대상자선정', '지급신청', '지급완료', '취소']
+    
+    print("전기차 신청현황 데이터를 로드했습니다.")
+    return df_ev_amount, df_ev_step
+
+
+def load_master_data(master_file="master.xlsx"):
+    """지자체 정리 master.xlsx를 로드합니다."""
+    df_master = read_excel_cached(master_file)
+    df_master = df_master[['지역', '현황_일반', '현황_우선', 'Model 3 RWD_기본', 'Model 3 RWD(2024)_기본', 'Model 3 LongRange_기본', 'Model 3 Performance_기본', 'Model Y New RWD_기본', 'Model Y New LongRange_기본', '지원신청서류', '지급신청서류']]
+    print("지자체 정리 데이터를 로드했습니다.")
+    return df_master
+
+
+def load_subsidy_frames(subsidy_file="Ent x Greet Lounge Subsidy.xlsx"):
+    """법인팀 지원신청/지급신청 시트를 로드합니다."""
+    df_3 = read_excel_cached(subsidy_file, sheet_name="지원신청", header=0)
+    df_4 = read_excel_cached(subsidy_file, sheet_name="지급신청", header=1)
+    return df_3, df_4
 
+
+def load_ev_extract(ev_file=EV_EXTRACT_FILE):
+    """
+    EV추출파일을 한 번만 읽습니다. (df_6, df_tesla_ev 공통 입력)
+    전체 컬럼을 파싱하지 않고 두 결과에 필요한 컬럼만 청크 단위로 스트리밍합니다.
+    """
+    columns = list(dict.fromkeys(DF6_COLUMNS + TESLA_EV_COLUMNS))
+    return read_columns(ev_file, columns, date_columns=['신청일자'])
+
+
+def derive_df_6(df_ev_raw):
+    """EV추출파일에서 지역/신청일자/주소/성별/연령대 데이터(df_6)를 만듭니다."""
+    # 필요한 컬럼만 선별(존재하는 경우에만)
+    existing_cols = [c for c in DF6_COLUMNS if c in df_ev_raw.columns]
+    df_6 = df_ev_raw[existing_cols].copy()
+
+    # 날짜 파싱 및 연령대 생성
+    if '신청일자' in df_6.columns:
+        df_6['신청일자'] = pd.to_datetime(df_6['신청일자'], errors='coerce')
+    birth_col = '생년월일\n(법인등록번호)'
+    if birth_col in df_6.columns:
+        # 생년월일을 저장해 두고, 나이/연령대는 뷰어에서 조회 시점 기준으로 다시 계산합니다.
+        df_6[BIRTH_DATE_COL] = parse_birth_dates(df_6[birth_col])
+        df_6 = add_age_columns(df_6)
+    return df_6
+
+
+def precompute_quarterly_counts(df_6):
+    """분기별 지역 카운트를 미리 계산하여 저장"""
+    if df_6.empty:
+        return {}
+    
+    # 신청일자 컬럼 처리
+    df_6_copy = df_6.copy()
+    df_6_copy['신청일자'] = pd.to_datetime(df_6_copy['신청일자'], errors='coerce')
+    
+    quarterly_counts = {
+        '전체': df_6_copy['지역구분'].value_counts().to_dict(),
+        '1Q': df_6_copy[df_6_copy['신청일자'].dt.month.isin([1,2,3])]['지역구분'].value_counts().to_dict(),
+        '2Q': df_6_copy[df_6_copy['신청일자'].dt.month.isin([4,5,6])]['지역구분'].value_counts().to_dict(),
+        '3Q': df_6_copy[df_6_copy['신청일자'].dt.month.isin([7,8,9])]['지역구분'].value_counts().to_dict(),
+        '4Q': df_6_copy[df_6_copy['신청일자'].dt.month.isin([10,11,12])]['지역구분'].value_counts().to_dict()
+    }
+    return quarterly_counts
+
+
+def aggregate_map_layers(preprocessed_map_geojson, quarterly_region_counts):
+    """분기별 지역 카운트를 지도 지역(sggnm)에 미리 매칭한 값 테이블 (뷰어는 지오메트리에 값만 붙임)"""
+    return build_map_layers(preprocessed_map_geojson, quarterly_region_counts)
+
+
+def load_grit_shared_data(folder_path=GRIT_SHARED_FOLDER):
+    """그리트_공유 폴더에서 전기차 보조금 관련 데이터 로드"""
+    # 총괄현황 데이터
+    overview_file = folder_path + '/총괄현황(전기자동차 승용).xls'
+    df_overview = read_excel_cached(overview_file, header=3, engine='xlrd')
+    
+    # 컬럼명 설정
+    columns = [
+        '시도', '지역', '차종', '접수방법', '공고_요약', '공고_전체', '공고_우선순위', '공고_법인기관', '공고_택시', '공고_일반',
+        '접수_요약', '접수_전체', '접수_우선순위', '접수_법인기관', '접수_택시', '접수_일반',
+        '잔여_전체', '잔여_일반', '출고_전체', '출고_일반', '출고잔여_요약', '비고'
+    ]
+    
+    if len(df_overview.columns) == len(columns):
+        df_overview.columns = columns
+    
+    # 숫자형 컬럼 변환
+    numeric_cols = ['공고_전체', '공고_우선순위', '공고_일반', '접수_전체', '접수_우선순위', '접수_일반',
+                   '잔여_전체', '잔여_일반', '출고_일반']
+    
+    for col in numeric_cols:
+        if col in df_overview.columns:
+            df_overview[col] = pd.to_numeric(df_overview[col], errors='coerce').fillna(0)
+    
+    # 신청현황 데이터
+    status_file = folder_path + '/전기차 신청현황.xls'
+    df_amount = read_excel_cached(status_file, header=4, nrows=8, engine='xlrd').iloc[:, :6]
+    df_amount.columns = ['단계', '신청대수', '신청국비(만원)', '신청지방비(만원)', '신청추가지원금(만원)', '신청금액합산(만원)']
+    
+    df_step = read_excel_cached(status_file, header=17, nrows=1, engine='xlrd').iloc[:1,:]
+    df_step.columns = ['차종', '신청', '승인', '출고', '자격부여', '대상자선정', '지급신청', '지급완료', '취소']
+    
+    # 숫자형 변환
+    amount_cols = ['신청대수', '신청국비(만원)', '신청지방비(만원)', '신청추가지원금(만원)', '신청금액합산(만원)']
+    for col in amount_cols:
+        if col in df_amount.columns:
+            df_amount[col] = df_amount[col].astype(str).str.replace(',', '').replace('nan', '0')
+            df_amount[col] = pd.to_numeric(df_amount[col], errors='coerce').fillna(0)
+    
+    step_cols = ['신청', '승인', '출고', '자격부여', '대상자선정', '지급신청', '지급완료', '취소']
+    for col in step_cols:
+        if col in df_step.columns:
+            df_step[col] = pd.to_numeric(df_step[col], errors='coerce').fillna(0)
+    
+    print("그리트_공유 폴더 데이터를 로드했습니다.")
+    return df_overview, df_amount, df_step
+
+
+def derive_tesla_ev(df_ev_raw):
+    """test1.py용 테슬라 EV 데이터를 전처리합니다."""
+    df_tesla_ev = df_ev_raw[[c for c in TESLA_EV_COLUMNS if c in df_ev_raw.columns]].copy()
+    if df_tesla_ev.empty:
+        return df_tesla_ev
+    
+    # 전처리 실행
+    df_tesla_ev['분류된_차종'] = classify_tesla_model(df_tesla_ev['차종'])
+    df_tesla_ev['분류된_신청유형'] = classify_applicant_type(df_tesla_ev['신청유형'])
+    
+    # 작성자 이름 변환
+    if '작성자' in df_tesla_ev.columns:
+        df_tesla_ev['작성자'] = df_tesla_ev['작성자'].replace('WU CHANGSHI', '오창실')
+    
+    # 날짜/시간 컬럼 처리
+    date_col = next((col for col in df_tesla_ev.columns if '신청일자' in col), None)
+    if date_col:
+        df_tesla_ev[date_col] = pd.to_datetime(df_tesla_ev[date_col], errors='coerce')
+    
+    birth_date_col = next((col for col in df_tesla_ev.columns if '생년월일' in col or '법인' in col), None)
+    if birth_date_col:
+        df_tesla_ev[BIRTH_DATE_COL] = parse_birth_dates(df_tesla_ev[birth_date_col])
+        df_tesla_ev = add_age_columns(df_tesla_ev)
+
+    print("테슬라 EV 데이터 전처리 완료")
+    return df_tesla_ev
+
+
+def load_preprocessed_map(geojson_path="preprocessed_map.geojson"):
+    """전처리된 지도 GeoJSON을 로드합니다. (없으면 먼저 preprocess_map.py를 실행해야 합니다)"""
+    with open(geojson_path, "r", encoding="utf-8") as f:
+        preprocessed_map_geojson = json.load(f)
+    print("전처리된 지도 데이터(preprocessed_map.geojson)를 로드했습니다.")
+    return preprocessed_map_geojson
+
+
+def normalize_retail_frames(q3_frames, df_1_q2, df_2_q2, df_5_q2, df_1_q1, df_2_q1, df_5_q1):
+    """분기별 지원/지급/파이프라인 시트에 분기 컬럼을 붙이고 하나로 병합합니다."""
+    df_1_q3, df_2_q3, df_5_q3, df_2_fail_q3 = q3_frames
+    # 캐시/다른 단계와 공유되는 입력을 바꾸지 않도록 복사본에 작업합니다.
+    df_1_q3, df_2_q3, df_5_q3 = df_1_q3.copy(), df_2_q3.copy(), df_5_q3.copy()
+    df_1_q2, df_2_q2, df_5_q2 = df_1_q2.copy(), df_2_q2.copy(), df_5_q2.copy()
+    df_1_q1, df_2_q1, df_5_q1 = df_1_q1.copy(), df_2_q1.copy(), df_5_q1.copy()
+
+    # ---------- 분기 컬럼 추가 및 병합 ----------
+    df_1_q3["분기"] = "3분기"; df_1_q2["분기"] = "2분기"; df_1_q1["분기"] = "1분기"
+    df_2_q3["분기"] = "3분기"; df_2_q2["분기"] = "2분기"; df_2_q1["분기"] = "1분기"
+    df_5_q3["분기"] = "3분기"; df_5_q2["분기"] = "2분기"; df_5_q1["분기"] = "1분기"
+
+    # 1분기는 2월~3월 데이터만 포함합니다.
+    for _df in [df_1_q1, df_2_q1, df_5_q1]:
+        if "날짜" in _df.columns:
+            _df["날짜"] = pd.to_datetime(_df["날짜"], errors="coerce")
+    df_1_q1 = df_1_q1[df_1_q1["날짜"].dt.month.isin([2,3])]
+    df_2_q1 = df_2_q1[df_2_q1["날짜"].dt.month.isin([2,3])]
+    df_5_q1 = df_5_q1[df_5_q1["날짜"].dt.month.isin([2,3])]
+
+    # 병합
+    df_1 = pd.concat([df_1_q3, df_1_q2, df_1_q1], ignore_index=True)
+    df_2 = pd.concat([df_2_q3, df_2_q2, df_2_q1], ignore_index=True)
+    df_5 = pd.concat([df_5_q3, df_5_q2, df_5_q1], ignore_index=True)
+
+    # ---------- 날짜 컬럼 타입 변환 ----------
+    # PipeLine / 지원 / 지급 시트 공통으로 '날짜' 컬럼 존재
+    for _df in [df_5, df_1, df_2]:
+        if "날짜" in _df.columns:
+            _df["날짜"] = pd.to_datetime(_df["날짜"], errors="coerce")
+
+    # 지원 시트에 '지급신청일자'가 있다면 추가 변환 (기존 코드 호환)
+    if "지급신청일자" in df_1.columns:
+        df_1["지급신청일자_날짜"] = pd.to_datetime(df_1["지급신청일자"], errors="coerce")
+
+    return df_1, df_2, df_5, df_2_fail_q3
+
+
+def aggregate_daily_rollup(retail_frames, df_fail_q3):
+    """리포트 요약용 일별 집계표 (원본 행 수와 무관하게 날짜/기간 합계를 조회)"""
+    df_1, df_2, df_5, df_2_fail_q3 = retail_frames
+    return build_daily_rollup({
+        "df_1": df_1, "df_2": df_2, "df_5": df_5,
+        "df_fail_q3": df_fail_q3, "df_2_fail_q3": df_2_fail_q3,
+    })
+
+
+def save_compact_pickles(data_to_save):
+    """df_6, df_tesla_ev를 개별 pkl로 저장 (dtype 축소는 dataset_schema 에서 이미 적용됨)"""
+    try:
+        for name in ("df_6", "df_tesla_ev"):
+            df = data_to_save.get(name)
+            if df is not None and not df.empty:
+                df.to_pickle(f"{name}.pkl.gz", compression="gzip")
+                print(f"{name}.pkl.gz 저장(압축, 경량화) 완료")
     except Exception as e:
-        print(f"전처리 중 오류: {e}")
+        print(f"개별 pkl 저장 중 오류: {e}")
+
+
+def write_outputs(retail_frames, df_fail_q3, subsidy, df_sales, df_master, df_6, preprocessed_map_geojson,
+                  df_tesla_ev, polestar, quarterly_region_counts, ev_status, grit, daily_rollup, map_layers,
+                  db_snapshot=None):
+    """
+    전처리 결과를 preprocessed_data.pkl 과 데이터셋별 아티팩트(artifacts/)로 저장합니다.
+    db_snapshot: 읽은 data.db 시점 사본 정보 (매니페스트에 사본 시각과 경과 시간으로 기록)
+    """
+    df_1, df_2, df_5, df_2_fail_q3 = retail_frames
+    df_3, df_4 = subsidy
+    df_pole_pipeline, df_pole_apply = polestar
+    df_ev_amount, df_ev_step = ev_status
+    df_grit_overview, df_grit_amount, df_grit_step = grit
+    map_quarter_values, map_unmatched_regions = map_layers
+
+    # 업데이트 시간
+    update_time_str = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+    data_to_save = {
+        "df": pd.DataFrame(),  # 더 이상 사용되지 않지만 구조 유지
+        "df_1": df_1,
+        "df_2": df_2,
+        "df_3": df_3,
+        "df_4": df_4,
+        "df_5": df_5,
+        "df_sales": df_sales,
+        "df_fail_q3": df_fail_q3,
+        "df_2_fail_q3": df_2_fail_q3,
+        "daily_rollup": daily_rollup,
+        "update_time_str": update_time_str,
+        "df_master": df_master,
+        "df_6": df_6,
+        "preprocessed_map_geojson": preprocessed_map_geojson,
+        "df_tesla_ev": df_tesla_ev,  # test1.py용 테슬라 EV 데이터
+        "df_pole_pipeline": df_pole_pipeline,
+        "df_pole_apply": df_pole_apply,
+        "quarterly_region_counts": quarterly_region_counts,
+        "map_quarter_values": map_quarter_values,        # 지도 지역별 분기 값 (map_layers.py)
+        "map_unmatched_regions": map_unmatched_regions,  # 지도에 매칭되지 않은 지역
+        "df_ev_amount": df_ev_amount,  # 전기차 신청금액 현황
+        "df_ev_step": df_ev_step,      # 전기차 단계별 진행현황
+        "df_grit_overview": df_grit_overview,  # 그리트_공유 총괄현황 데이터
+        "df_grit_amount": df_grit_amount,      # 그리트_공유 신청금액 데이터  
+        "df_grit_step": df_grit_step           # 그리트_공유 단계별 진행현황 데이터
+    }
+    # 사용하는 컬럼만 남기고 dtype 축소 (dataset_schema.DATASET_SCHEMAS)
+    data_to_save, schema_report = apply_dataset_schemas(data_to_save)
+    print_schema_report(schema_report)
+
+    with open("preprocessed_data.pkl", "wb") as f:
+        pickle.dump(data_to_save, f)
+
+    print("전처리 완료 및 preprocessed_data.pkl 저장")
+
+    # 보고서_cloud.py 용 경량 프로필 (집계만, 개인정보 컬럼 제외)
+    cloud_bytes = write_cloud_data(data_to_save)
+    print(f"{CLOUD_DATA_FILE} 저장 ({cloud_bytes / 1024:.1f}KB, 클라우드 보고서용 집계)")
+
+    # 데이터셋별 컬럼형 아티팩트 저장 (뷰어는 필요한 데이터셋만 지연 로딩)
+    manifest = write_artifacts(data_to_save, db_snapshot=db_snapshot)
+    print(f"{ARTIFACT_DIR}/ 에 데이터셋 {len(manifest['datasets'])}개를 저장했습니다.")
+
+    save_compact_pickles(data_to_save)
+    return update_time_str
+
+
+def publish_outputs(update_time_str):
+    """
+    모든 파일 저장 후 배포. GREET_OBJECT_STORE 가 있으면 아티팩트를 청크 증분 배포하고,
+    클라우드 앱(보고서_cloud.py)이 읽는 CLOUD_DATA_FILE 은 항상 Git에 푸시합니다.
+    update_time_str(write_outputs 의 데이터 기준 시각)은 배포 메시지와 Git 커밋 메시지에 남깁니다.
+    Git 푸시가 실패하면 RuntimeError 를 발생시켜, 단계가 캐시되지 않고 다음 실행에서 다시 배포하도록 합니다.
+    """
+    if OBJECT_STORE:
+        print(f"{update_time_str} 기준 데이터를 {OBJECT_STORE} 에 배포합니다.")
+        publish_artifact_chunks(OBJECT_STORE)
+    if not git_push_generated_files(update_time_str):
+        raise RuntimeError(f"{CLOUD_DATA_FILE} Git 푸시 실패")
+
+
+def _empty_frames(count):
+    """선택 입력이 실패했을 때 사용할 빈 DataFrame 묶음"""
+    if count == 1:
+        return lambda: pd.DataFrame()
+    return lambda: tuple(pd.DataFrame() for _ in range(count))
+
+
+def build_stages(cache, publish=True, db_snapshot=None, mirror=None):
+    """
+    전처리 단계 선언: 소스 로드 → 정규화 → 파생 → 집계 → 아티팩트 저장 → 푸시
+    fallback 이 있는 단계는 선택 입력으로, 실패하면 빈 데이터로 대체하고 결과 표에 경고를 남깁니다.
+    fallback 이 없는 단계가 실패하면 저장/푸시를 하지 않습니다.
+    증분 실행에서 상위 단계 출력이 모두 같으면 저장/푸시 단계도 캐시를 사용해 건너뜁니다.
+    publish=False 이면 푸시 단계를 빼고 저장까지만 실행합니다 (벤치마크 등).
+    db_snapshot 이 있으면 data.db 대신 그 시점 사본을 읽습니다 (take_db_snapshot).
+    mirror 는 data.db 테이블 사본 저장소입니다 (없으면 cache 설정으로 만듭니다).
+    """
+    db_path = db_snapshot["path"] if db_snapshot else DB_PATH
+    q3_file = "Q3.xlsx"
+    q2_file = "Q2.xlsx"
+    q1_file = "Q1.xlsx"
+    tesla_sales_file = "테슬라_판매현황.xlsx"
+    ev_status_file = "전기차 신청현황.xls"
+    subsidy_file = "Ent x Greet Lounge Subsidy.xlsx"
+    master_file = "master.xlsx"
+    geojson_file = "preprocessed_map.geojson"
+
+    def files(*paths):
+        return lambda: [cache.fingerprint_file(p) for p in paths]
+
+    def tables(*names):
+        def fingerprints():
+            with closing(open_connection(db_path, readonly=True)) as conn:
+                return [cache.fingerprint_table(conn, t) for t in names]
+        return fingerprints
+
+    # data.db 테이블 사본: 증분 실행이면 변경 로그로 받은 변경분만 적용하고, 아니면 전체를 읽어 사본을 새로 만듭니다.
+    mirror = mirror or TableMirror(cache.cache_dir, reuse=cache.incremental)
+
+    grit_files = files(GRIT_SHARED_FOLDER + '/총괄현황(전기자동차 승용).xls', GRIT_SHARED_FOLDER + '/전기차 신청현황.xls')
+
+    stages = [
+        # ---------- 1. 소스 로드 ----------
+        # 3분기 시트 (data.db)
+        Stage("q3_db", load_q3_db_frames, args=(db_path, mirror),
+              inputs=tables("테슬라_지원신청", "테슬라_지급", "pipeline")),
+        Stage("polestar", load_polestar_from_db, args=(db_path, POLESTAR_YEAR, mirror),
+              inputs=tables("파이프라인", "지원신청"), fallback=_empty_frames(2)),
+        # 엑셀 시트/파일 단위 작업 (서로 독립적이므로 프로세스 풀에서 동시에 파싱합니다)
+        Stage("q2_지원_EV", read_sheet, args=(q2_file, "지원_EV"), inputs=files(q2_file), process=True),
+        Stage("q2_지급", read_sheet, args=(q2_file, "지급"), inputs=files(q2_file), process=True),
+        Stage("q2_PipeLine", read_sheet, args=(q2_file, "PipeLine"), inputs=files(q2_file), process=True),
+        Stage("q1_지원_EV", read_sheet, args=(q1_file, "지원_EV"), inputs=files(q1_file), process=True),
+        Stage("q1_지급", read_sheet, args=(q1_file, "지급"), inputs=files(q1_file), process=True),
+        Stage("q1_PipeLine", load_q1_pipeline, args=(q1_file,), inputs=files(q1_file), process=True),
+        Stage("q3_미신청건", read_sheet, args=(q3_file, "미신청건"), inputs=files(q3_file), process=True),
+        Stage("sales", load_sales_data, args=(tesla_sales_file,), inputs=files(tesla_sales_file),
+              process=True, fallback=_empty_frames(1)),
+        Stage("ev_status", load_ev_status, args=(ev_status_file,), inputs=files(ev_status_file),
+              process=True, fallback=_empty_frames(2)),
+        Stage("master", load_master_data, args=(master_file,), inputs=files(master_file),
+              process=True, fallback=_empty_frames(1)),
+        Stage("subsidy", load_subsidy_frames, args=(subsidy_file,), inputs=files(subsidy_file),
+              process=True, fallback=_empty_frames(2)),
+        Stage("ev_extract", load_ev_extract, args=(EV_EXTRACT_FILE,), inputs=files(EV_EXTRACT_FILE),
+              process=True, fallback=_empty_frames(1)),
+        Stage("grit", load_grit_shared_data, args=(GRIT_SHARED_FOLDER,), inputs=grit_files,
+              process=True, fallback=_empty_frames(3)),
+        Stage("map", load_preprocessed_map, args=(geojson_file,), inputs=files(geojson_file), fallback=lambda: None),
+
+        # ---------- 2. 정규화 ----------
+        Stage("retail_frames", normalize_retail_frames, kind="normalize",
+              deps=("q3_db", "q2_지원_EV", "q2_지급", "q2_PipeLine", "q1_지원_EV", "q1_지급", "q1_PipeLine")),
+
+        # ---------- 3. 파생 컬럼 ----------
+        Stage("df_6", derive_df_6, kind="derive", deps=("ev_extract",)),
+        Stage("df_tesla_ev", derive_tesla_ev, kind="derive", deps=("ev_extract",)),
+
+        # ---------- 4. 집계 ----------
+        Stage("daily_rollup", aggregate_daily_rollup, kind="aggregate", deps=("retail_frames", "q3_미신청건")),
+        Stage("quarterly_region_counts", precompute_quarterly_counts, kind="aggregate", deps=("df_6",)),
+        Stage("map_layers", aggregate_map_layers, kind="aggregate", deps=("map", "quarterly_region_counts")),
+
+        # ---------- 5. 저장 ----------
+        # 상위 단계 출력이 모두 지난 실행과 같고 저장한 파일이 남아 있으면 다시 쓰지 않습니다
+        # (매니페스트 mtime 이 그대로여서 뷰어의 load_artifacts 캐시도 유지됨).
+        Stage("write_outputs", write_outputs, kind="write", args=(db_snapshot,),
+              output_files=("preprocessed_data.pkl", CLOUD_DATA_FILE, os.path.join(ARTIFACT_DIR, MANIFEST_FILE)),
+              deps=("retail_frames", "q3_미신청건", "subsidy", "sales", "master", "df_6", "map",
+                    "df_tesla_ev", "polestar", "quarterly_region_counts", "ev_status", "grit", "daily_rollup",
+                    "map_layers")),
+    ]
+
+    # ---------- 6. 푸시 ----------
+    if publish:
+        # 저장 단계를 건너뛰면 (출력 해시가 같으면) 배포도 건너뜁니다. 배포 대상이 바뀌면 다시 배포합니다.
+        stages.append(Stage("publish", publish_outputs, kind="publish", deps=("write_outputs",),
+                            inputs=lambda: [{"object_store": OBJECT_STORE}]))
+    return stages
+
+
+def preprocess_and_save_data(incremental=False, max_workers=None, profile_memory=False, publish=True):
+    """
+    Q3.xlsx, Q2.xlsx 파일에서 필요한 시트를 로드하여 전처리한 뒤
+    preprocessed_data.pkl 과 데이터셋별 아티팩트(artifacts/)로 저장합니다.
+
+    incremental=True 이면 입력 파일/테이블 지문과 상위 단계 출력이 지난 실행과 같은
+    단계는 다시 실행하지 않고 .preprocess_cache 에서 재사용합니다.
+    max_workers 는 동시에 실행할 단계 수입니다 (1이면 순차 실행).
+    profile_memory=True 이면 단계별 최대 메모리를 tracemalloc 으로 측정합니다 (실행이 느려짐).
+    publish=False 이면 저장한 파일을 Git에 푸시하지 않습니다.
+    필수 단계가 실패하면 StageFailed 를 발생시키며, 이 경우 저장/푸시는 하지 않습니다.
+    data.db 는 시작 시 만든 시점 사본(DB_SNAPSHOT_PATH)에서 읽고, 끝나면 테이블 사본이 받은 변경 로그를 정리합니다.
+    """
+    cache = BuildCache(incremental=incremental)
+    db_snapshot = take_db_snapshot()
+    mirror = TableMirror(cache.cache_dir, reuse=cache.incremental)
+    stages = build_stages(cache, publish, db_snapshot, mirror)
+    runner = PipelineRunner(stages, cache, max_workers=max_workers, trace_memory=profile_memory)
+    result = runner.run()
+    prune_db_change_log(mirror)
+    return result
 
 
 if __name__ == "__main__":
-    preprocess_and_save_data() 
\ No newline at end of file
+    # --incremental: 입력이 바뀐 단계와 그 하위 단계만 다시 실행합니다.
+    # --workers N: 동시에 실행할 단계 수 (기본: CPU 코어 수)
+    # --profile-memory: 단계별 최대 메모리 측정
+    # --query-stats: data.db 쿼리의 형태별 소요시간(p50/p95)/행 수 요약 출력
+    # --slow-ms N / --query-log 파일: 느린 문장 기준(ms), 문장별 JSONL 기록 (query_log 참고)
+    workers = None
+    if "--workers" in sys.argv:
+        workers = int(sys.argv[sys.argv.index("--workers") + 1])
+    if "--slow-ms" in sys.argv:
+        QUERY_LOG.configure(slow_ms=float(sys.argv[sys.argv.index("--slow-ms") + 1]))
+    if "--query-log" in sys.argv:
+        QUERY_LOG.configure(path=sys.argv[sys.argv.index("--query-log") + 1])
+    try:
+        preprocess_and_save_data(
+            incremental="--incremental" in sys.argv,
+            max_workers=workers,
+            profile_memory="--profile-memory" in sys.argv,
+        )
+    except StageFailed as e:
+        print(f"전처리 중단: {e}")
+        sys.exit(1)
+    finally:
+        if "--query-stats" in sys.argv:
+            print()
+            print(QUERY_LOG.format_summary())
@@ -1,5 +1,5 @@
 import pandas as pd
-import pickle
+from data_access import get_frame
 import sys
 from datetime import datetime
 
@@ -11,11 +11,9 @@ SELECTED_QUARTER = '3분기' # '전체', '2분기', '3분기' 중 하나를 선
 
 # --- 데이터 로드 ---
 try:
-    with open("preprocessed_data.pkl", "rb") as f:
-        data = pickle.load(f)
-    df_1 = data["df_1"]
-    df_5 = data["df_5"]
-    print("데이터 로드 완료: preprocessed_data.pkl")
+    df_1 = get_frame("df_1")
+    df_5 = get_frame("df_5")
+    print("데이터 로드 완료: df_1, df_5")
 except FileNotFoundError:
     print("오류: 전처리된 데이터 파일(preprocessed_data.pkl)을 찾을 수 없습니다.")
     print("먼저 '전처리.py'를 실행하여 데이터 파일을 생성해주세요.")
@@ -1,12 +1,14 @@
 import pandas as pd
 import datetime
 
+from workbook_cache import read_excel_cached
+
 ### 파이프라인 붙이기
-df_pipeline = pd.read_excel("Q3.xlsx", sheet_name="PipeLine")
+df_pipeline = read_excel_cached("Q3.xlsx", sheet_name="PipeLine")
 
 today_date = datetime.datetime.now(datetime.timezone(datetime.timedelta(hours=9))).strftime("%Y-%m-%d")
 
-df_pipeline_today = pd.read_excel("pipeline.xlsx", sheet_name="Sheet3")
+df_pipeline_today = read_excel_cached("pipeline.xlsx", sheet_name="Sheet3")
 
 # --- 컬럼명 정리 ---
 df_pipeline_today.columns = df_pipeline_today.columns.str.strip()
@@ -34,7 +36,7 @@ with pd.ExcelWriter("Q3.xlsx", engine="openpyxl", mode="a", if_sheet_exists="rep
 
 ### EV 최신 정보 붙이기
 # 1) 오늘 신청 건수 계산
-_ev_df = pd.read_excel("C:/Users/HP/Desktop/그리트_공유/07_31_1758_EV_merged.xlsx")
+_ev_df = read_excel_cached("C:/Users/HP/Desktop/그리트_공유/07_31_1758_EV_merged.xlsx")
 _today_ev_count = _ev_df[_ev_df['신청일자'] == today_date].shape[0]
 
 df_ev_new = pd.DataFrame({
@@ -44,7 +46,7 @@ df_ev_new = pd.DataFrame({
 
 # 2) 기존 '지원_EV' 시트 읽기 (없으면 빈 DF)
 try:
-    df_ev = pd.read_excel("Q3.xlsx", sheet_name="지원_EV")
+    df_ev = read_excel_cached("Q3.xlsx", sheet_name="지원_EV")
 except ValueError:
     df_ev = pd.DataFrame(columns=['날짜', '개수'])
 
@@ -60,7 +62,7 @@ with pd.ExcelWriter("Q3.xlsx", engine="openpyxl", mode="a", if_sheet_exists="rep
 # 3) 지급 신청 건수 최신화
 # '지급신청일자'에 시분초가 포함되어 있으므로, 날짜 부분만 비교하여 필터링
 
-df_distribution = pd.read_excel("C:/Users/HP/Desktop/그리트_공유/07_31_1758_EV_merged.xlsx", sheet_name="Sheet1")
+df_distribution = read_excel_cached("C:/Users/HP/Desktop/그리트_공유/07_31_1758_EV_merged.xlsx", sheet_name="Sheet1")
 
 df_payment = _ev_df[
     pd.to_datetime(_ev_df['지급신청일자'], errors='coerce').dt.strftime('%Y-%m-%d') == today_date
@@ -77,7 +79,7 @@ df_payment_new = pd.DataFrame({
 
 # 4) 기존 '지급' 시트 읽기 (없으면 빈 DF)
 try:
-    df_pay_sheet = pd.read_excel("Q3.xlsx", sheet_name="지급")
+    df_pay_sheet = read_excel_cached("Q3.xlsx", sheet_name="지급")
     # 필요한 4개 컬럼만 유지, 없으면 추가
     expected_cols = ['날짜', '배분', '신청', '지급 잔여']
     for col in expected_cols: